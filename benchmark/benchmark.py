@@ -0,0 +1,493 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module runs the benchmarks of the Agent-Based Model of Human Activity Patterns (ABMHAP). The \
+benchmarks time the following:
+
+#. the simulation engine (:func:`universe.Universe.run`) for a single agent and for households with \
+multiple agents
+#. setting up the trials (:func:`driver.create_trials` and :func:`trial.Trial.initialize`) for each \
+demographic
+#. constructing the activity diary (:class:`diary.Diary`) and splitting it into weekday and weekend data
+#. combining the activity diaries (:func:`driver_result.Batch_Result.get_combined_diary`)
+#. the residual analysis (:func:`evaluation.residual_analysis`) with each method of estimating the \
+distributions
+
+The benchmarks use synthetic CHAD data (see :mod:`fixture`) and fixed seeds so that the results from \
+different commits can be compared. The parameters for the benchmarks are in \
+:literal:`benchmark_params.py`. The results are saved in a JSON file.
+
+To run the benchmarks, type the following in the command line
+
+.. code-block:: bash
+
+    python benchmark.py [fname]
+
+where **fname** is the (optional) file name of the results. To compare the results from 2 runs, type \
+the following in the command line
+
+.. code-block:: bash
+
+    python benchmark.py compare fname_old fname_new
+"""
+
+# ===========================================
+# import
+# ===========================================
+
+import sys
+sys.path.append('..\\source')
+sys.path.append('..\\processing')
+sys.path.append('..\\run')
+sys.path.append('..\\run_chad')
+
+import json, os, platform, shutil, subprocess, tempfile, time
+
+# mathematical capabilities
+import numpy as np
+
+# ABMHAP modules
+import my_globals as mg
+import params
+import chad_cache, diary, driver, driver_result, evaluation, trial
+import benchmark_params as bp
+import fixture
+
+# ===========================================
+# functions
+# ===========================================
+
+def bench_combined_diary():
+
+    """
+    This function benchmarks combining the activity diaries from batches of households into one \
+    dataframe (:func:`driver_result.Batch_Result.get_combined_diary`).
+
+    :return: the benchmark results
+    :rtype: list of dict
+    """
+
+    # the CHAD demographic
+    demographic = bp.universe_demographic
+    chad_demo   = driver.get_chad_demo(demographic)
+
+    # run the simulation once for each batch
+    dr_list = list()
+
+    for i in range(bp.combined_num_batch):
+
+        trials  = driver.create_trials(bp.combined_num_hhld, bp.combined_num_days, 0, 0, trial.OMNI, \
+                                       chad_demo.int_2_param, demographic, 1, False, seed=bp.seed, \
+                                       hhld_offset=i * bp.combined_num_hhld)
+        diaries = [t.run() for t in trials]
+
+        result, _ = driver.get_results(diaries, trials)
+        dr_list.append(result)
+
+    f = lambda x: driver_result.Batch_Result(x).get_combined_diary()
+
+    times = time_it(f, lambda: dr_list)
+
+    info = {'num_hhld': bp.combined_num_hhld, 'num_batch': bp.combined_num_batch, \
+            'num_days': bp.combined_num_days}
+
+    return [ to_record('combined_diary', info, times) ]
+
+def bench_diary():
+
+    """
+    This function benchmarks the construction of an activity diary (:class:`diary.Diary`) from the \
+    history of a simulation and splitting the diary into weekday and weekend data.
+
+    :return: the benchmark results
+    :rtype: list of dict
+    """
+
+    # run the simulation once
+    u = get_universe(bp.diary_num_days, 1)
+    u.run()
+
+    p = u.people[0]
+
+    # construct the diary
+    f = lambda x: diary.Diary(t=u.clock.hist_time, act=p.hist_activity, local=p.hist_local, is_sparse=True)
+
+    times_init = time_it(f, lambda: None)
+
+    # split the diary
+    g = lambda d: (d.get_weekday_data(), d.get_weekend_data())
+
+    times_split = time_it(g, lambda: f(None))
+
+    info = {'num_days': bp.diary_num_days}
+
+    return [ to_record('diary_init', info, times_init), to_record('diary_weekday_weekend', info, times_split) ]
+
+def bench_residual():
+
+    """
+    This function benchmarks the residual analysis (:func:`evaluation.residual_analysis`).
+
+    :return: the benchmark results
+    :rtype: list of dict
+    """
+
+    rng = np.random.default_rng(bp.seed)
+
+    # the predicted and observed start times [hours]
+    pred    = rng.normal(7, 1, size=bp.residual_num_pred)
+    obs     = rng.normal(7.25, 1.25, size=bp.residual_num_obs)
+
+    records = list()
+
+    for method in bp.residual_methods:
+
+        f = lambda x: evaluation.residual_analysis(pred, obs, N=bp.residual_N, method=method)
+
+        times = time_it(f, lambda: None)
+
+        info = {'num_pred': bp.residual_num_pred, 'num_obs': bp.residual_num_obs, 'N': bp.residual_N}
+
+        # the name and the parameters of the benchmark of the default method are the same as before there \
+        # were other methods, so that the results can be compared (see compare())
+        if method == evaluation.METHOD_KDE:
+            name = 'residual_analysis'
+        else:
+            name            = 'residual_analysis_' + method
+            info['method']  = method
+
+        records.append( to_record(name, info, times) )
+
+    return records
+
+def bench_trials():
+
+    """
+    This function benchmarks setting up the trials for each demographic:
+
+    #. :func:`driver.create_trials` with the CHAD data not in the cache
+    #. :func:`trial.Trial.initialize` for each trial
+
+    :return: the benchmark results
+    :rtype: list of dict
+    """
+
+    records = list()
+
+    for demographic in bp.demographics:
+
+        chad_demo = driver.get_chad_demo(demographic)
+
+        #
+        # create the trials (including parsing the CHAD data)
+        #
+        def setup_create():
+
+            chad_cache.clear()
+
+            return None
+
+        f = lambda x: driver.create_trials(bp.trial_num_hhld, bp.trial_num_days, 0, 0, trial.OMNI, \
+                                           chad_demo.int_2_param, demographic, 1, False, seed=bp.seed)
+
+        times_create = time_it(f, setup_create)
+
+        #
+        # initialize the trials (with the CHAD data in the cache)
+        #
+        def setup_initialize():
+
+            chad_cache.load_demography(chad_demo)
+
+            param_list = [ params.Params(num_days=bp.trial_num_days, num_hours=0, num_min=0, num_people=1, \
+                                         do_minute_by_minute=False) for _ in range(bp.trial_num_hhld) ]
+
+            seeds   = mg.get_seed_sequences(bp.seed, bp.trial_num_hhld)
+            trials  = [ driver.TRIAL_2_CONSTRUCTOR[trial.OMNI](x, chad_demo.int_2_param, demographic) \
+                        for x in param_list ]
+
+            for t, s in zip(trials, seeds):
+                t.set_seed(s)
+
+            return trials
+
+        def g(trials):
+
+            for t in trials:
+                t.initialize()
+
+            return
+
+        times_init = time_it(g, setup_initialize)
+
+        info = {'demographic': demographic, 'num_hhld': bp.trial_num_hhld, 'num_days': bp.trial_num_days}
+
+        records.append( to_record('create_trials', info, times_create) )
+        records.append( to_record('trial_initialize', info, times_init) )
+
+    return records
+
+def bench_universe():
+
+    """
+    This function benchmarks the simulation engine (:func:`universe.Universe.run`) for a single agent \
+    and for households with multiple agents.
+
+    :return: the benchmark results
+    :rtype: list of dict
+    """
+
+    # the number of days and the number of people in each benchmark
+    cases = [ (n, 1) for n in bp.universe_num_days ] \
+            + [ (n, k) for k in bp.universe_num_people for n in bp.universe_num_days_multi ]
+
+    records = list()
+
+    for num_days, num_people in cases:
+
+        f = lambda u: u.run()
+
+        times = time_it(f, lambda: get_universe(num_days, num_people))
+
+        info = {'demographic': bp.universe_demographic, 'num_days': num_days, 'num_people': num_people}
+
+        records.append( to_record('universe_run', info, times) )
+
+    return records
+
+def compare(fname_old, fname_new):
+
+    """
+    This function prints the comparison between the results of 2 benchmark runs. For each benchmark \
+    in both runs, the ratio of the median times (new / old) is printed. A ratio less than 1 means \
+    the new run is faster.
+
+    :param str fname_old: the file name of the old benchmark results
+    :param str fname_new: the file name of the new benchmark results
+
+    :return:
+    """
+
+    # load the results
+    with open(fname_old, 'r') as f:
+        old = json.load(f)
+
+    with open(fname_new, 'r') as f:
+        new = json.load(f)
+
+    # the key for each benchmark
+    key = lambda x: (x['name'], json.dumps(x['params'], sort_keys=True))
+
+    old_results = { key(x): x for x in old['results'] }
+
+    print('old:\t%s\t%s' % (old['meta']['commit'], old['meta']['timestamp']) )
+    print('new:\t%s\t%s\n' % (new['meta']['commit'], new['meta']['timestamp']) )
+    print('%-24s %-64s %12s %12s %8s' % ('name', 'params', 'old [s]', 'new [s]', 'ratio') )
+
+    for x in new['results']:
+
+        k = key(x)
+
+        if k in old_results:
+            t_old, t_new = old_results[k]['median'], x['median']
+            print('%-24s %-64s %12.4f %12.4f %8.3f' % (k[0], k[1], t_old, t_new, t_new / t_old) )
+
+    return
+
+def get_commit():
+
+    """
+    This function returns the git commit of the source code, if available.
+
+    :return: the commit hash. If the commit is not available, None is returned
+    :rtype: str
+    """
+
+    # the directory of the repository
+    fpath = os.path.dirname( os.path.abspath(__file__) )
+
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=fpath, \
+                                         stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return commit
+
+def get_meta():
+
+    """
+    This function returns information about the benchmark run so that results from different runs \
+    can be compared.
+
+    :return: the information about the benchmark run
+    :rtype: dict
+    """
+
+    meta = {'commit': get_commit(),
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+            'seed': bp.seed,
+            'num_repeat': bp.num_repeat,
+            'num_pid': bp.num_pid,
+            }
+
+    return meta
+
+def get_universe(num_days, num_people):
+
+    """
+    This function creates a universe with the people added, ready to be run (see :func:`trial.Trial.run`).
+
+    :param int num_days: the number of days in the simulation
+    :param int num_people: the number of people in the household
+
+    :return: the universe
+    :rtype: universe.Universe
+    """
+
+    demographic = bp.universe_demographic
+    chad_demo   = driver.get_chad_demo(demographic)
+
+    t = driver.create_trials(1, num_days, 0, 0, trial.OMNI, chad_demo.int_2_param, demographic, \
+                             num_people, False, seed=bp.seed)[0]
+
+    # create the universe
+    u = t.create_universe()
+
+    # create and add person to universe initialized appropriately
+    for i in range(num_people):
+        t.add_person_to_universe(u, idx=i)
+
+    return u
+
+def run(fname):
+
+    """
+    This function runs all of the benchmarks and saves the results. The benchmarks are run in a \
+    temporary directory that contains the synthetic CHAD data.
+
+    :param str fname: the file name of the benchmark results
+
+    :return: the benchmark results
+    :rtype: dict
+    """
+
+    # the absolute path of the results, before changing the working directory
+    fname       = os.path.abspath(fname)
+    fpath_old   = os.getcwd()
+
+    # the temporary working directory. The CHAD data are in a directory relative to the working directory
+    fpath_tmp   = tempfile.mkdtemp()
+    fpath_work  = os.path.join(fpath_tmp, 'work')
+
+    os.makedirs(fpath_work)
+
+    try:
+        fixture.create(fpath_work, bp.demographics, bp.num_pid, bp.seed)
+
+        os.chdir(fpath_work)
+        chad_cache.clear()
+
+        results = list()
+
+        for f in [bench_universe, bench_trials, bench_diary, bench_combined_diary, bench_residual]:
+            print('running %s...' % f.__name__)
+            results = results + f()
+
+    finally:
+        os.chdir(fpath_old)
+        chad_cache.clear()
+        shutil.rmtree(fpath_tmp, ignore_errors=True)
+
+    out = {'meta': get_meta(), 'results': results}
+
+    # save the results
+    with open(fname, 'w') as f:
+        json.dump(out, f, indent=2)
+
+    print('saved the benchmark results to %s' % fname)
+
+    return out
+
+def time_it(f, setup):
+
+    """
+    This function times a function. The timing is repeated :literal:`benchmark_params.num_repeat` \
+    times. Before each timing, the set up function is called (not timed) and its output is the input \
+    to the timed function.
+
+    :param f: the function to time
+    :param setup: the set up function
+
+    :return: the elapsed time [s] of each repetition
+    :rtype: list of float
+    """
+
+    times = list()
+
+    for _ in range(bp.num_repeat):
+
+        x = setup()
+
+        # time the function
+        tic = time.perf_counter()
+        f(x)
+        toc = time.perf_counter()
+
+        times.append(toc - tic)
+
+    return times
+
+def to_record(name, info, times):
+
+    """
+    This function stores the timing of a benchmark.
+
+    :param str name: the name of the benchmark
+    :param dict info: the parameters of the benchmark
+    :param times: the elapsed time [s] of each repetition
+    :type times: list of float
+
+    :return: the benchmark result
+    :rtype: dict
+    """
+
+    x = {'name': name,
+         'params': info,
+         'min': float( np.min(times) ),
+         'median': float( np.median(times) ),
+         'mean': float( np.mean(times) ),
+         'times': [float(t) for t in times],
+         }
+
+    print('%-24s %s\tmedian: %.4f [s]' % (name, info, x['median']) )
+
+    return x
+
+# ===========================================
+# run
+# ===========================================
+
+if __name__ == '__main__':
+
+    if len(sys.argv) > 1 and sys.argv[1] == 'compare':
+
+        # compare the results of 2 benchmark runs
+        compare(sys.argv[2], sys.argv[3])
+
+    else:
+
+        # the file name of the results
+        fname = sys.argv[1] if len(sys.argv) > 1 else bp.fname
+
+        run(fname)
@@ -0,0 +1,109 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module is responsible for containing parameters that benchmark.py uses to control \
+the benchmarks. The user should set the parameters in this module **before** \
+running the benchmarks :literal:`benchmark.py`.
+"""
+
+# ===========================================
+# import
+# ===========================================
+import sys
+sys.path.append('..\\source')
+
+# agent-based model modules
+import demography as dmg
+
+# ===========================================
+# user-defined parameters
+# ===========================================
+
+# seed for the random number generators. The same seed gives the same synthetic data and the same trials, \
+# so that benchmark results from different commits can be compared
+seed            = 0
+
+# the number of times each benchmark is repeated
+num_repeat      = 3
+
+# the file name of the benchmark results
+fname           = 'benchmark.json'
+
+# -------------------------------------------
+# synthetic CHAD data
+# -------------------------------------------
+
+# the number of synthetic people for each activity
+num_pid         = 500
+
+# the demographics with synthetic data
+demographics    = [dmg.ADULT_NON_WORK, dmg.ADULT_WORK, dmg.CHILD_SCHOOL, dmg.CHILD_YOUNG]
+
+# -------------------------------------------
+# the simulation engine (universe.Universe.run)
+# -------------------------------------------
+
+# the number of days simulated by a single agent
+universe_num_days       = [7, 30, 365]
+
+# the number of days simulated by households with multiple agents
+universe_num_days_multi = [7, 30]
+
+# the number of people in the households with multiple agents
+universe_num_people     = [2, 4]
+
+# the demographic of the agents
+universe_demographic    = dmg.ADULT_WORK
+
+# -------------------------------------------
+# trial set up (driver.create_trials and trial.Trial.initialize)
+# -------------------------------------------
+
+# the number of households
+trial_num_hhld  = 32
+
+# the number of days
+trial_num_days  = 7
+
+# -------------------------------------------
+# diary construction (diary.Diary)
+# -------------------------------------------
+
+# the number of days of the diary
+diary_num_days  = 365
+
+# -------------------------------------------
+# combining diaries (driver_result.Batch_Result.get_combined_diary)
+# -------------------------------------------
+
+# the number of households in each batch
+combined_num_hhld   = 16
+
+# the number of batches
+combined_num_batch  = 8
+
+# the number of days
+combined_num_days   = 7
+
+# -------------------------------------------
+# residual analysis (evaluation.residual_analysis)
+# -------------------------------------------
+
+# the number of predicted values
+residual_num_pred   = 20000
+
+# the number of observed values
+residual_num_obs    = 2000
+
+# the number of points used to evaluate the distributions
+residual_N          = 1001
+
+# the methods of estimating the distributions (see evaluation.residual)
+residual_methods    = ['kde', 'binned', 'ecdf']
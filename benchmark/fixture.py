@@ -0,0 +1,203 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module creates synthetic data that look like the Consolidated Human Activity Database (CHAD) \
+data used to parametrize the agents. The synthetic data are used by the benchmarks so that the \
+benchmarks do not depend on the CHAD data being available and always use the same input.
+
+For each demographic, a .zip file is written with the same file names as the CHAD data for the \
+demographic (see :class:`chad_demography.CHAD_demography`). For each activity, there are the \
+statistical data (start time, end time, and duration) and the records:
+
+* each statistical file has the columns PID, N, mu, std, cv
+* each record file has the columns CHADID, PID, start, end, dt, act, date
+
+The means and standard deviations are drawn uniformly within the bounds used to sample "good" CHAD \
+data (see :class:`chad_params.CHAD_params`), so that every synthetic person can be sampled.
+"""
+
+# ===========================================
+# import
+# ===========================================
+
+import sys
+sys.path.append('..\\source')
+sys.path.append('..\\processing')
+sys.path.append('..\\run_chad')
+
+import os, zipfile
+
+# mathematical capabilities
+import numpy as np
+
+# dataframe capabilities
+import pandas as pd
+
+# ABMHAP modules
+import chad, driver
+
+# ===========================================
+# constants
+# ===========================================
+
+# the number of hours in a day
+DAY_2_HOUR = 24
+
+# the maximum number of events for a person in the synthetic data
+N_MAX = 5
+
+# the smallest standard deviation [hours] in the synthetic data
+STD_MIN = 0.05
+
+# the date of the first event in the synthetic records
+DATE_START = '2000-01-03'
+
+# ===========================================
+# functions
+# ===========================================
+
+def create(fpath, demographics, num_pid, seed=0):
+
+    """
+    This function writes the synthetic CHAD data for the given demographics. The .zip file for each \
+    demographic is written where the simulation expects it, relative to the given directory. Therefore, \
+    the simulation should be run with the given directory as the current working directory.
+
+    :param str fpath: the working directory of the simulation
+    :param demographics: the demographic identifiers
+    :type demographics: list of int
+    :param int num_pid: the number of synthetic people for each activity
+    :param int seed: the seed of the random number generator
+
+    :return: the file names of the .zip files
+    :rtype: list of str
+    """
+
+    # the random number generator
+    rng = np.random.default_rng(seed)
+
+    fnames = [ write_demography(fpath, demo, num_pid, rng) for demo in demographics ]
+
+    return fnames
+
+def get_record(stats_start, stats_dt, act, rng):
+
+    """
+    This function creates the synthetic records for an activity. Each person has N events, where N is \
+    given in the statistical data.
+
+    :param pandas.core.frame.DataFrame stats_start: the start time statistical data
+    :param pandas.core.frame.DataFrame stats_dt: the duration statistical data
+    :param int act: the activity code
+    :param numpy.random.Generator rng: the random number generator
+
+    :return: the records
+    :rtype: pandas.core.frame.DataFrame
+    """
+
+    # the number of events for each person
+    n       = stats_start.N.values
+    idx     = np.repeat( np.arange(len(n)), n )
+
+    # the start time [hours, time of day] and duration [hours] of each event
+    start   = rng.normal( stats_start.mu.values[idx], stats_start['std'].values[idx] ) % DAY_2_HOUR
+    dt      = np.abs( rng.normal( stats_dt.mu.values[idx], stats_dt['std'].values[idx] ) )
+    end     = (start + dt) % DAY_2_HOUR
+
+    # the event index of each person
+    k       = np.arange(len(idx)) - np.repeat( np.cumsum(n) - n, n )
+
+    pid     = stats_start.PID.values[idx]
+    chadid  = [ p + chr(ord('A') + i) for p, i in zip(pid, k) ]
+    date    = pd.Timestamp(DATE_START) + pd.to_timedelta(k, unit='D')
+
+    df = pd.DataFrame( {'CHADID': chadid, 'PID': pid, 'start': start, 'end': end, 'dt': dt, 'act': act, \
+                        'date': date.strftime('%Y-%m-%d')} )
+
+    return df
+
+def get_stats(num_pid, mean_min, mean_max, std_max, n_min, rng):
+
+    """
+    This function creates synthetic statistical data (mean, standard deviation, and coefficient of \
+    variation) for an activity-parameter (start time, end time, or duration).
+
+    :param int num_pid: the number of people
+    :param float mean_min: the minimum mean [hours]
+    :param float mean_max: the maximum mean [hours]
+    :param float std_max: the maximum standard deviation [hours]
+    :param int n_min: the minimum number of events for each person
+    :param numpy.random.Generator rng: the random number generator
+
+    :return: the statistical data
+    :rtype: pandas.core.frame.DataFrame
+    """
+
+    # the identifier of each person
+    pid = [ 'SYN%05d' % i for i in range(num_pid) ]
+
+    # the number of events for each person
+    n   = rng.integers( max(n_min, 1), max(n_min, 1) + N_MAX, size=num_pid )
+
+    mu  = rng.uniform(mean_min, mean_max, size=num_pid)
+    std = rng.uniform(STD_MIN, max(min(std_max, 1), STD_MIN), size=num_pid)
+    cv  = std / np.abs(mu)
+
+    df  = pd.DataFrame( {'PID': pid, 'N': n, 'mu': mu, 'std': std, 'cv': cv} )
+
+    return df
+
+def write_demography(fpath, demographic, num_pid, rng):
+
+    """
+    This function writes the synthetic CHAD data for a demographic into a .zip file.
+
+    :param str fpath: the working directory of the simulation
+    :param int demographic: the demographic identifier
+    :param int num_pid: the number of synthetic people for each activity
+    :param numpy.random.Generator rng: the random number generator
+
+    :return: the file name of the .zip file
+    :rtype: str
+    """
+
+    # the CHAD demographic
+    demo    = driver.get_chad_demo(demographic)
+
+    # the file name of the .zip file relative to the working directory
+    fname   = os.path.join(fpath, demo.fname_zip)
+
+    os.makedirs(os.path.dirname( os.path.abspath(fname) ), exist_ok=True)
+
+    with zipfile.ZipFile(fname, mode='w', compression=zipfile.ZIP_DEFLATED) as z:
+
+        for k in demo.keys:
+
+            # the sampling parameters and the file names for the activity
+            s       = demo.int_2_param[k]
+            f_stats = demo.fname_stats[k]
+
+            # the same people are in each file of the activity
+            n_min   = s.N
+
+            start   = get_stats(num_pid, s.start_mean_min, s.start_mean_max, s.start_std_max, n_min, rng)
+            end     = get_stats(num_pid, s.end_mean_min, s.end_mean_max, s.end_std_max, n_min, rng)
+            dt      = get_stats(num_pid, s.dt_mean_min, s.dt_mean_max, s.dt_std_max, n_min, rng)
+
+            end['N'], dt['N'] = start.N.values, start.N.values
+
+            record  = get_record(start, dt, k, rng)
+
+            data = { chad.START: start, chad.END: end, chad.DT: dt, chad.RECORD: record }
+
+            for key, df in data.items():
+                z.writestr( f_stats[key], df.to_csv(index=False) )
+
+    return fname
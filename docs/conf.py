@@ -15,7 +15,7 @@
 import os
 import sys
 # sys.path.insert(0, 'C:\Users\nbrandon\Documents\code\run_abm\plotting')
-fpaths = ['..\\source', '..\\run_chad', '..\\run', '..\\processing', '..\\plotting']
+fpaths = ['..\\source', '..\\run_chad', '..\\run', '..\\processing', '..\\plotting', '..\\benchmark']
 [ sys.path.insert(0, os.path.abspath(x) ) for x in fpaths]
 
 # -- Project information -----------------------------------------------------
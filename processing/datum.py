@@ -895,6 +895,8 @@ def get_stats(pid, data, do_periodic=False):
     #. the standard deviation (std)
     #. the coefficient of variation (cv)
 
+    The statistics of every person are calculated at once from the records sorted by person.
+
     :param pid: the identifiers for the individuals within CHAD for a given activity
     :type pid: numpy.ndarray of str
     :param numpy.ndarray data: the CHAD records for a given activity
@@ -906,33 +908,34 @@ def get_stats(pid, data, do_periodic=False):
     :rtype: pandas.core.frame.DataFrame
     """
 
-    # dataframe list for the created data
-    df_list = list()
+    # sort the records by person (keeping the order of the records of each person)
+    idx     = np.argsort(pid, kind='stable')
+    pid     = pid[idx]
+    x       = np.asarray(data, dtype=float)[idx]
 
-    # for each person within the data
-    for p in np.unique(pid):
+    if do_periodic:
 
-        # get the correct indices, and the corresponding data
-        idx = pid == p
-        x   = data[idx]
+        # display time in [-12, 12) instead of [0, 24)
+        x = mg.to_periodic(x)
 
-        if do_periodic:
+    # the unique persons, the index of the first record of each person, and the number of records \
+    # of each person
+    p, i_start, N = np.unique(pid, return_index=True, return_counts=True)
 
-            # display time in [-12, 12) instead of [0, 24)
-            x = mg.to_periodic(x)
+    # the mean for each person
+    mu  = np.add.reduceat(x, i_start) / N
 
-        # get the stats for the individual
-        mu, std, cv, N = get_stats_individual(x)
+    # the standard deviation for each person (see get_stats_individual())
+    std = np.sqrt( np.add.reduceat( (x - np.repeat(mu, N)) ** 2, i_start ) / N )
 
-        # store the information
-        d = {'PID': p, 'N': N, 'mu': mu, 'std': std, 'cv': cv}
-        df_list.append(d)
+    # the coefficient of variation for each person
+    cv  = std / np.abs(mu)
 
     # column names
     cols = ['PID', 'N', 'mu', 'std', 'cv']
 
     # store the data in a data frame
-    df = pd.DataFrame(df_list)[cols]
+    df = pd.DataFrame({'PID': p, 'N': N, 'mu': mu, 'std': std, 'cv': cv})[cols]
 
     return df
 
@@ -1093,81 +1096,101 @@ def merge(df_full):
     #. groups the contiguous daily activity data
     #. merges data that occur over midnight into one event
 
+    The whole table is processed at once. The data are ordered by person (in the order that the people \
+    first appear) and, for each person, in the order of the data. The sequences of consecutive days \
+    (see :func:`sequential_days`) are labeled for the whole table, and a new sequence starts with each \
+    person. The activity events that end at midnight are merged with the event that follows them in the \
+    same sequence (see :func:`merge_end_of_day`).
+
     :param pandas.core.frame.DataFrame df_full: the full set of the activity data
 
     :return: a data frame that merges activities that occur over midnight
     :rtype: pandas.core.frame.DataFrame
     """
 
-    # unique person identifiers
-    pid = df_full.PID.unique()
-
-    # group by unique person identifiers
-    gb = df_full.groupby('PID')
-
-    df_list_merged = list()
-
-    # for each person, merge the data
-    for p in pid:
+    # the person identifiers as integers in the order that each person first appears
+    pid = pd.factorize(df_full.PID)[0]
 
-        # get the data of person p
-        df = gb.get_group(p)
+    # order the data by person. The order of the data for each person is kept
+    idx = np.argsort(pid, kind='stable')
+    df  = df_full.iloc[idx]
+    pid = pid[idx]
 
-        # splits the data into groups of sequential days
-        df_list = sequential_data(df)
+    # label the sequences of consecutive days
+    b = sequential_days(df.date.values, df.start.values, df.end.values)
 
-        # merge the activity events that start before midnight and end after midnight
-        x = [merge_end_of_day(s) for s in df_list]
+    # start a new sequence for each person
+    b = b + np.concatenate( ([0], np.cumsum(pid[1:] != pid[:-1])) )
 
-        # add to list
-        df_list_merged.append(pd.concat(x))
-
-    result = pd.concat(df_list_merged)
+    # merge the activity events that start before midnight and end after midnight
+    result = merge_end_of_day(df, b)
 
     return result
 
-def merge_end_of_day(df):
+def merge_end_of_day(df, seq=None):
 
     """
     This function takes longitudinal data and merges the data if the data \
     starts before midnight and ends after midnight.
 
+    An event that ends at midnight is merged with the next event in the same sequence. The merged \
+    event keeps the start of the first event, takes the end of the next event, and the duration is the \
+    sum of the durations. The last event in a sequence is not merged. The data are sorted by date and \
+    start time within each sequence.
+
     :param pandas.core.frame.DataFrame df: the activity records data
+    :param numpy.ndarray seq: the label of the sequence of consecutive days for each event (see \
+    :func:`sequential_days`). The events of a sequence must be adjacent. If None, all of the data are \
+    one sequence
 
     :return: activity events that start before midnight and end after midnight
     :rtype: pandas.core.frame.DataFrame
     """
 
-    # find indices where the end time is at midnight
-    idx = df.end.values == 0
+    # the number of events
+    N = df.shape[0]
 
-    # add a False for the last day. We will seek to merge the final day in the longitudinal sequence
-    idx = np.array(idx[:-1].tolist() + [False])
+    if seq is None:
+        seq = np.zeros(N, dtype=int)
+
+    end = df.end.values
+    dt  = df.dt.values
+
+    # whether the next event is in the same sequence. The final event in a sequence is not merged
+    is_next         = np.zeros(N, dtype=bool)
+    is_next[:-1]    = seq[1:] == seq[:-1]
 
     #
-    # get indices of days that should be merged
+    # get indices of events that should be merged
     #
 
     # the start of the event
-    idx_start = np.where(idx == True)[0]
+    idx_start = (end == 0) & is_next
 
     # the end of the event
-    idx_end = idx_start + 1
+    idx_end         = np.zeros(N, dtype=bool)
+    idx_end[1:]     = idx_start[:-1]
+
+    # create the merged data
+    i       = np.where(idx_start)[0]
 
-    # indices of events that will be merged
-    idx_merged = np.array(idx)
-    idx_merged[idx_end] = True
+    end_new     = end.copy()
+    end_new[i]  = end[i + 1]
 
-    # the data that will not be merged
-    df_old = df[idx_merged == False]
+    dt_new      = dt.copy()
+    dt_new[i]   = dt[i] + dt[i + 1]
 
-    # create the merged data
-    df_merge        = pd.DataFrame(df.iloc[idx_start])
-    df_merge.end    = df.iloc[idx_end].end.values
-    df_merge.dt     = df.iloc[idx_start].dt.values + df.iloc[idx_end].dt.values
+    # the events that are kept. The end of a merged event is dropped unless it starts another merged event
+    idx_keep = np.where(idx_start | ~idx_end)[0]
+
+    # the date in days
+    date = pd.to_datetime(df.date.values).values.astype('datetime64[D]').astype(np.int64)
+
+    # sort by sequence, date, and start time. For ties, the merged events are first
+    k = np.lexsort( (idx_keep, ~idx_start[idx_keep], df.start.values[idx_keep], date[idx_keep], seq[idx_keep]) )
 
     # create a new data frame of the merged and non-merged data
-    df_new = pd.concat([df_merge, df_old]).sort_values(['date', 'start'])
+    df_new = df.assign(end=end_new, dt=dt_new).iloc[idx_keep[k]]
 
     return df_new
 
@@ -1189,56 +1212,7 @@ def periodicity_CHADID(df):
 
     """
 
-    # create an empty list
-    df_list = list()
-
-    # if the list contains only 1 or 0 entries
-    if ( len(df) <= 1 ):
-        result  = pd.DataFrame(df)[chad.EVENTS_COLNAMES]
-    else:
-
-        # store the activity
-        act     = [df.iloc[0].act]
-        # store the data
-        date    = [df.iloc[0].date]
-        # store the CHADID
-        chadid  = [df.iloc[0].CHADID]
-        # store the PID
-        pid     = [df.iloc[0].PID]
-
-        # for each entry
-        for i in range(len(df)):
-
-            # store the start time
-            start = df.iloc[i].start
-
-            # if the current entry does not end with 0, keep the entry
-            if df.iloc[i].end != 0:
-                end = df.iloc[i].end
-            else:
-                # if the entry ends with zero, take the value of the first entry
-                end = df.iloc[0].end
-
-            # calculate the duration
-            dt      = [mg.from_periodic(end - start, do_hours=True)]
-
-            # set the start and end time for entry into dataframe
-            start   = [start]
-            end     = [end]
-
-            # create dictionary for the new entry
-            d = {'CHADID': chadid, 'PID': pid, 'start': start, 'end': end, 'dt': dt, \
-                 'act': act, 'date': date}
-
-            # add the entry to the list
-            df_list.append(pd.DataFrame(d))
-
-            # if the entry includes the periodicity assumption, throw away the top entry
-            if not (df.iloc[i].end != 0):
-                df_list.pop(0)
-
-        # store the results as a dataframe
-        result = pd.concat(df_list)[chad.EVENTS_COLNAMES]
+    result = periodicity_sleep(df)
 
     return result
 
@@ -1254,17 +1228,11 @@ def periodicity_PID(df):
     :rtype: list of pandas.core.frame.DataFrame
     """
 
-    # the data list
-    df_list = list()
-
     # group data by CHADID
     gb      = df.groupby('CHADID')
 
     # for each CHADID and use the periodicity assumption
-    df_list.append( [ periodicity_CHADID( gb.get_group(y) ) for y in df.CHADID.unique() ] )
-
-    # flatten out the list
-    df_list = [subitem for item in df_list for subitem in item]
+    df_list = [ periodicity_CHADID( gb.get_group(y) ) for y in df.CHADID.unique() ]
 
     return df_list
 
@@ -1274,32 +1242,75 @@ def periodicity_sleep(data):
     Perform the periodicity assumption (i.e., expressing time as [-12, 12)) for an \
     entire dataset of multiple entries.
 
+    The whole table is processed at once. The data are ordered by person and by day (CHADID) in the \
+    order that each first appears. For each day (CHADID) with more than 1 sleep event, the following is \
+    done (see :func:`periodicity_CHADID`):
+
+    #. an event that ends at midnight takes the end time of the first event of the day
+    #. the duration of each event is calculated from the start and end times
+    #. for each event that ends at midnight, one event from the top of the day is thrown away
+    #. the activity and date of each event is the activity and date of the first event of the day
+
+    A day (CHADID) with only 1 sleep event is not changed.
+
     :param pandas.core.frame.DataFrame data: the sleep data over many individuals
 
     :return: sleep data with the periodicity assumption
     :rtype: pandas.core.frame.DataFrame
     """
 
-    # group data frame by PID
-    gb_pid = data.groupby('PID')
+    # the group of each event. The groups (PID, CHADID) are numbered in the order they first appear
+    g   = data.groupby(['PID', 'CHADID'], sort=False).ngroup().values
 
-    # list of data frames
-    df_list = list()
+    # the person identifiers as integers in the order that each person first appears
+    pid = pd.factorize(data.PID)[0]
 
-    # loop through each PID
-    for x in data.PID.unique():
+    # order the data by person and by day. The order of the data for each day is kept
+    idx = np.lexsort( (g, pid) )
+    df  = data.iloc[idx][chad.EVENTS_COLNAMES]
+    g   = g[idx]
 
-        # get data for the PID
-        df = gb_pid.get_group(x)
+    # the number of events
+    N = df.shape[0]
 
-        # set the periodicity for sleep for the PID
-        df_list.append(periodicity_PID(df))
+    # the position of the first event of each day and the number of events in each day
+    first       = np.where( np.concatenate( ([True], g[1:] != g[:-1]) ) )[0]
+    counts      = np.diff( np.concatenate( (first, [N]) ) )
 
-        # flatten out the df_list
-    df_list = [subitem for item in df_list for subitem in item]
+    # for each event, the position of the first event of the day, the number of events in the day, \
+    # and the position of the event in the day
+    i_first     = np.repeat(first, counts)
+    n           = np.repeat(counts, counts)
+    rank        = np.arange(N) - i_first
 
-    # create one data frame
-    result = pd.concat(df_list)
+    # the days with more than 1 event
+    is_multi    = n > 1
+
+    start   = df.start.values
+    end     = df.end.values
+
+    # the number of events ending at midnight in each day
+    num_zero    = np.repeat( np.add.reduceat( (end == 0).astype(int), first ), counts ) if N > 0 else n
+
+    # if the entry ends with zero, take the value of the first entry
+    end_new     = np.where(end != 0, end, end[i_first])
+
+    # calculate the duration
+    dt_new      = mg.from_periodic(end_new - start, do_hours=True)
+
+    # for the days with more than 1 event, throw away the top entries
+    idx_keep    = np.where( ~is_multi | (rank >= num_zero) )[0]
+
+    # the events that use the periodicity assumption
+    m           = is_multi[idx_keep]
+    i_m         = idx_keep[m]
+
+    result = df.iloc[idx_keep].copy()
+
+    # the columns are set by position since the index may have repeated labels
+    for col, x in [ ('end', end_new[i_m]), ('dt', dt_new[i_m]), ('act', df.act.values[i_first[i_m]]), \
+                    ('date', df.date.values[i_first[i_m]]) ]:
+        result.iloc[ np.where(m)[0], result.columns.get_loc(col) ] = x
 
     return result
 
@@ -1405,26 +1416,22 @@ def sequential_days(date, start=None, end=None):
     :rtype: numpy.ndarray
     """
 
-    dt_min = datetime.timedelta(days=0)
-    dt_max = datetime.timedelta(days=1)
-
-    # return true if the events occur on consecutive days
-    f = lambda x: [(later - now >= dt_min) & (later - now <= dt_max) for now, later in zip(x[:-1], x[1:])]
+    # the date in days
+    days = pd.to_datetime(date).values.astype('datetime64[D]').astype(np.int64)
 
     if (start is not None) and (end is not None):
 
-        # get the date that the activity ends
-        date_end = get_end_date(date, start, end)
+        # get the date that the activity ends (see get_end_date())
+        days = days + ( np.sign( mg.to_periodic(start) * mg.to_periodic(end) ) == -1 )
 
-        # find where the dates are the same or in a consecutive series
-        idx = np.array(f(date_end))
-    else:
-        idx = np.array(f(date))
+    # find where the dates are the same or in a consecutive series
+    delta   = np.diff(days)
+    idx     = (delta >= 0) & (delta <= 1)
 
     # write sequence where each group of consecutive dates have a label starting at 0
     # the following sequence of dates [0, 0, 1,1, 3, 4, 5, 10], would have the following sequence
     # [0, 0, 0, 0, 1, 1, 1, 2]
-    b = np.array([0] + np.cumsum(idx == False).tolist())
+    b = np.concatenate( ([0], np.cumsum(idx == False)) )
 
     return b
 
@@ -20,12 +20,12 @@ be used in Agent-Based Model of Human Activity Patterns (ABMHAP).
 # ===========================================
 # import
 # ===========================================
-import copy, sys
+import copy, os, sys
 sys.path.append('..\\source')
 
 # ABMHAP modules
 import my_globals as mg
-import chad, social
+import chad, demography_store, social
 
 # ===========================================
 # constants
@@ -108,21 +108,15 @@ def filter_adult(x, do_work):
         # the unique set of appropriate PIDs
         pid = q.PID[idx].unique()
     else:
-        gb  = q.groupby('PID')
-        pid = []
+        # whether every record of each PID is unemployed
+        is_unemployed = (q.employed == 'N').groupby(q.PID).all()
 
         # the unique set of PIDs for unemployed people
-        for p in q.PID.unique():
-            df = gb.get_group(p)
-            if (df.employed == 'N').all():
-                pid.append(p)
+        pid = is_unemployed.index[is_unemployed.values]
 
-    # function that checks to see if a PID(p) is in the unique set of desired PIDs (pid)
-    f   = lambda p: p in pid
-
-    # limit the questionnaire and events data
-    q   = q[q.PID.apply(f)]
-    e   = e[e.PID.apply(f)]
+    # limit the questionnaire and events data to the unique set of desired PIDs (pid)
+    q   = q[q.PID.isin(pid)]
+    e   = e[e.PID.isin(pid)]
 
     x.quest     = q
     x.events    = e
@@ -265,6 +259,9 @@ if __name__ == '__main__':
     # flag to indicate whether or not the files will be saved
     do_save = False
 
+    # flag to indicate whether or not to make the columnar store of each demographic .zip file
+    do_store = False
+
     # load the data
     if do_load:
 
@@ -299,4 +296,15 @@ if __name__ == '__main__':
             for y, fname in zip(x, fnames):
                 save(y, fname)
 
-            print('finished saving')
\ No newline at end of file
+            print('finished saving')
+
+    # make the columnar store of each demographic .zip file
+    if do_store:
+
+        print('saving the columnar stores...\n')
+
+        for fname_zip in FNAME_DEMOGRAPHY.values():
+            if os.path.isfile(fname_zip):
+                demography_store.save(fname_zip)
+
+        print('finished saving the columnar stores')
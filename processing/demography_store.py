@@ -0,0 +1,465 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module saves the CHAD data of a demographic (stored in a demographic .zip file) in a columnar \
+format that may be memory-mapped, and loads the data from that format.
+
+Each demographic .zip file (e.g., *child_young.zip*) holds the raw CHAD data (*data.pkl*, a pickled \
+:class:`chad.CHAD_RAW`) and many small statistical data files (.csv). Loading the raw data requires \
+unpickling all of it, and each statistical data file is parsed every time it is read. The store is a \
+directory next to the .zip file (e.g., *child_young/*) that holds the same data as follows:
+
+* each table (data frame) is a directory that holds one .npy file per column and a description of the \
+table (:const:`F_TABLE`)
+* the statistical data file *longitude/sleep/all/stats_start.csv* is the table \
+*longitude/sleep/all/stats_start*
+* the raw CHAD questionnaire data and events data are the tables :const:`RAW_QUEST` and \
+:const:`RAW_EVENTS`
+
+The columns are encoded as follows:
+
+* numeric columns are saved as they are and are memory-mapped when loaded
+* string columns are saved as integer codes (-1 for missing values) and the unique strings
+* date columns are saved as days (numpy.datetime64) and loaded as datetime.date
+
+Since the numeric columns are memory-mapped, only the columns that are used are read from the disk, \
+and the worker processes of a parallel simulation share the pages of the files through the operating \
+system instead of each holding its own copy of the data. The loaded data frames should be treated as \
+**read-only**.
+
+The store is made from the .zip file with :func:`save`. The store records the size and the modification \
+time of the .zip file. If the .zip file changes, the store is out of date and the data are read from \
+the .zip file (see :func:`read_csv`).
+
+.. note::
+    The store only requires *numpy*, so that it does not add a dependency to ABMHAP.
+"""
+
+# ===========================================
+# import
+# ===========================================
+
+import datetime, io, json, os, shutil, sys
+sys.path.append('..\\source')
+
+# mathematical capability
+import numpy as np
+
+# dataframe capability
+import pandas as pd
+
+# zipfile capability
+import zipfile
+
+# ABMHAP modules. This is needed to unpickle the raw CHAD data
+import chad
+
+# ===========================================
+# constants
+# ===========================================
+
+# the name of the file (in the .zip file) of the raw CHAD data
+F_DATA      = 'data.pkl'
+
+# the name of the file describing the store
+F_STORE     = 'store.json'
+
+# the name of the file describing a table
+F_TABLE     = 'table.json'
+
+# the name of the file (without the extension) of the index of a table
+F_INDEX     = '__index__'
+
+# the file extension of the .csv files and of the column files
+F_CSV       = '.csv'
+F_NPY       = '.npy'
+
+# the ending of the name of the file that holds the unique strings of a string column
+F_VALUES    = '.values'
+
+# the ending of the name of the file that flags the unique values of a string column that are integers
+F_IS_INT    = '.is_int'
+
+# the tables of the raw CHAD data
+RAW_QUEST   = 'raw/quest'
+RAW_EVENTS  = 'raw/events'
+
+# the encoding of the columns
+KIND_NUMERIC    = 'numeric'
+KIND_STR        = 'str'
+KIND_DATE       = 'date'
+
+# ===========================================
+# functions
+# ===========================================
+
+def decode(x, kind, values=None, is_int=None, dtype=None):
+
+    """
+    This function converts a column from the store to the column of a data frame.
+
+    :param numpy.ndarray x: the column in the store
+    :param str kind: the encoding of the column
+    :param numpy.ndarray values: the unique strings of a string column
+    :param numpy.ndarray is_int: for a string column, a flag for each unique string indicating whether \
+    the value is an integer (if True) or a string (if False). If None, all of the values are strings
+    :param str dtype: for a string column, the data type of the column
+
+    :return: the column
+    :rtype: numpy.ndarray or pandas.api.extensions.ExtensionArray
+    """
+
+    if kind == KIND_STR:
+
+        # the unique values. The last value is for the missing values (code -1)
+        y = np.append( values.astype(object), np.nan )
+
+        if is_int is not None:
+            y[:-1][is_int] = [int(v) for v in values[is_int]]
+
+        # the values of the codes
+        x = pd.array(y, dtype=dtype).take(x)
+
+    elif kind == KIND_DATE:
+
+        # the days as datetime.date. Missing values are NaN
+        idx = np.isnat(x)
+        x   = x.astype(object)
+        x[idx] = np.nan
+
+    return x
+
+def encode(x):
+
+    """
+    This function converts a column of a data frame to a column that may be saved in the store.
+
+    :param pandas.core.series.Series x: the column
+
+    :return: the encoding of the column, the column in the store, the unique strings of a string column \
+    (None for the other encodings), the flags indicating which unique values of a string column are \
+    integers (None if all of the values are strings)
+    :rtype: str, numpy.ndarray, numpy.ndarray, numpy.ndarray
+    :raises ValueError: if the column can not be encoded
+    """
+
+    if pd.api.types.is_numeric_dtype(x.dtype) or pd.api.types.is_bool_dtype(x.dtype):
+        return KIND_NUMERIC, x.to_numpy(), None, None
+
+    # the values that are not missing
+    v = x.dropna().values
+
+    # a column of dates
+    if ( len(v) > 0 ) and all( [type(y) is datetime.date for y in v] ):
+        return KIND_DATE, np.array( x.where(x.notna(), None).tolist(), dtype='datetime64[D]' ), None, None
+
+    # a column of strings. The missing values have the code -1
+    codes, values = pd.factorize(x)
+
+    # the values that are integers. The raw CHAD data have columns of both strings and integers
+    is_int = np.array( [isinstance(y, (int, np.integer)) for y in values], dtype=bool )
+
+    if not all( [isinstance(y, str) for y in values[~is_int]] ):
+        raise ValueError('ERROR! The column %s has values that are not numbers, strings, or dates' % x.name)
+
+    values = np.array( [str(y) for y in values], dtype=str )
+
+    return KIND_STR, codes.astype(np.int32), values, is_int if is_int.any() else None
+
+def get_fpath(fname_zip):
+
+    """
+    This function returns the directory of the store of a demographic .zip file.
+
+    :param str fname_zip: the name of the .zip file
+
+    :return: the directory of the store
+    :rtype: str
+    """
+
+    return os.path.splitext(fname_zip)[0]
+
+def get_source_info(fname_zip):
+
+    """
+    This function returns information that identifies the version of a .zip file.
+
+    :param str fname_zip: the name of the .zip file
+
+    :return: the size [bytes] and the modification time of the .zip file
+    :rtype: dict
+    """
+
+    x = os.stat(fname_zip)
+
+    return {'size': x.st_size, 'mtime': x.st_mtime}
+
+def get_table(fname):
+
+    """
+    This function returns the name of the table of a statistical data file (.csv) in a .zip file.
+
+    :param str fname: the file name within the .zip file
+
+    :return: the name of the table
+    :rtype: str
+    """
+
+    return fname[:-len(F_CSV)] if fname.endswith(F_CSV) else fname
+
+def is_current(fname_zip, fpath=None):
+
+    """
+    This function indicates whether or not there is a store of a .zip file that is up to date.
+
+    :param str fname_zip: the name of the .zip file
+    :param str fpath: the directory of the store. If None, the default directory is used \
+    (see :func:`get_fpath`)
+
+    :return: True, if the store exists and was made from the current .zip file. False, otherwise
+    :rtype: bool
+    """
+
+    if fpath is None:
+        fpath = get_fpath(fname_zip)
+
+    fname = os.path.join(fpath, F_STORE)
+
+    if not ( os.path.isfile(fname) and os.path.isfile(fname_zip) ):
+        return False
+
+    with open(fname, 'r') as f:
+        x = json.load(f)
+
+    return x['source'] == get_source_info(fname_zip)
+
+def load_raw(fname_zip, columns=None, fpath=None):
+
+    """
+    This function loads the raw CHAD questionnaire data and events data of a demographic from the store.
+
+    :param str fname_zip: the name of the .zip file
+    :param columns: the columns to load. If None, all of the columns are loaded
+    :type columns: list of str
+    :param str fpath: the directory of the store. If None, the default directory is used \
+    (see :func:`get_fpath`)
+
+    :return: the CHAD questionnaire data, the CHAD events data
+    :rtype: pandas.core.frame.DataFrame, pandas.core.frame.DataFrame
+    """
+
+    if fpath is None:
+        fpath = get_fpath(fname_zip)
+
+    # only load the columns that are in each table
+    f = lambda table: None if columns is None else [c for c in columns if c in read_columns(fpath, table)]
+
+    quest   = read(fpath, RAW_QUEST, f(RAW_QUEST))
+    events  = read(fpath, RAW_EVENTS, f(RAW_EVENTS))
+
+    return quest, events
+
+def read(fpath, table, columns=None, do_mmap=True):
+
+    """
+    This function loads a table from the store.
+
+    :param str fpath: the directory of the store
+    :param str table: the name of the table
+    :param columns: the columns to load. If None, all of the columns are loaded
+    :type columns: list of str
+    :param bool do_mmap: a flag indicating whether to memory-map the numeric columns (if True) or to \
+    read them into memory (if False)
+
+    :return: the table
+    :rtype: pandas.core.frame.DataFrame
+    """
+
+    # the directory of the table
+    fpath_table = os.path.join(fpath, table)
+
+    with open(os.path.join(fpath_table, F_TABLE), 'r') as f:
+        info = json.load(f)
+
+    if columns is None:
+        columns = info['columns']
+
+    mmap_mode = 'r' if do_mmap else None
+
+    # load the column in the store
+    g = lambda name: np.load(os.path.join(fpath_table, name + F_NPY), mmap_mode=mmap_mode)
+
+    # the index of the table
+    index = g(F_INDEX) if info['index'] else None
+
+    d = dict()
+
+    for c in columns:
+
+        kind, dtype = info['kinds'][c], info['dtypes'][c]
+
+        if kind == KIND_STR:
+            values  = g(c + F_VALUES)
+            is_int  = g(c + F_IS_INT) if c in info['is_int'] else None
+            x       = decode( g(c), kind, values, is_int, dtype )
+        else:
+            x       = decode( g(c), kind )
+            dtype   = None
+
+        # the column keeps the data type of the saved table
+        d[c] = pd.Series(x, index=index, dtype=dtype, copy=False)
+
+    df = pd.DataFrame(d, index=index, columns=columns, copy=False)
+
+    return df
+
+def read_columns(fpath, table):
+
+    """
+    This function returns the names of the columns of a table in the store.
+
+    :param str fpath: the directory of the store
+    :param str table: the name of the table
+
+    :return: the names of the columns
+    :rtype: list of str
+    """
+
+    with open(os.path.join(fpath, table, F_TABLE), 'r') as f:
+        info = json.load(f)
+
+    return info['columns']
+
+def read_csv(fname_zip, fname, columns=None):
+
+    """
+    This function returns the data of a statistical data file (.csv) of a demographic .zip file. If the \
+    store of the .zip file is up to date, the data are loaded from the store. Otherwise, the file is \
+    parsed from the .zip file.
+
+    :param str fname_zip: the name of the .zip file
+    :param str fname: the file name (.csv) within the .zip file
+    :param columns: the columns to load. If None, all of the columns are loaded
+    :type columns: list of str
+
+    :return: the data
+    :rtype: pandas.core.frame.DataFrame
+    """
+
+    if is_current(fname_zip):
+
+        df = read( get_fpath(fname_zip), get_table(fname), columns )
+
+    else:
+
+        with zipfile.ZipFile(fname_zip, mode='r') as z:
+            df = pd.read_csv( z.open(fname), usecols=columns )
+
+        # keep the order of the given columns
+        if columns is not None:
+            df = df[columns]
+
+    return df
+
+def save(fname_zip, fpath=None):
+
+    """
+    This function makes the store of a demographic .zip file. Every statistical data file (.csv) and \
+    the raw CHAD data (if the .zip file has them) are saved in the store. An existing store is replaced.
+
+    The description of the store is written last, so a store that was not finished is never used.
+
+    :param str fname_zip: the name of the .zip file
+    :param str fpath: the directory of the store. If None, the default directory is used \
+    (see :func:`get_fpath`)
+
+    :return: None
+    """
+
+    if fpath is None:
+        fpath = get_fpath(fname_zip)
+
+    # remove the old store
+    if os.path.isdir(fpath):
+        shutil.rmtree(fpath)
+
+    os.makedirs(fpath)
+
+    with zipfile.ZipFile(fname_zip, mode='r') as z:
+
+        names = z.namelist()
+
+        # the statistical data
+        for fname in [x for x in names if x.endswith(F_CSV)]:
+            write( fpath, get_table(fname), pd.read_csv( z.open(fname) ) )
+
+        # the raw CHAD data. The pickled data may have been saved with an older version of pandas
+        if F_DATA in names:
+
+            x = pd.read_pickle( io.BytesIO( z.read(F_DATA) ) )
+
+            write(fpath, RAW_QUEST, x.quest)
+            write(fpath, RAW_EVENTS, x.events)
+
+    # describe the store
+    with open(os.path.join(fpath, F_STORE), 'w') as f:
+        json.dump( {'source': get_source_info(fname_zip)}, f, indent=2 )
+
+    return
+
+def write(fpath, table, df):
+
+    """
+    This function saves a table in the store.
+
+    :param str fpath: the directory of the store
+    :param str table: the name of the table
+    :param pandas.core.frame.DataFrame df: the table
+
+    :return: None
+    """
+
+    # the directory of the table
+    fpath_table = os.path.join(fpath, table)
+    os.makedirs(fpath_table, exist_ok=True)
+
+    # save the column in the store
+    g = lambda name, x: np.save(os.path.join(fpath_table, name + F_NPY), x, allow_pickle=False)
+
+    kinds, dtypes, columns_int = dict(), dict(), list()
+
+    for c in df.columns:
+
+        kind, x, values, is_int = encode(df[c])
+
+        g(c, x)
+
+        if values is not None:
+            g(c + F_VALUES, values)
+
+        if is_int is not None:
+            g(c + F_IS_INT, is_int)
+            columns_int.append(c)
+
+        kinds[c], dtypes[c] = kind, str(df[c].dtype)
+
+    # save the index, unless it is the default index
+    do_index = not df.index.equals( pd.RangeIndex( len(df) ) )
+
+    if do_index:
+        g(F_INDEX, df.index.to_numpy())
+
+    info = {'columns': [str(c) for c in df.columns], 'kinds': kinds, 'dtypes': dtypes, 'is_int': columns_int, \
+            'index': do_index, 'rows': len(df)}
+
+    with open(os.path.join(fpath_table, F_TABLE), 'w') as f:
+        json.dump(info, f, indent=2)
+
+    return
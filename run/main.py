@@ -38,12 +38,9 @@ import sys, time
 sys.path.append('..\\source')
 sys.path.append('..\\plotting')
 
-# for plotting
-import matplotlib.pylab as plt
-
 # agent-based model modules
 import my_globals as mg
-import main_params, plotter, scenario
+import main_params, scenario
 
 # ===============================================
 # functions
@@ -70,6 +67,10 @@ def plot(p, d=None):
     :return:
     """
 
+    # the plotting capabilities are only loaded when plotting so that the simulation may run
+    # without them (e.g., on a machine without a display)
+    import plotter
+
     # print plotting message to screen
     print('plotting...')
 
@@ -113,9 +114,6 @@ def plot(p, d=None):
 
 if __name__ == '__main__':
 
-    # close all open plots
-    plt.close('all')
-
     #
     # set up the parameters
     #
@@ -180,6 +178,12 @@ if __name__ == '__main__':
     #
     if do_plot:
 
+        # for plotting
+        import matplotlib.pylab as plt
+
+        # close all open plots
+        plt.close('all')
+
         # plot the results
         plot(agent, act_diary)
 
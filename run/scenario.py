@@ -291,7 +291,7 @@ class Duo(Scenario):
 
         # create Single Sam(s) and add them to the universe
         for i in np.arange(self.params.num_people):
-            sam = singleton.Singleton(self.u.home, self.u.clock, self.u.num_sample_points)
+            sam = singleton.Singleton(self.u.home, self.u.clock, self.u.schedule)
             sam.set(self.params, idx=i)
             self.u.people.append(sam)
 
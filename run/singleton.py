@@ -195,6 +195,10 @@ class Singleton(person.Person):
         :return: None
         """
 
+        # the number of samples to draw at once from each distribution. Most distributions are sampled \
+        # about once a day, so a block of samples typically covers the whole simulation
+        num_samples = param.num_days + 1
+
         #
         # create the biology
         #
@@ -202,7 +206,8 @@ class Singleton(person.Person):
 
         # set the biology
         self.bio.set_sleep_params(start_mean=param.sleep_start_mean[idx], start_std=param.sleep_start_std[idx], \
-                                  end_mean=param.sleep_end_mean[idx], end_std=param.sleep_end_std[idx])
+                                  end_mean=param.sleep_end_mean[idx], end_std=param.sleep_end_std[idx], \
+                                  num_samples=num_samples)
         self.bio.gender = gender
 
         # biologically related need
@@ -224,7 +229,8 @@ class Singleton(person.Person):
                                       commute_to_work_dt_mean=param.commute_to_work_dt_mean[idx], \
                                       commute_to_work_dt_std=param.commute_to_work_dt_std[idx], \
                                       commute_from_work_dt_mean=param.commute_from_work_dt_mean[idx],\
-                                      commute_from_work_dt_std=param.commute_from_work_dt_std[idx])
+                                      commute_from_work_dt_std=param.commute_from_work_dt_std[idx], \
+                                      num_samples=num_samples)
 
         self.socio.uses_alarm = param.do_alarm[idx]
         self.socio.set_work_alarm(param.dt_alarm[idx])
@@ -242,16 +248,16 @@ class Singleton(person.Person):
         self.socio.meals[0].set_meal(id=meal.BREAKFAST, start_mean=breakfast.start_mean, \
                                      start_std=breakfast.start_std, start_trunc=breakfast.start_trunc, \
                                      dt_mean=breakfast.dt_mean, dt_std=breakfast.dt_std, \
-                                     dt_trunc=breakfast.dt_trunc)
+                                     dt_trunc=breakfast.dt_trunc, num_samples=num_samples)
 
         self.socio.meals[1].set_meal(id=meal.LUNCH, start_mean=lunch.start_mean, \
                                      start_std=lunch.start_std, start_trunc=lunch.start_trunc, \
                                      dt_mean=lunch.dt_mean, dt_std=lunch.dt_std, \
-                                     dt_trunc=lunch.dt_trunc)
+                                     dt_trunc=lunch.dt_trunc, num_samples=num_samples)
 
         # set the meals
         self.socio.meals[2].set_meal(id=meal.DINNER, start_mean=dinner.start_mean, \
                                      start_std=dinner.start_std, start_trunc=dinner.start_trunc, \
                                      dt_mean=dinner.dt_mean, dt_std=dinner.dt_std, \
-                                     dt_trunc=dinner.dt_trunc)
+                                     dt_trunc=dinner.dt_trunc, num_samples=num_samples)
         return
\ No newline at end of file
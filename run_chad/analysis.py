@@ -26,7 +26,7 @@ Model of Human Activity Patterns).
 # ===========================================
 # import
 # ===========================================
-import os, pickle, sys, zipfile
+import os, pickle, sys
 sys.path.append('..\\source')
 sys.path.append('..\\run')
 sys.path.append('..\\processing')
@@ -34,13 +34,10 @@ sys.path.append('..\\processing')
 # general math capabilities
 import numpy as np
 
-# for dataframe manipulation
-import pandas as pd
-
 # ABMHAP modules
 import my_globals as mg
 import demography as dmg
-import chad, temporal
+import chad, demography_store, temporal
 
 # ===========================================
 # functions
@@ -220,9 +217,6 @@ def get_verification_info(demo, key_activity, sampling_params, fname_stats=None)
     # get the zipfile name of the demographic
     fname_zip = dmg.FNAME_DEMOGRAPHY[demo]
 
-    # open zip file of demographic data
-    z = zipfile.ZipFile(fname_zip, mode='r')
-
     # get the verification file names
     if fname_stats is None:
         fname_stats     = chad.FNAME_STATS_OMNI[key_activity]
@@ -237,14 +231,11 @@ def get_verification_info(demo, key_activity, sampling_params, fname_stats=None)
     # get the CHAD file names
     fname_start, fname_end , fname_dt = fname_stats[chad.START], fname_stats[chad.END], fname_stats[chad.DT]
 
-    # load the data
-    df_start    = pd.read_csv( z.open(fname_start) )
-    df_end      = pd.read_csv( z.open(fname_end) )
-    df_dt       = pd.read_csv( z.open(fname_dt) )
-    df_record   = pd.read_csv( z.open(fname_record) )
-
-    # close zip file
-    z.close()
+    # load the data (from the columnar store of the demographic, if it is up to date)
+    df_start    = demography_store.read_csv(fname_zip, fname_start)
+    df_end      = demography_store.read_csv(fname_zip, fname_end)
+    df_dt       = demography_store.read_csv(fname_zip, fname_dt)
+    df_record   = demography_store.read_csv(fname_zip, fname_record)
 
     # sample by df_dt, df_start
     # sampling parameters from the first household
@@ -45,7 +45,7 @@ import matplotlib.pylab as plt
 import my_globals as mg
 import driver_params as dp
 
-import activity, analysis, driver, evaluation, temporal, trial
+import activity, analysis, driver, driver_result, evaluation, temporal, trial
 
 # ===========================================
 # functions
@@ -910,6 +910,10 @@ def run(num_process, num_hhld, num_batch):
     """
     This function runs the simulations.
 
+    .. note::
+        The results are loaded from the .pkl file of the output, so the output must be saved with \
+        :literal:`driver_params.save_format = diary_store.FORMAT_PKL` (the default).
+
     :param int num_process: the number of processors (cores)
     :param int num_hhld: the number of households per core per batch
     :param int num_batch: the number of batches
@@ -920,7 +924,7 @@ def run(num_process, num_hhld, num_batch):
 
     fname_trials, fname_data = driver.run_everything(num_process, num_hhld, num_batch)
 
-    x = mg.load(fname_data)
+    x = driver_result.load(fname_data)
 
     return x
 
@@ -1016,7 +1020,7 @@ if __name__ == '__main__':
 
         # load the simulation data from a pre-existing file
         fname = dp.fpath + '\\2018_03_29\\n0004_d007\\data_adult_work.pkl'
-        x = mg.load(fname)
+        x = driver_result.load(fname)
 
         print('loaded data from %s' % fname)
     else:
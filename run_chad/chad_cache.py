@@ -0,0 +1,163 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module holds a process-wide cache of the parsed CHAD statistical data (.csv files) stored in the \
+demographic .zip files.
+
+Each file is parsed once per process. The cache is keyed by the name of the .zip file, the name of the \
+file within the .zip file, and the modification time of the .zip file, so that changes to the \
+.zip file are picked up.
+
+The cached data frames are shared and should be treated as **read-only**. When the simulation runs in \
+parallel, loading the cache (:func:`load_demography`) before the worker processes are created allows \
+the workers to share the parsed data instead of reading the .zip files again.
+
+If the .zip file has an up-to-date columnar store (see :mod:`demography_store`), the data are \
+memory-mapped from the store instead of being parsed from the .zip file.
+"""
+
+# ===========================================
+# import
+# ===========================================
+
+import os, sys
+sys.path.append('..\\processing')
+
+# dataframe capability
+import pandas as pd
+
+# zipfile capability
+import zipfile
+
+# ABMHAP modules
+import demography_store
+
+# ===========================================
+# constants
+# ===========================================
+
+# the cache. The key is (.zip file name, file name within the .zip file) and the value is a tuple of \
+# (modification time of the .zip file, the parsed data frame)
+CACHE = dict()
+
+# ===========================================
+# functions
+# ===========================================
+
+def clear():
+
+    """
+    This function empties the cache.
+
+    :return: None
+    """
+
+    CACHE.clear()
+
+    return
+
+def is_cached(fname_zip, fname, mtime=None):
+
+    """
+    This function indicates whether or not a file within a .zip file is in the cache and up to date.
+
+    :param str fname_zip: the name of the .zip file
+    :param str fname: the file name (.csv) within the .zip file
+    :param float mtime: the modification time of the .zip file. If None, it is read from the file system.
+
+    :return: True, if the file is in the cache and up to date. False, otherwise.
+    :rtype: bool
+    """
+
+    if mtime is None:
+        mtime = os.path.getmtime(fname_zip)
+
+    # the cached entry
+    x = CACHE.get( (fname_zip, fname) )
+
+    return (x is not None) and (x[0] == mtime)
+
+def load(fname_zip, fnames):
+
+    """
+    This function parses the given files within a .zip file and stores them in the cache. The .zip \
+    file is opened at most once. If the .zip file has an up-to-date store, the files are loaded from the \
+    store instead.
+
+    :param str fname_zip: the name of the .zip file
+    :param fnames: the file names (.csv) within the .zip file
+    :type fnames: list of str
+
+    :return: None
+    """
+
+    # the modification time of the .zip file
+    mtime = os.path.getmtime(fname_zip)
+
+    # the files that are not in the cache (or are outdated)
+    fnames = [x for x in fnames if not is_cached(fname_zip, x, mtime)]
+
+    if len(fnames) == 0:
+        return
+
+    if demography_store.is_current(fname_zip):
+
+        # memory-map the data from the store
+        fpath = demography_store.get_fpath(fname_zip)
+
+        for x in fnames:
+            CACHE[(fname_zip, x)] = (mtime, demography_store.read( fpath, demography_store.get_table(x) ))
+
+    else:
+
+        with zipfile.ZipFile(fname_zip, mode='r') as z:
+            for x in fnames:
+                CACHE[(fname_zip, x)] = (mtime, pd.read_csv( z.open(x) ))
+
+    return
+
+def load_demography(demo):
+
+    """
+    This function parses all of the statistical data for the activities done by a given demographic \
+    and stores them in the cache.
+
+    :param chad_demography.CHAD_demography demo: contains much information about the demographic
+
+    :return: None
+    """
+
+    # the file names of the statistical data for each activity done by the demographic
+    fnames = [x for k in demo.keys for x in demo.fname_stats[k].values()]
+
+    load(demo.fname_zip, fnames)
+
+    return
+
+def read_csv(fname_zip, fname):
+
+    """
+    This function returns the parsed data of a file (.csv) within a .zip file. The file is only \
+    parsed if it is not already in the cache.
+
+    .. note::
+        The returned data frame is shared with other callers. Do not modify it.
+
+    :param str fname_zip: the name of the .zip file
+    :param str fname: the file name (.csv) within the .zip file
+
+    :return: the parsed data
+    :rtype: pandas.core.frame.DataFrame
+    """
+
+    # parse the file, if needed
+    load(fname_zip, [fname])
+
+    return CACHE[(fname_zip, fname)][1]
@@ -27,7 +27,7 @@ sys.path.append('..\\processing')
 
 # ABMHAP modules
 import demography as dmg
-import chad
+import chad, demography_store
 
 # ===========================================
 # constants
@@ -520,6 +520,27 @@ class CHAD_demography(object):
 
         return
 
+    def load_raw(self, columns=None):
+
+        """
+        This function loads the raw CHAD questionnaire data and events data of the demographic from the \
+        columnar store of the .zip file (see :mod:`demography_store`). The numeric columns are \
+        memory-mapped, so only the columns that are used are read from the disk.
+
+        :param columns: the columns to load. If None, all of the columns are loaded
+        :type columns: list of str
+
+        :return: the CHAD questionnaire data, the CHAD events data
+        :rtype: pandas.core.frame.DataFrame, pandas.core.frame.DataFrame
+        :raises ValueError: if the store of the .zip file does not exist or is out of date
+        """
+
+        if not demography_store.is_current(self.fname_zip):
+            raise ValueError('ERROR! There is no up-to-date store of %s. See demography_store.save()' \
+                             % self.fname_zip)
+
+        return demography_store.load_raw(self.fname_zip, columns)
+
     def set_dt_bounds(self, start_min, start_max, end_min, end_max):
 
         """
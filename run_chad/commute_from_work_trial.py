@@ -46,6 +46,9 @@ class Commute_From_Work_Trial(trial.Trial):
     :param int demographic: the demographic identifier
     """
 
+    # the home holds only a transport and a workplace, so the universe can not be reused (see universe_pool)
+    can_pool = False
+
     def __init__(self, parameters, sampling_params, demographic):
 
         # constructor
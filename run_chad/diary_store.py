@@ -0,0 +1,241 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module saves and loads the activity diaries from the simulation in a columnar format \
+(Parquet or Feather).
+
+Each batch of the simulation is written as its own file in a dataset directory that is partitioned by \
+demographic. For example, the output for the second batch of the adult-work demographic is saved as
+
+    data_adult_work/demographic=4/part_b0001.parquet
+
+Since every batch is its own file, merging the batches does not require loading the data. A reader \
+only needs to load the columns and demographics that it needs (see :func:`read`).
+
+Each row of the dataset is an activity in the diary of a simulated person. The columns are the \
+household identifier, the person identifier within the household, and the columns of the activity \
+diary (day, start, end, dt, act, loc).
+
+.. note::
+    Saving and loading the data requires the *pyarrow* package.
+"""
+
+# ===========================================
+# import
+# ===========================================
+
+import os
+
+# mathematical capabilities
+import numpy as np
+
+# dataframe capabilities
+import pandas as pd
+
+# ===========================================
+# constants
+# ===========================================
+
+# the file formats
+FORMAT_FEATHER  = 'feather'
+FORMAT_PARQUET  = 'parquet'
+
+# the legacy format (the results are pickled)
+FORMAT_PKL      = 'pkl'
+
+# the columnar formats
+FORMATS = (FORMAT_FEATHER, FORMAT_PARQUET)
+
+# the file extension for each columnar format
+FORMAT_2_EXTENSION = { FORMAT_FEATHER: '.feather',
+                       FORMAT_PARQUET: '.parquet',
+                       }
+
+# the name of the directory of a partition
+F_PARTITION = 'demographic=%d'
+
+# the name of the file for a batch (without the extension)
+F_PART      = 'part_b%04d'
+
+# the columns in the dataset
+COLUMNS = ['hhld', 'person', 'day', 'start', 'end', 'dt', 'act', 'loc']
+
+# the data type of each column in the dataset
+COLUMN_2_DTYPE = { 'hhld': np.int32,
+                   'person': np.int16,
+                   'day': np.int32,
+                   'start': np.float64,
+                   'end': np.float64,
+                   'dt': np.float64,
+                   'act': np.int16,
+                   'loc': np.int16,
+                   }
+
+# ===========================================
+# functions
+# ===========================================
+
+def get_fname_batch(fpath, demographic, i, fmt=FORMAT_PARQUET):
+
+    """
+    This function gets the file name for a batch of data in the dataset.
+
+    :param str fpath: the directory of the dataset
+    :param int demographic: the demography identifier
+    :param int i: the batch index
+    :param str fmt: the file format
+
+    :return: the file name for the batch
+    :rtype: str
+    """
+
+    # the directory of the partition
+    fpath_partition = os.path.join(fpath, F_PARTITION % demographic)
+
+    # the file name
+    fname = os.path.join(fpath_partition, (F_PART % i) + FORMAT_2_EXTENSION[fmt])
+
+    return fname
+
+def get_frame(result, hhld_offset=0):
+
+    """
+    This function combines all of the activity diaries from the results of the simulation into one data \
+    frame with the columns of the dataset.
+
+    :param driver_result.Driver_Result result: the results of the simulation
+    :param int hhld_offset: the household identifier of the first household in the results
+
+    :return: the activity diaries in the columnar layout
+    :rtype: pandas.core.frame.DataFrame
+    """
+
+    # the activity diaries for each person
+    df_list = [ item.df for x in result.diaries for item in x ]
+
+    # the household identifier and the person identifier for each diary
+    hhld    = np.array( [ hhld_offset + i for i, x in enumerate(result.diaries) for item in x ], dtype=int )
+    person  = np.array( [ j for x in result.diaries for j, item in enumerate(x) ], dtype=int )
+
+    # the number of activities in each diary
+    counts  = np.array( [len(df) for df in df_list], dtype=int )
+
+    # combine the diaries
+    df = pd.concat(df_list, ignore_index=True)
+
+    # add the identifiers for each activity
+    df.insert(0, 'hhld', np.repeat(hhld, counts) )
+    df.insert(1, 'person', np.repeat(person, counts) )
+
+    # set the data types
+    df = df[COLUMNS].astype(COLUMN_2_DTYPE)
+
+    return df
+
+def is_columnar(fmt):
+
+    """
+    This function indicates whether or not a file format is a columnar format.
+
+    :param str fmt: the file format
+
+    :return: True, if the format is columnar. False, otherwise.
+    :rtype: bool
+    """
+
+    return fmt in FORMATS
+
+def read(fpath, columns=None, demographics=None, fmt=FORMAT_PARQUET):
+
+    """
+    This function loads the activity diaries from a dataset. Only the requested columns and \
+    demographics are loaded.
+
+    :param str fpath: the directory of the dataset
+    :param columns: the columns to load. If None, all of the columns are loaded.
+    :type columns: list of str
+    :param demographics: the demography identifiers to load. If None, all of the demographics are loaded.
+    :type demographics: list of int
+    :param str fmt: the file format
+
+    :return: the activity diaries. The column "demographic" indicates the demography identifier.
+    :rtype: pandas.core.frame.DataFrame
+    """
+
+    # the file extension
+    ext = FORMAT_2_EXTENSION[fmt]
+
+    # the function that loads a file
+    reader = pd.read_parquet if (fmt == FORMAT_PARQUET) else pd.read_feather
+
+    # the demographics in the dataset
+    prefix = F_PARTITION.split('%')[0]
+    demos  = sorted( [ int(x[len(prefix):]) for x in os.listdir(fpath) if x.startswith(prefix) ] )
+
+    if demographics is not None:
+        demos = [x for x in demos if x in demographics]
+
+    df_list = list()
+
+    for demo in demos:
+
+        # the directory of the partition
+        fpath_partition = os.path.join(fpath, F_PARTITION % demo)
+
+        # the batch files in order
+        fnames = sorted( [x for x in os.listdir(fpath_partition) if x.endswith(ext)] )
+
+        for f in fnames:
+
+            df = reader( os.path.join(fpath_partition, f), columns=columns )
+            df['demographic'] = np.int16(demo)
+
+            df_list.append(df)
+
+    # combine the data
+    if len(df_list) > 0:
+        df = pd.concat(df_list, ignore_index=True)
+    else:
+        df = pd.DataFrame(columns=(COLUMNS if columns is None else columns) + ['demographic'])
+
+    return df
+
+def write_batch(result, fpath, demographic, i, hhld_offset=0, fmt=FORMAT_PARQUET):
+
+    """
+    This function saves the activity diaries of a batch of the simulation as a file in the dataset.
+
+    :param driver_result.Driver_Result result: the results of the simulation for the batch
+    :param str fpath: the directory of the dataset
+    :param int demographic: the demography identifier
+    :param int i: the batch index
+    :param int hhld_offset: the household identifier of the first household in the batch
+    :param str fmt: the file format
+
+    :return: the file name of the saved batch
+    :rtype: str
+    """
+
+    # the file name
+    fname = get_fname_batch(fpath, demographic, i, fmt)
+
+    # create the directory of the partition if it does not exist
+    os.makedirs(os.path.dirname(fname), exist_ok=True)
+
+    # the activity diaries in columnar form
+    df = get_frame(result, hhld_offset)
+
+    # save the data
+    if fmt == FORMAT_PARQUET:
+        df.to_parquet(fname, index=False)
+    else:
+        df.to_feather(fname)
+
+    return fname
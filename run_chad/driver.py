@@ -58,6 +58,22 @@ To run in parallel using 4 cores with 32 households per batch, 2 batches(8 house
 
 \> :literal:`python driver.py 4 32 2`
 
+If the output is saved, the driver keeps a manifest of the batches that are done (see :mod:`manifest`). To resume \
+an interrupted simulation, run the same command with the file name of the manifest
+
+\> :literal:`python driver.py 4 32 2 --resume output_path\\data_adult_work_manifest.json`
+
+A large simulation may be split into shards that run independently on different machines (see :mod:`shard`). \
+Every shard must use the same seed (see driver_params.py). To run the third of 10 shards of 1000 households \
+(in 2 batches), run
+
+\> :literal:`python driver.py 4 1000 2 --shard-index 2 --shard-count 10`
+
+After every shard is done, merge the output of the shards (the manifests of the shards are found with the \
+pattern) into the directory **output_path**
+
+\> :literal:`python driver.py --merge "shards/**/data_adult_work_manifest.json" --output output_path`
+
 """
 
 # ===========================================
@@ -69,14 +85,11 @@ sys.path.append('..\\source')
 sys.path.append('..\\run')
 sys.path.append('..\\processing')
 
-# for plotting
-import matplotlib.pylab as plt
-
 # for parallelism
 import multiprocessing as mp
 
 # timing capability
-import datetime, os, time
+import datetime, glob, os, time
 
 # mathematical capabilities
 import numpy as np
@@ -86,9 +99,9 @@ import demography as dmg
 import my_globals as mg
 import driver_params as dp
 
-import chad_params, commute_from_work_trial, commute_to_work_trial, driver_result, \
-    eat_breakfast_trial, eat_dinner_trial, eat_lunch_trial, omni_trial, params, \
-    sleep_trial, trial, work_trial
+import chad_cache, chad_params, commute_from_work_trial, commute_to_work_trial, diary_store, driver_result, \
+    eat_breakfast_trial, eat_dinner_trial, eat_lunch_trial, manifest, omni_trial, params, \
+    population, profiler, shard, sleep_trial, trial, work_trial
 
 import chad_demography_adult_non_work as cdanw
 import chad_demography_adult_work as cdaw
@@ -124,8 +137,32 @@ TRIAL_2_CHAD_PARAMS = { trial.COMMUTE_FROM_WORK: chad_params.COMMUTE_FROM_WORK,
 # functions
 # ===========================================
 
+def append_result(diary_hhld, t, fname):
+
+    """
+    This function adds the results of one household to the end of a pickle stream \
+    (see :func:`my_globals.save_stream`) of results.
+
+    :param diary_hhld: the activity diaries of the household
+    :type diary_hhld: list of :class:`diary.Diary`
+    :param trial.Trial t: the input of the household
+    :param str fname: the file name of the pickle stream (.pkl)
+
+    :return: None
+    """
+
+    # the results of the household
+    result, _ = get_results([diary_hhld], [t])
+
+    # the measurements of the simulation (if any)
+    result.profile = t.profile
+
+    mg.append(result, fname)
+
+    return
+
 def create_trials(num_hhld, num_days, num_hours, num_min, trial_code, chad_activity_params, \
-                  demographic, num_people, do_minute_by_minute, do_print=False):
+                  demographic, num_people, do_minute_by_minute, do_print=False, seed=None, hhld_offset=0):
 
     """
     This function creates the input data for each household in the simulation.
@@ -142,6 +179,12 @@ def create_trials(num_hhld, num_days, num_hours, num_min, trial_code, chad_activ
     :param int num_people: the number of people per household
     :param bool do_minute_by_minute: a flag for how the time steps progress in the scheduler
     :param bool do_print: flag whether to print messages to the console
+    :param seed: the root seed of the random number generators. Each trial gets its own random number \
+    generator from the root seed (see :func:`my_globals.get_seed_sequences`). If None, the root seed is \
+    drawn from the *numpy.random* random number generator
+    :type seed: int or numpy.random.SeedSequence
+    :param int hhld_offset: the index of the first household in the simulation (used to choose the seed \
+    of each trial)
 
     :returns: input data where each entry corresponds to the input \
     for the respective household in the simulation
@@ -165,8 +208,15 @@ def create_trials(num_hhld, num_days, num_hours, num_min, trial_code, chad_activ
     # start timing
     start = time.time()
 
+    # parse the CHAD data for the demographic once. The trials read the parsed data from the cache. Since \
+    # this is done before the worker processes are created, the workers share the cache
+    chad_cache.load_demography( get_chad_demo(demographic) )
+
+    # the seed of each trial depends only on the root seed and the index of the household
+    seeds = mg.get_seed_sequences(seed, num_hhld, hhld_offset)
+
     # initialize the simulation inputs
-    trials = initialize_trials(param_list, trial_code, chad_activity_params, demographic)
+    trials = initialize_trials(param_list, trial_code, chad_activity_params, demographic, seeds)
 
     # end timing
     end = time.time()
@@ -233,8 +283,8 @@ def get_batch_filenames(fpath, fname):
     # get the file name before the '.'
     fname_temp = fname_temp[:idx]
 
-    # get the file names that are part of the batch
-    x = [('%s\\%s' % (fpath, f)) for f in fname_list if fname_temp in f]
+    # get the file names that are part of the batch (in the order of the batches)
+    x = [('%s\\%s' % (fpath, f)) for f in sorted(fname_list) if fname_temp in f]
 
     return x
 
@@ -256,10 +306,67 @@ def get_chad_demo(demographic):
 
     return chooser[demographic]
 
+def get_chunksize(num_trials, num_process):
+
+    """
+    This function chooses the number of trials to send to a worker process at a time when running in \
+    parallel. Each worker gets about 4 chunks per batch, which balances the load among the workers while \
+    keeping the communication between the processes low.
+
+    :param int num_trials: the number of trials to run
+    :param int num_process: the number of processes
+
+    :returns: the chunk size
+    :rtype: int
+    """
+
+    # the number of trials per chunk
+    chunksize, extra = divmod(num_trials, 4 * num_process)
+
+    if extra:
+        chunksize = chunksize + 1
+
+    return max(chunksize, 1)
+
+def get_cmd_line_options():
+
+    """
+    This function gets the options from the command line. An option is given as :literal:`--name value` \
+    and may be anywhere on the command line. The following options are used:
+
+    * :literal:`--resume fname`: the file name of the manifest of an interrupted simulation to resume
+    * :literal:`--shard-index k`: the index of the shard to run (see :mod:`shard`)
+    * :literal:`--shard-count n`: the number of shards
+    * :literal:`--merge pattern`: merge the output of the shards whose manifests match the (glob) pattern \
+    instead of running a simulation
+    * :literal:`--output fpath`: the directory of the merged output of the shards
+
+    :returns: the value of each option (None if the option is not given)
+    :rtype: dict
+    """
+
+    _, options = split_cmd_line(sys.argv)
+
+    # the options and their default values
+    x = {'resume': None, 'shard_index': None, 'shard_count': None, 'merge': None, 'output': None}
+
+    for k in x.keys():
+        x[k] = options.get(k, x[k])
+
+    # the shard options are integers and are given together
+    assert (x['shard_index'] is None) == (x['shard_count'] is None), \
+        '\n\nERROR. The options --shard-index and --shard-count must be given together! Quitting...'
+
+    if x['shard_count'] is not None:
+        x['shard_index'], x['shard_count'] = int(x['shard_index']), int(x['shard_count'])
+
+    return x
+
 def get_cmd_line_params():
 
     """
-    This function gets the parameters from the command line.
+    This function gets the parameters from the command line. The options (see \
+    :func:`get_cmd_line_options`) are ignored.
 
     The order of arguments to be read on the command line in order:
 
@@ -271,6 +378,9 @@ def get_cmd_line_params():
     :rtype: int, int, int
     """
 
+    # the command line without the options
+    argv, _ = split_cmd_line(sys.argv)
+
     #indices
     IDX_NUM_PROCESS = 1
     IDX_NUM_HHLD    = 2
@@ -280,7 +390,7 @@ def get_cmd_line_params():
     N_MAX   = 4
 
     # the number of arguments on the command line
-    N = len(sys.argv)
+    N = len(argv)
 
     # the error message if the something is wrong on the command line
     msg_error = '\n\nERROR. Did not specify the number of processors, number of households! Quitting...'
@@ -295,12 +405,12 @@ def get_cmd_line_params():
     # check to see if the the number of arguments is the full amount. If batch size is not entered, then it is \
     # assumed to be the value 1
 
-    num_process = sys.argv[IDX_NUM_PROCESS]
-    num_hhld    = sys.argv[IDX_NUM_HHLD]
+    num_process = argv[IDX_NUM_PROCESS]
+    num_hhld    = argv[IDX_NUM_HHLD]
 
     # all of the entries were entered on the command line
     if N == N_MAX:
-        num_batch = sys.argv[IDX_NUM_BATCH]
+        num_batch = argv[IDX_NUM_BATCH]
     else:
         # default batch size
         num_batch = 1
@@ -337,7 +447,7 @@ def get_current_batch_size(num_hhld, idx, max_batch_size):
 
     return batch_size
 
-def get_fnames(fpath, demographic, num_days, N, do_print=False):
+def get_fnames(fpath, demographic, num_days, N, do_print=False, shard_index=None, shard_count=None):
 
     """
     Given a directory, this function creates the file names that will be used
@@ -350,6 +460,9 @@ def get_fnames(fpath, demographic, num_days, N, do_print=False):
     :param int N: the total number of households
     :param bool do_print: a flag to indicate whether (if True) or not \
     (if False) to print a message to the screen
+    :param int shard_index: the index of the shard. If given, the files are saved in the directory of \
+    the shard (see :func:`shard.get_path`)
+    :param int shard_count: the number of shards
 
     :returns: the file name to save the trials data (".pkl" extension); \
     the file name to save the data (".pkl" extension"), \
@@ -362,19 +475,12 @@ def get_fnames(fpath, demographic, num_days, N, do_print=False):
     # the path to save the the data
     fpath_save      = set_save_path(fpath, N, num_days)
 
-    # choose the file names for the given demographic
-    chooser_fname   = { dmg.ADULT_WORK: (fpath_save + '\\trials_adult_work.pkl', \
-                                         fpath_save + '\\data_adult_work.pkl'),
-                        dmg.ADULT_NON_WORK: (fpath_save + '\\trials_adult_non_work.pkl', \
-                                             fpath_save + '\\data_adult_non_work.pkl'),
-                        dmg.CHILD_SCHOOL: (fpath_save + '\\trials_child_school.pkl', \
-                                           fpath_save + '\\data_child_school.pkl'),
-                        dmg.CHILD_YOUNG: (fpath_save + '\\trials_child_young.pkl', \
-                                          fpath_save + '\\data_child_young.pkl'),
-                        }
+    # each shard saves the data in its own directory
+    if shard_count is not None:
+        fpath_save  = shard.get_path(fpath_save, shard_index, shard_count)
 
     # get the file name of the trials and data, respectively
-    fname_trials, fname_data = chooser_fname[demographic]
+    fname_trials, fname_data = get_fnames_in_path(fpath_save, demographic)
 
     #
     # Strip the ".pkl" at the end of the file name ino order to do batch saving
@@ -388,6 +494,33 @@ def get_fnames(fpath, demographic, num_days, N, do_print=False):
 
     return fname_trials, fname_data, fname_trials_base, fname_data_base
 
+def get_fnames_in_path(fpath_save, demographic):
+
+    """
+    Given the directory of the saved data, this function returns the file names of the ABMHAP trials \
+    (input) and the ABMHAP data (output) according to the respective demographic.
+
+    :param str fpath_save: the directory in which to save the files
+    :param int demographic: the demography identifier
+
+    :returns: the file name to save the trials data (".pkl" extension), \
+    the file name to save the data (".pkl" extension")
+    :rtype: str, str
+    """
+
+    # choose the file names for the given demographic
+    chooser_fname   = { dmg.ADULT_WORK: (fpath_save + '\\trials_adult_work.pkl', \
+                                         fpath_save + '\\data_adult_work.pkl'),
+                        dmg.ADULT_NON_WORK: (fpath_save + '\\trials_adult_non_work.pkl', \
+                                             fpath_save + '\\data_adult_non_work.pkl'),
+                        dmg.CHILD_SCHOOL: (fpath_save + '\\trials_child_school.pkl', \
+                                           fpath_save + '\\data_child_school.pkl'),
+                        dmg.CHILD_YOUNG: (fpath_save + '\\trials_child_young.pkl', \
+                                          fpath_save + '\\data_child_young.pkl'),
+                        }
+
+    return chooser_fname[demographic]
+
 def get_loaded_trials_for_batch(loaded_trials, i, batch_size):
 
     """
@@ -461,7 +594,7 @@ def get_results(diaries, trials):
 
     return results, param_list
 
-def initialize_trials(param_list, trial_code, chad_activity_params, demographic):
+def initialize_trials(param_list, trial_code, chad_activity_params, demographic, seeds=None):
 
     """
     This function initializes the trials (input parameters) for the simulation.
@@ -473,6 +606,9 @@ def initialize_trials(param_list, trial_code, chad_activity_params, demographic)
     :param int trial_code: the code of what trial to run
     :param chad_params.CHAD_params chad_activity_params: the activity parameters used to sample "good" CHAD data
     :param int demographic: this is the code for what demographic to run
+    :param seeds: the seed of the random number generators for each trial. If None, the trials use the \
+    *numpy.random* random number generator
+    :type seeds: list of numpy.random.SeedSequence
 
     :returns: the initialized simulation scenarios
     :rtype: list of :class:`trial.Trial`
@@ -481,7 +617,7 @@ def initialize_trials(param_list, trial_code, chad_activity_params, demographic)
     trials = list()
 
     # create and initialize each trial
-    for x in param_list:
+    for i, x in enumerate(param_list):
 
         # choose the correct trial constructor
         f = TRIAL_2_CONSTRUCTOR[trial_code]
@@ -489,6 +625,10 @@ def initialize_trials(param_list, trial_code, chad_activity_params, demographic)
         # create the trial object using the constructor f()
         t = f(x, chad_activity_params, demographic)
 
+        # set the random number generators of the trial
+        if seeds is not None:
+            t.set_seed(seeds[i])
+
         t.initialize()
 
         # add the initialized trial to the list of trials to do
@@ -570,6 +710,35 @@ def load_trials_for_batches(fname_load_trials_base, num_batch, do_print):
 
     return trials, fname_load_trials, batch_size
 
+def merge_shards(pattern, fpath, do_print=False):
+
+    """
+    This function merges the output of the shards of a simulation (see :func:`shard.merge`) and saves \
+    the merged output in the given directory.
+
+    :param str pattern: the (glob) pattern of the file names of the manifests of the shards
+    :param str fpath: the directory in which to save the merged output
+    :param bool do_print: a flag indicating whether to print (if True) or not (if False)
+
+    :returns: the file name of the merged input data, the file name of the merged output data
+    :rtype: str, str
+    """
+
+    # the manifests of the shards
+    fnames_manifest = sorted( glob.glob(pattern, recursive=True) )
+
+    if len(fnames_manifest) == 0:
+        raise ValueError('ERROR! There are no manifests matching %s' % pattern)
+
+    # the file names of the merged output for the demographic
+    demographic = manifest.load(fnames_manifest[0]).config['demographic']
+
+    fname_trials, fname_data = get_fnames_in_path(fpath, demographic)
+
+    shard.merge(fnames_manifest, fname_trials, fname_data, do_print)
+
+    return fname_trials, fname_data
+
 def print_end(elapsed_time):
 
     """
@@ -622,7 +791,8 @@ def print_starting_info(num_hhld, batch_size, num_batch, num_days, num_process,
 
     return
 
-def run(num_process, trials, do_print=False):
+def run(num_process, trials, do_print=False, pool=None, chunksize=None, do_population=False, do_profile=False, \
+        do_pool=True, fname=None):
 
     """
     This function runs each simulation (in serial or parallel).
@@ -631,13 +801,30 @@ def run(num_process, trials, do_print=False):
     :param trials: the input for each simulation
     :type trials: list of :class:`trial.Trial`
     :param bool do_print: a flag indicating whether to print (if True) or not (if False)
-
-    :returns: the results of the simulations, the input parameters
+    :param multiprocessing.pool.Pool pool: the worker processes used to run in parallel. If None, a pool is \
+    created (and closed) for this call
+    :param int chunksize: the number of trials sent to a worker process at a time. If None, it is chosen by \
+    :func:`get_chunksize`
+    :param bool do_population: a flag indicating whether to run all of the trials at once with \
+    :class:`population.Population` (if True) or each trial with its own universe (if False). This is \
+    only for households with 1 person and trials with every activity (:const:`trial.OMNI`)
+    :param bool do_profile: a flag indicating whether to measure where the time goes in each simulation \
+    (if True) or not (if False). The measurements from every household (and every worker process) are \
+    combined and stored in the results (see :mod:`profiler`). This is not done with \
+    :class:`population.Population`
+    :param bool do_pool: a flag indicating whether each process reuses the universe (and the agents) of \
+    the previous household (if True) or creates a new universe for each household (if False) \
+    (see :mod:`universe_pool`). The results are the same either way
+    :param str fname: the file name (.pkl) in which to save the results. If given, the results of each \
+    household are saved (in the order of the trials) as soon as they are done and are not kept in memory. \
+    The file is a pickle stream with the results of one household per object (see :func:`append_result`)
+
+    :returns: the results of the simulations (None, if the results are saved in the file), the input parameters
     :rtype: diary_result.Diary_result, list of :class:`params.Params`
     """
 
-    # close all plots
-    plt.close('all')
+    # close all plots (if any)
+    mg.close_plots()
 
     # start timing
     start = time.time()
@@ -645,19 +832,43 @@ def run(num_process, trials, do_print=False):
     if do_print:
         print('starting...')
 
+    # measure the simulations and reuse the universes
+    for t in trials:
+        t.do_profile    = do_profile
+        t.do_pool       = do_pool
+
+    #
+    # run all of the households at once
+    #
+
+    # start the file of the results
+    if fname is not None:
+        mg.save_stream(fname, mg.STREAM_OBJECTS)
+
+    if do_population:
+        diaries = run_population(trials)
+
+        # save the results of each household
+        if fname is not None:
+
+            for diary_hhld, t in zip(diaries, trials):
+                append_result(diary_hhld, t, fname)
+
+            diaries = None
+
     #
     # run in serial
     #
 
-    if num_process == 1:
+    elif num_process == 1:
         # this test prints the parameters for each agent in the trial
-        diaries = run_serial(trials, do_print=True)
+        diaries = run_serial(trials, do_print=True, fname=fname)
 
     #
     # run in parallel
     #
     else:
-        diaries = run_parallel(num_process, trials)
+        diaries = run_parallel(num_process, trials, pool=pool, chunksize=chunksize, fname=fname)
 
     # record the elapsed simulation time
     end = time.time()
@@ -667,18 +878,38 @@ def run(num_process, trials, do_print=False):
     if do_print:
         print('elapsed time for driver.run():\t%.3f [s]' % total_simulation_time)
 
-    # get the results
-    results, param_list = get_results(diaries, trials)
+    # get the results (the results that were saved are not kept)
+    if fname is None:
+        results, param_list = get_results(diaries, trials)
+    else:
+        results, param_list = None, [t.params for t in trials]
+
+    # combine the measurements of each simulation
+    if do_profile:
+
+        profile = profiler.combine( [t.profile for t in trials] )
+
+        if results is not None:
+            results.profile = profile
+
+        if do_print and (profile is not None):
+            print( profile.toString() )
 
     return results, param_list
 
 def run_batch(num_batch, num_hhld, num_process, num_days, num_hours, num_min, trial_code, chad_activity_params, \
               demographic, num_people, do_minute_by_minute, do_print, do_save, \
-              fpath, do_load_trials=False, fname_load_trials_base=None):
+              fpath, do_load_trials=False, fname_load_trials_base=None, chunksize=None, \
+              save_format=diary_store.FORMAT_PKL, seed=None, fname_resume=None, shard_index=None, \
+              shard_count=None, do_population=False, do_profile=False):
 
     """
     Run the simulation in batches.
 
+    If the output is saved, a manifest (see :mod:`manifest`) records the parameters of the simulation \
+    and the status of each batch. If the simulation is interrupted, it may be resumed from the manifest: \
+    the batches that are done are skipped and the other batches are run again with the same seeds.
+
     :param int num_batch: the number of batches
     :param int num_hhld: the total number of households to simulate
     :param int num_process: the number of processors used
@@ -699,6 +930,26 @@ def run_batch(num_batch, num_hhld, num_process, num_days, num_hours, num_min, tr
     file instead of creating a new set of trials
     :param str fname_load_trials_base: the file name for the ABMHAP trials without the .pkl, which will be used for \
     saving the trial information (.pkl)
+    :param int chunksize: the number of trials sent to a worker process at a time when running in parallel. If \
+    None, it is chosen by :func:`get_chunksize`
+    :param str save_format: the file format of the output. If the format is columnar (see \
+    :mod:`diary_store`), the activity diaries of each batch are saved in a dataset in the directory given by \
+    the file name of the output data (no ".pkl"). Otherwise, the results of each batch are saved as a .pkl file, \
+    one household at a time as the households are done (see :func:`run`)
+    :param int seed: the root seed of the random number generators of the trials. If None, the root seed is \
+    drawn from the *numpy.random* random number generator. The trial for each household gets the same seed \
+    regardless of the number of batches or processes. When resuming, the seed recorded in the manifest is used
+    :param str fname_resume: the file name of the manifest of an interrupted simulation to resume. If None, \
+    a new simulation is run. The parameters of the simulation must match the parameters in the manifest
+    :param int shard_index: the index of the shard to run. If given, only the households in the shard \
+    (see :func:`shard.get_range`) are simulated, in batches, and the output is saved in the directory of \
+    the shard. Every shard must use the same seed
+    :param int shard_count: the number of shards
+    :param bool do_population: a flag indicating whether to run the households of each batch at once with \
+    :class:`population.Population` (if True) or each household with its own universe (if False) (see :func:`run`)
+    :param bool do_profile: a flag indicating whether to measure where the time goes in each household (if True) \
+    or not (if False). The combined measurements of each batch are printed (if do_print) and the measurements \
+    of each household are saved with the .pkl output (see :func:`append_result`)
 
     :returns: the file name of the input data, \
     the file name of the output data, \
@@ -728,71 +979,264 @@ def run_batch(num_batch, num_hhld, num_process, num_days, num_hours, num_min, tr
         #
         num_days    = loaded_trials[0].params.num_days
         num_hhld    = len(loaded_trials)
-    else:
+
+    # the index of the first household simulated
+    hhld_offset     = 0
+
+    # the total number of households in the simulation
+    num_hhld_total  = num_hhld
+
+    # only simulate the households in the shard
+    if shard_count is not None:
+
+        if seed is None:
+            raise ValueError('ERROR! Every shard must use the same seed. Set the seed!')
+
+        if do_load_trials:
+            raise ValueError('ERROR! Loading trials is not supported for shards!')
+
+        hhld_offset, num_hhld = shard.get_range(num_hhld_total, shard_index, shard_count)
+
+    if not do_load_trials:
         max_batch_size = get_max_batch_size(num_hhld, num_batch)
 
     #  print starting information
     print_starting_info(num_hhld, max_batch_size, num_batch, num_days, num_process, mp.cpu_count())
 
-    # create the file names for saving files
-    fname_trials, fname_data, fname_trials_base, fname_data_base = \
-        get_fnames(fpath, demographic, num_days, num_hhld, do_print)
+    # the parameters of the simulation recorded in the manifest
+    config = {'num_hhld': int(num_hhld), 'num_batch': int(num_batch), 'max_batch_size': int(max_batch_size), \
+              'num_days': int(num_days), 'num_hours': int(num_hours), 'num_min': int(num_min), \
+              'trial_code': int(trial_code), 'demographic': int(demographic), 'num_people': int(num_people), \
+              'do_minute_by_minute': bool(do_minute_by_minute), \
+              'do_load_trials': do_load_trials, 'fname_load_trials_base': fname_load_trials_base, \
+              'save_format': save_format, 'do_population': bool(do_population)}
+
+    if shard_count is not None:
+        config.update( {'num_hhld_total': int(num_hhld_total), 'hhld_offset': int(hhld_offset), \
+                        'shard_index': int(shard_index), 'shard_count': int(shard_count)} )
 
     #
-    # loop through batches
+    # start a new simulation
     #
-    for i in range(num_batch):
+    if fname_resume is None:
 
-        # the number of households to simulate for the current batch
-        batch_size = get_current_batch_size(num_hhld, i, max_batch_size)
+        # create the file names for saving files
+        fname_trials, fname_data, fname_trials_base, fname_data_base = \
+            get_fnames(fpath, demographic, num_days, num_hhld_total, do_print, shard_index, shard_count)
 
-        #
-        # set the trials (input)
-        #
+        # the root seed shared by all of the batches
+        seed_root = mg.get_seed_sequence(seed)
 
-        # load the trials data
-        if do_load_trials:
+        # the record of the simulation
+        the_manifest = None
 
-            # load the trials data for this batch
-            trials = get_loaded_trials_for_batch(loaded_trials, i, batch_size)
+        if do_save:
 
-        else:
+            config['seed']  = manifest.get_seed_config(seed_root)
 
-            # if not loading pre-existing trials data, create trials data for this batch
-            trials = create_trials(batch_size, num_days, num_hours, num_min, trial_code, \
-                                   chad_activity_params, demographic, num_people, \
-                                   do_minute_by_minute, do_print)
+            fnames          = {'fname_trials': fname_trials, 'fname_data': fname_data, \
+                               'fname_trials_base': fname_trials_base, 'fname_data_base': fname_data_base}
 
-        #
-        # set the file names for saving data for this batch
-        #
+            # the size and the index of the first household of each batch
+            batches         = [ (get_current_batch_size(num_hhld, i, max_batch_size), \
+                                 hhld_offset + i * max_batch_size) \
+                                for i in range(num_batch) ]
 
-        # set the file names for the save files for the current batch
-        fname_save_trials, fname_save_data \
-            = set_save_files_for_batch(fname_trials_base, fname_data_base, i, do_print)
+            the_manifest    = manifest.Manifest(manifest.get_fname(fname_data_base), config, fnames, batches)
+            the_manifest.save()
 
-        #
-        # run the simulation
-        #
+    #
+    # resume an interrupted simulation
+    #
+    else:
+
+        if not do_save:
+            raise ValueError('ERROR! Resuming a simulation requires saving the output (do_save)!')
+
+        # load the record of the simulation and make sure it is the same simulation
+        the_manifest    = manifest.load(fname_resume)
+        config['seed']  = the_manifest.config['seed']
+
+        the_manifest.check_config(config)
+
+        # use the same file names and seeds as the interrupted simulation
+        x = the_manifest.fnames
+        fname_trials, fname_data = x['fname_trials'], x['fname_data']
+        fname_trials_base, fname_data_base = x['fname_trials_base'], x['fname_data_base']
+
+        seed_root = the_manifest.get_seed()
+
+        if do_print:
+            print('resuming from the manifest:\t%s' % fname_resume)
 
-        result, param_list = run(num_process, trials, do_print)
+    # create the worker processes once and use them for all of the batches
+    pool = mp.Pool(processes=num_process) if (num_process > 1) else None
+
+    try:
 
         #
-        # save the data from the batch as a .pkl file
+        # loop through batches
         #
+        for i in range(num_batch):
 
-        if do_save:
-            save_for_batch(trials, fname_save_trials, do_print)
-            save_for_batch(result, fname_save_data, do_print)
+            # skip the batches that are already done
+            if (the_manifest is not None) and the_manifest.is_done(i):
+
+                if do_print:
+                    print('\nBatch number: %d is done. Skipping...' % i)
+
+                continue
+
+            # record that the batch started
+            if the_manifest is not None:
+                the_manifest.set_running(i)
+
+            # the number of households to simulate for the current batch
+            batch_size = get_current_batch_size(num_hhld, i, max_batch_size)
+
+            #
+            # set the trials (input)
+            #
+
+            # load the trials data
+            if do_load_trials:
+
+                # load the trials data for this batch
+                trials = get_loaded_trials_for_batch(loaded_trials, i, batch_size)
+
+            else:
+
+                # if not loading pre-existing trials data, create trials data for this batch
+                trials = create_trials(batch_size, num_days, num_hours, num_min, trial_code, \
+                                       chad_activity_params, demographic, num_people, \
+                                       do_minute_by_minute, do_print, seed=seed_root, \
+                                       hhld_offset=hhld_offset + i * max_batch_size)
+
+            #
+            # set the file names for saving data for this batch
+            #
+
+            # set the file names for the save files for the current batch
+            fname_save_trials, fname_save_data \
+                = set_save_files_for_batch(fname_trials_base, fname_data_base, i, do_print)
+
+            #
+            # run the simulation
+            #
+
+            # save the .pkl output of each household as it is done
+            do_stream = do_save and not diary_store.is_columnar(save_format)
+
+            if do_stream and do_print:
+                print('saving data....\nFile name: \t%s' % fname_save_data)
+
+            result, param_list = run(num_process, trials, do_print, pool=pool, chunksize=chunksize, \
+                                     do_population=do_population, do_profile=do_profile, \
+                                     fname=fname_save_data if do_stream else None)
+
+            #
+            # save the data from the batch
+            #
+
+            if do_save:
+
+                # save the input as a .pkl file
+                save_for_batch(trials, fname_save_trials, do_print)
+
+                # save the columnar output (the .pkl output is already saved)
+                if diary_store.is_columnar(save_format):
+                    fname_save_data = save_for_batch_columnar(result, fname_data_base, demographic, i, \
+                                                              hhld_offset + i * max_batch_size, save_format, \
+                                                              do_print)
+
+                # record that the batch is done
+                the_manifest.set_done(i, fname_save_trials, fname_save_data)
+
+    finally:
+
+        # shut down the worker processes
+        if pool is not None:
+            pool.close()
+            pool.join()
 
     return fname_trials, fname_data, fname_trials_base, fname_data_base
 
-def run_parallel(num_process, trials):
+def run_parallel(num_process, trials, pool=None, chunksize=None, fname=None):
 
     """
     This function runs the simulation in parallel.
 
+    The trials are sent to the worker processes in chunks. The results are collected as they finish \
+    (in any order) and are stored in the same order as the trials. The measurements of each simulation \
+    (if any) are stored in the respective trial (see :attr:`trial.Trial.profile`).
+
+    If a file name is given, the results of each household are saved (see :func:`append_result`) as soon \
+    as the results of the households before it are done. Only the results that finished out of order are \
+    kept in memory.
+
     :param int num_process: the number of processors used
+    :param trials: the input data
+    :type trials: list of :class:`trial.Trial`
+    :param multiprocessing.pool.Pool pool: the worker processes. If None, a pool is created (and closed) \
+    for this call
+    :param int chunksize: the number of trials sent to a worker process at a time. If None, it is chosen by \
+    :func:`get_chunksize`
+    :param str fname: the file name of the pickle stream in which to save the results. If None, the results \
+    are returned
+
+    :returns: the output of the simulations (None, if the results are saved in the file)
+    :rtype: list of :class:`diary.Diary`
+    """
+
+    # set the chunk size
+    if chunksize is None:
+        chunksize = get_chunksize(len(trials), num_process)
+
+    # pool the threads, if there is no pool
+    is_own_pool = pool is None
+    if is_own_pool:
+        pool = mp.Pool(processes=num_process)
+
+    # the simulation data for each simulation
+    diaries = [None] * len(trials) if (fname is None) else None
+
+    # the results that are done before the results of an earlier trial, and the index of the next trial to save
+    waiting, i_next = dict(), 0
+
+    try:
+
+        # store the results as they finish
+        for i, diary_hhld, profile in pool.imap_unordered(run_trials_parallel_indexed, enumerate(trials), chunksize):
+
+            trials[i].profile   = profile
+
+            if fname is None:
+                diaries[i]  = diary_hhld
+
+            else:
+                waiting[i]  = diary_hhld
+
+                # save the results in the order of the trials
+                while i_next in waiting:
+                    append_result(waiting.pop(i_next), trials[i_next], fname)
+                    i_next = i_next + 1
+
+    finally:
+
+        # shut down the worker processes that were created for this call
+        if is_own_pool:
+            pool.close()
+            pool.join()
+
+    return diaries
+
+def run_population(trials):
+
+    """
+    This function runs the simulation for all of the trials at once with a \
+    :class:`population.Population`. Each trial must have 1 person. The Population simulates every \
+    activity, so only trials with every activity (:const:`trial.OMNI`) are supported.
+
     :param trials: the input data
     :type trials: list of :class:`trial.Trial`
 
@@ -800,15 +1244,21 @@ def run_parallel(num_process, trials):
     :rtype: list of :class:`diary.Diary`
     """
 
-    # pool the threads
-    p = mp.Pool(processes=num_process)
+    for t in trials:
+        if (t.id != trial.OMNI):
+            raise ValueError('Population only supports trials with every activity (trial.OMNI)!')
 
-    # the simulation data for each simulation
-    diaries = p.map(run_trials_parallel, trials)
+    # the households stepped in lockstep. Each household uses the random number generator of its trial
+    pop = population.Population( [t.params for t in trials], [t.seed_run for t in trials] )
+
+    # run the simulation
+    pop.run()
+
+    diaries = pop.get_diaries()
 
     return diaries
 
-def run_serial(trials, do_print=False):
+def run_serial(trials, do_print=False, fname=None):
 
     """
     This function runs the simulation in serial.
@@ -816,12 +1266,14 @@ def run_serial(trials, do_print=False):
     :param trials: the input data
     :type trials: list of :class:`trial.Trial`
     :param bool do_print: a flag whether or not to print the trial number
+    :param str fname: the file name of the pickle stream in which to save the results of each household as \
+    it is done (see :func:`append_result`). If None, the results are returned
 
-    :returns: the output of the simulations
+    :returns: the output of the simulations (None, if the results are saved in the file)
     :rtype: list of :class:`diary.Diary`
     """
 
-    diaries = []
+    diaries = [] if (fname is None) else None
 
     # loop through each simulation
     for i, t in enumerate(trials):
@@ -829,7 +1281,10 @@ def run_serial(trials, do_print=False):
         if do_print:
             print('trial: %d' % i)
 
-        diaries.append(t.run())
+        if fname is None:
+            diaries.append(t.run())
+        else:
+            append_result(t.run(), t, fname)
 
     return diaries
 
@@ -849,7 +1304,29 @@ def run_trials_parallel(t):
 
     return diary_hhld
 
-def save(fname_data, fname_trials, fname_data_base, fname_trials_base, num_batch, do_print=False):
+def run_trials_parallel_indexed(x):
+
+    """
+    This function is called in order to run the trials in parallel when the results may come back out of \
+    order. The index of the trial and the measurements of the simulation (if any) are returned with the results.
+
+    :param x: the index of the trial and the trial to run
+    :type x: tuple of int, :class:`trial.Trial`
+
+    :return: the index of the trial, the results of the simulation, the measurements of the simulation
+    :rtype: int, diary.Diary, profiler.Profiler
+    """
+
+    # the index and the trial
+    i, t = x
+
+    # run the simulation
+    diary_hhld = run_trials_parallel(t)
+
+    return i, diary_hhld, t.profile
+
+def save(fname_data, fname_trials, fname_data_base, fname_trials_base, num_batch, do_print=False, \
+         save_format=diary_store.FORMAT_PKL):
 
     """
     This function saves the input and output from the simulation. It merges \
@@ -857,6 +1334,9 @@ def save(fname_data, fname_trials, fname_data_base, fname_trials_base, num_batch
     trials data (input) but also the ABMHAP simulation data (output). Afterwards, \
     the individual batch files are deleted.
 
+    If the output is saved in a columnar format, the batches of the output are already a dataset \
+    (see :mod:`diary_store`) and only the trials data (input) are merged.
+
     :param str fname_data: the file name in which to save the ABMHAP data (output)
     :param str fname_trials: the file name in which to save the ABMHAP trials (input)
     :param str fname_data_base: the base (no ".pkl" extension) of the file name in \
@@ -864,21 +1344,26 @@ def save(fname_data, fname_trials, fname_data_base, fname_trials_base, num_batch
     :param str fname_trials_base: the base (no ".pkl" extension) of file name in \
     which to save the ABMHAP trials (input)
     :param bool do_print: print flag
-
+    :param str save_format: the file format of the output
 
     :returns:
     """
 
     # save the batch files as 1 unit
-    save_batch_data_as_one_file(fname_data, do_print)
     save_batch_trials_as_one_file(fname_trials, do_print)
-
-    # clean up the batch files
-    delete_batch_files(fname_data_base, num_batch)
     delete_batch_files(fname_trials_base, num_batch)
 
-    # save the data as a .csv
-    save_diary_to_csv(fname_data)
+    # the columnar output does not need to be merged
+    if not diary_store.is_columnar(save_format):
+
+        # save the batch files as 1 unit
+        save_batch_data_as_one_file(fname_data, do_print)
+
+        # clean up the batch files
+        delete_batch_files(fname_data_base, num_batch)
+
+        # save the data as a .csv
+        save_diary_to_csv(fname_data)
 
     return
 
@@ -887,6 +1372,10 @@ def save_batch_data_as_one_file(fname, do_print=False):
     """
     The function combines the ABMHAP data from the individual batch saves and saves them in one file.
 
+    The file is a pickle stream (see :func:`my_globals.save_stream`) of the results of each household. \
+    The results are loaded and added to the file one household at a time, so only one household is in memory \
+    at a time. Use :func:`driver_result.load` to load the combined results.
+
     :param str fname: the file name of the ABMHAP data (.pkl)
 
     :returns:
@@ -901,19 +1390,17 @@ def save_batch_data_as_one_file(fname, do_print=False):
     # get the batch file names
     fname_list  = get_batch_filenames(fpath, f_name)
 
-    # get the data
-    data_list   = [ mg.load(x) for x in fname_list]
-
-    # save the results
-    result      = driver_result.Batch_Result(data_list)
-
     # saving message
     if do_print:
         msg         = 'saving all batch data....\nFile name: \t%s' % fname
         print(msg)
 
-    # save the data
-    mg.save(result, fname)
+    # save the data one household at a time
+    mg.save_stream(fname, mg.STREAM_OBJECTS)
+
+    for x in fname_list:
+        for y in mg.load_stream(x):
+            mg.append(y, fname)
 
     return
 
@@ -923,6 +1410,10 @@ def save_batch_trials_as_one_file(fname, do_print=False):
     This function combines the trial (input) data from the individual \
     batch saves and saves them in one file.
 
+    The file is a pickle stream (see :func:`my_globals.save_stream`) of the list of trials of \
+    each batch, so only one batch is in memory at a time. :func:`my_globals.load` returns \
+    the trials of every batch in one list.
+
     :param str fname: the file name of the trials data (.pkl)
     :param bool do_print: print flag
 
@@ -937,19 +1428,16 @@ def save_batch_trials_as_one_file(fname, do_print=False):
     # get the batch filen ames
     fname_list  = get_batch_filenames(fpath, f_name)
 
-    # get the data
-    trials_list   = [ mg.load(x) for x in fname_list]
-
-    # save the results
-    trials = [ subitem for item in trials_list for subitem in item ]
-
     # saving message
     if do_print:
         msg         = 'saving all batch trials....\nFile name: \t%s' % fname
         print(msg)
 
-    # save the data
-    mg.save(trials, fname)
+    # save the data one batch at a time
+    mg.save_stream(fname, mg.STREAM_LIST)
+
+    for x in fname_list:
+        mg.append( mg.load(x), fname )
 
     return
 
@@ -957,16 +1445,14 @@ def save_diary_to_csv(fname):
 
     """
     This function loads an activity diary from a compressed file format \
-    and saves it as a .csv file.
+    and saves it as a .csv file. If the file holds the results of many batches, \
+    the batches are written one at a time (see :func:`driver_result.save_to_csv`).
 
     :param str fname: the pickle file that holds the activity diary file.
 
     :returns:
     """
 
-    # load the data as driver_rest.Driver_Result object
-    data = mg.load(fname)
-
     # acceptable extensions for pickle files
     extensions = mg.EXTENSION_PKL
 
@@ -974,7 +1460,7 @@ def save_diary_to_csv(fname):
     fname_csv = [ fname.replace(x, '.csv') for x in extensions if x in fname ][0]
 
     # save the diary as a .csv file
-    mg.save_diary_to_csv( data.get_combined_diary(), fname_csv)
+    driver_result.save_to_csv([fname], fname_csv)
 
     return
 
@@ -1000,6 +1486,33 @@ def save_for_batch(result, fname, do_print=False):
 
     return
 
+def save_for_batch_columnar(result, fpath, demographic, i, hhld_offset=0, save_format=diary_store.FORMAT_PARQUET, \
+                            do_print=False):
+
+    """
+    Save the activity diaries for the current batch in a columnar dataset.
+
+    :param driver_result.Driver_Result result: the result of the simulation for the current batch
+    :param str fpath: the directory of the dataset
+    :param int demographic: the demography identifier
+    :param int i: the current batch index
+    :param int hhld_offset: the household identifier of the first household in the batch
+    :param str save_format: the columnar file format
+    :param bool do_print: print flag
+
+    :returns: the file name of the saved batch
+    :rtype: str
+    """
+
+    # save the data from the batch
+    fname = diary_store.write_batch(result, fpath, demographic, i, hhld_offset, save_format)
+
+    if do_print:
+        msg = 'saving data....\nFile name: \t%s' % fname
+        print(msg)
+
+    return fname
+
 def set_save_files_for_batch(fname_trials_base, fname_data_base,  i, do_print=False):
 
     """
@@ -1060,7 +1573,41 @@ def set_save_path(fpath, N, num_days):
 
     return fpath_data
 
-def run_everything(num_process, num_hhld, num_batch):
+def split_cmd_line(argv):
+
+    """
+    This function splits the command line into the positional arguments and the options. An option \
+    is given as :literal:`--name value`.
+
+    :param argv: the command line
+    :type argv: list of str
+
+    :returns: the positional arguments, the value of each option
+    :rtype: list of str, dict
+    """
+
+    args, options = list(), dict()
+
+    i = 0
+    while i < len(argv):
+
+        x = argv[i]
+
+        if x.startswith('--'):
+
+            # make sure the option has a value
+            assert i + 1 < len(argv), '\n\nERROR. The option %s does not have a value! Quitting...' % x
+
+            options[ x[2:].replace('-', '_') ] = argv[i + 1]
+            i = i + 2
+
+        else:
+            args.append(x)
+            i = i + 1
+
+    return args, options
+
+def run_everything(num_process, num_hhld, num_batch, fname_resume=None, shard_index=None, shard_count=None):
 
     """
     This code runs the Monte-Carlo simulations. More specifically, it
@@ -1072,6 +1619,10 @@ def run_everything(num_process, num_hhld, num_batch):
     :param int num_process: the number of processes
     :param int num_hhld: the number of households per core per batch
     :param int num_batch: the number of batches
+    :param str fname_resume: the file name of the manifest of an interrupted simulation to resume. If None, \
+    a new simulation is run
+    :param int shard_index: the index of the shard to run. If None, every household is simulated
+    :param int shard_count: the number of shards
 
     :return: the file name for the input data, the file name for the output data
     :rtype: str, str
@@ -1094,7 +1645,9 @@ def run_everything(num_process, num_hhld, num_batch):
         = run_batch(num_batch, num_hhld, num_process, dp.num_days, dp.num_hours, \
                     dp.num_min, dp.trial_code, chad_demo.int_2_param, dp.demographic, \
                     dp.num_people, dp.do_minute_by_minute, \
-                    dp.do_print, dp.do_save, dp.fpath, dp.do_load_trials, dp.fname_load_trials_base)
+                    dp.do_print, dp.do_save, dp.fpath, dp.do_load_trials, dp.fname_load_trials_base, \
+                    dp.chunksize, dp.save_format, dp.seed, fname_resume, shard_index, shard_count, \
+                    dp.do_population, dp.do_profile)
 
     # end timing the simulation
     toc = time.time()
@@ -1111,7 +1664,8 @@ def run_everything(num_process, num_hhld, num_batch):
     if dp.do_save:
 
         # save the data
-        save(fname_data, fname_trials, fname_data_base, fname_trials_base, num_batch)
+        save(fname_data, fname_trials, fname_data_base, fname_trials_base, num_batch, \
+             save_format=dp.save_format)
 
 
     return fname_trials, fname_data
@@ -1126,8 +1680,21 @@ if __name__ == '__main__':
     # command line parameters
     #
 
-    # get monte-carlo parameters from command line
-    num_process, num_hhld, num_batch = get_cmd_line_params()
+    # get the options from the command line
+    options = get_cmd_line_options()
+
+    # merge the output of the shards of a simulation
+    if options['merge'] is not None:
+
+        fpath = options['output'] if (options['output'] is not None) else dp.fpath
+
+        merge_shards(options['merge'], fpath, dp.do_print)
+
+    else:
+
+        # get monte-carlo parameters from command line
+        num_process, num_hhld, num_batch = get_cmd_line_params()
 
-    # run the simulations
-    run_everything(num_process, num_hhld, num_batch)
+        # run the simulations
+        run_everything(num_process, num_hhld, num_batch, fname_resume=options['resume'], \
+                       shard_index=options['shard_index'], shard_count=options['shard_count'])
@@ -29,7 +29,7 @@ sys.path.append('..\\source')
 # agent-based model modules
 import my_globals as mg
 import demography as dmg
-import trial
+import diary_store, trial
 
 # ===========================================
 # default constants
@@ -53,11 +53,15 @@ FPATH       = mg.FDIR_MY_DATA
 # default file name to load pre-existing input data
 FNAME_LOAD_TRIALS_BASE = None
 
+# default file format to save the output
+SAVE_FORMAT = diary_store.FORMAT_PKL
+
 # ===========================================
 # user-defined parameters
 # ===========================================
 
-# seed for the random number generator (set to None or a fixed integer for reproducibility)
+# seed for the random number generator (set to None or a fixed integer for reproducibility). Each trial gets its \
+# own random number generator from this seed, so the results do not depend on the number of processes
 seed        = None
 
 # -------------------------------------------
@@ -98,6 +102,22 @@ do_save         = True
 # load previously made input
 do_load_trials  = False
 
+# should the simulation measure where the time goes in each household (see profiler). The combined measurements \
+# of each batch are printed, and the measurements of each household are saved with the .pkl output
+do_profile      = False
+
+# should the households of each batch be run at once with population.Population instead of each household with \
+# its own universe. This is only for households with 1 person and trial_code = trial.OMNI
+do_population   = False
+
+# -------------------------------------------
+# parallel parameters
+# -------------------------------------------
+
+# the number of trials sent to a worker process at a time when running in parallel. If None, the chunk size \
+# is chosen from the number of trials and the number of processes
+chunksize       = None
+
 # -------------------------------------------
 # demographic parameters
 # -------------------------------------------
@@ -118,6 +138,11 @@ fpath   = FPATH
 # the directory to load the input
 fname_load_trials_base = FNAME_LOAD_TRIALS_BASE
 
+# the file format of the output. A columnar format (diary_store.FORMAT_PARQUET, diary_store.FORMAT_FEATHER) saves \
+# the activity diaries of each batch in a dataset partitioned by demographic. diary_store.FORMAT_PKL saves the \
+# results as a .pkl file and a .csv file (the default). The columnar formats require the pyarrow package
+save_format = SAVE_FORMAT
+
 # ==============================================
 # initialize the random number generator
 # ==============================================
@@ -15,6 +15,11 @@
 """
 This module holds the results from running the Monte-Carlo simulations.
 
+The results of a simulation run in batches are saved as a pickle stream with one \
+:class:`driver_result.Driver_Result` per household (see :func:`my_globals.save_stream`). The stream is \
+converted to a .csv file one household at a time (:func:`driver_result.save_to_csv`), so that the memory \
+needed is bounded by the size of one household rather than the size of the simulation.
+
 This module contains class :class:`driver_result.Driver_Result` and :class:`driver_result.Batch_Result`.
 """
 
@@ -30,6 +35,10 @@ import numpy as np
 # dataframe capabilities
 import pandas as pd
 
+# ABMHAP modules
+import my_globals as mg
+import profiler
+
 # ===========================================
 # class Driver_Result
 # ===========================================
@@ -53,6 +62,8 @@ class Driver_Result(object):
     :var int demographic: the demography identifier
     :var int num_hhld: the number of households
     :var int num_people: the number of people in the simulation
+    :var profiler.Profiler profile: the combined measurements of the simulations, if the simulations \
+    were measured (see :func:`driver.run`)
     """
 
     def __init__(self, diaries, chad_param_list, demographic):
@@ -73,15 +84,19 @@ class Driver_Result(object):
         # the number of people in the simulation
         self.num_people = len( [item.df for x in self.diaries for item in x] )
 
+        # the measurements of the simulations
+        self.profile = None
+
         return
 
-    def add_id(self, df_list):
+    def add_id(self, df_list, id_offset=0):
 
         """
         This function adds an integer identifier to each simulated agent's activity diary.
 
         :param df_list: the activity diaries for the simulated agents
         :type df_list: list of pandas.core.frame.DataFrame
+        :param int id_offset: the identifier of the first agent
 
         :return: the updated activity diaries for each agent
         :rtype: list of pandas.core.frame.DataFrame
@@ -89,7 +104,7 @@ class Driver_Result(object):
 
         # add an identifier for each simulated agent's diary
         for i, df in enumerate(df_list):
-            df['id'] = i
+            df['id'] = id_offset + i
 
         return df_list
 
@@ -107,11 +122,14 @@ class Driver_Result(object):
 
         return result
 
-    def get_combined_diary(self):
+    def get_combined_diary(self, id_offset=0):
 
         """
         This function combines all of the activity diaries from the simulation into one.
 
+        :param int id_offset: the identifier of the first agent. This is used to give unique identifiers \
+        to the agents of different batches of a simulation
+
         :return: all of the activity diaries from the simulated agents combine into one* dataframe
         :rtype: pandas.core.frame.DataFrame
         """
@@ -120,7 +138,7 @@ class Driver_Result(object):
         df_list = self.get_all_data()
 
         # add unique identifiers for each diary
-        df_list = self.add_id(df_list)
+        df_list = self.add_id(df_list, id_offset)
 
         # get the name of the columns to include the id as the first column instead of the last
         colnames = df_list[0].columns.values.tolist()
@@ -143,7 +161,7 @@ class Batch_Result(Driver_Result):
     """
     This class holds the results from batch runs from the driver in one object.
 
-    :param dr_list: the results from the simulation from each batch that was used.
+    :param dr_list: the results of each household (or each batch) of the simulation
     :type dr_list: list of :class:`driver_result.Driver_Result`
     """
 
@@ -164,4 +182,59 @@ class Batch_Result(Driver_Result):
         # number of households
         self.num_hhld           = np.array( [dr.num_hhld for dr in dr_list] ).sum()
 
-        return
\ No newline at end of file
+        # the combined measurements of each household (results saved without measurements have none)
+        self.profile            = profiler.combine( [getattr(dr, 'profile', None) for dr in dr_list] )
+
+        return
+
+# ===========================================
+# functions
+# ===========================================
+
+def load(fname):
+
+    """
+    This function loads the results of a simulation. If the results were saved in batches \
+    (as a pickle stream), the results of the households are combined.
+
+    :param str fname: the file name of the results (.pkl)
+
+    :return: the results of the simulation
+    :rtype: driver_result.Driver_Result
+    """
+
+    x = mg.load(fname)
+
+    # the results of each household
+    if isinstance(x, list):
+        x = Batch_Result(x)
+
+    return x
+
+def save_to_csv(fnames, fname_csv):
+
+    """
+    This function saves the activity diaries of the results of a simulation as a .csv file. \
+    The results are loaded and written one household at a time, so only one household is in memory at a time. \
+    The agents are given unique identifiers in the order of the households.
+
+    :param fnames: the file names of the results (.pkl). Each file may be a pickle stream of the \
+    results of many households
+    :type fnames: list of str
+    :param str fname_csv: the file name of the .csv file
+
+    :return: None
+    """
+
+    # the identifier of the first agent in the household
+    id_offset = 0
+
+    for fname in fnames:
+        for dr in mg.load_stream(fname):
+
+            # the first household creates the file and the others are appended
+            mg.save_diary_to_csv( dr.get_combined_diary(id_offset), fname_csv, do_append=(id_offset > 0) )
+
+            id_offset = id_offset + dr.num_people
+
+    return
@@ -44,6 +44,9 @@ class Eat_Breakfast_Trial(trial.Trial):
     :param int demographic: the demographic identifier
     """
 
+    # each agent eats only breakfast, so the universe can not be reused (see universe_pool)
+    can_pool = False
+
     def __init__(self, parameters, sampling_params, demographic):
 
         # constructor
@@ -183,6 +186,9 @@ class Eat_Breakfast_Trial(trial.Trial):
         the_meal = meal.Meal(meal.BREAKFAST, start_mean=m.start_mean, start_std=m.start_std,\
                              dt_mean=m.dt_mean, dt_std=m.dt_std)
 
+        # the meal samples from the universe's random number generator
+        the_meal.set_rng(u.rng)
+
         # reset the meals list
         p.socio.meals = [the_meal]
 
@@ -45,6 +45,9 @@ class Eat_Dinner_Trial(trial.Trial):
     :param int demographic: the demographic identifier
     """
 
+    # each agent eats only dinner, so the universe can not be reused (see universe_pool)
+    can_pool = False
+
     def __init__(self, parameters, sampling_params, demographic):
 
         # constructor
@@ -179,6 +182,9 @@ class Eat_Dinner_Trial(trial.Trial):
         the_meal = meal.Meal( meal.DINNER, start_mean=m.start_mean, start_std=m.start_std, \
                               dt_mean=m.dt_mean, dt_std=m.dt_std )
 
+        # the meal samples from the universe's random number generator
+        the_meal.set_rng(u.rng)
+
         # reset the meals list
         p.socio.meals = [ the_meal]
 
@@ -41,8 +41,12 @@ import statsmodels as sm
 # for smoothing
 from scipy import integrate
 from scipy import interpolate
+from scipy import signal
 from scipy.stats import kde
 
+# cumulative trapezoidal integration (renamed from cumtrapz in newer versions of scipy)
+cumtrapz = getattr(integrate, 'cumulative_trapezoid', None) or integrate.cumtrapz
+
 # ABMHAP modules
 import my_globals as mg
 import demography as dmg
@@ -70,10 +74,74 @@ import analysis, activity, chad, diary, temporal, trial
 #                      activity.WORK: chad.FNAME_WORK,
 # }
 
+# the methods of estimating the cumulative distribution functions in the residual analysis (see residual())
+METHOD_KDE      = 'kde'
+METHOD_BINNED   = 'binned'
+METHOD_ECDF     = 'ecdf'
+
+# the half-width of the binned Gaussian kernel [number of kernel standard deviations]
+KERNEL_WIDTH    = 8
+
 # ===========================================
 # functions
 # ===========================================
 
+def binned_kde(data, x):
+
+    """
+    This function estimates the probability density function of the data with a Gaussian kernel density \
+    estimate on evenly spaced x values. The kernel has the same bandwidth as \
+    :class:`scipy.stats.gaussian_kde` (Scott's rule).
+
+    Instead of evaluating the kernel of every data point at every x value, the data are linearly binned on \
+    the grid of x values (each data point is split between the 2 nearest grid points) and the binned \
+    counts are convolved with the kernel by a fast Fourier transform. The kernel is truncated at \
+    :const:`KERNEL_WIDTH` standard deviations. The grid is extended, if needed, so that all of the data are \
+    binned.
+
+    :param numpy.ndarray data: the data
+    :param numpy.ndarray x: the x values. They must be evenly spaced and increasing
+
+    :return: the probability density at the x values
+    :rtype: numpy.ndarray
+    :raises ValueError: if the data do not vary
+    """
+
+    # the number of data points and the grid spacing
+    n   = len(data)
+    dx  = x[1] - x[0]
+
+    # the standard deviation of the kernel (Scott's rule)
+    sigma = np.std(data, ddof=1) * n ** (-1.0 / 5)
+
+    if not (sigma > 0):
+        raise ValueError('ERROR! The kernel density estimate needs data that vary')
+
+    # the position of the data in units of grid spacing
+    u = (data - x[0]) / dx
+
+    # extend the grid, if needed, to include all of the data
+    i_lo    = min( 0, int( np.floor( u.min() ) ) )
+    i_hi    = max( len(x) - 1, int( np.ceil( u.max() ) ) )
+    M       = i_hi - i_lo + 2
+    u       = u - i_lo
+
+    # linear binning
+    j       = np.floor(u).astype(int)
+    w       = u - j
+    counts  = np.bincount(j, weights=1 - w, minlength=M) + np.bincount(j + 1, weights=w, minlength=M)
+
+    # the Gaussian kernel on the grid
+    L       = min( M - 1, int( np.ceil(KERNEL_WIDTH * sigma / dx) ) )
+    z       = np.arange(-L, L + 1) * dx / sigma
+    k       = np.exp(-0.5 * z**2) / ( sigma * np.sqrt(2 * np.pi) )
+
+    # the density on the (extended) grid. Round-off in the convolution may give tiny negative values
+    d = signal.fftconvolve(counts, k)[L:L + M] / n
+    d = np.maximum(d, 0)
+
+    return d[-i_lo:-i_lo + len(x)]
+
 def compare_abm_to_chad(demo, df_list, trial_code, fidx=100, do_save=False, fpath=None):
 
     """
@@ -304,6 +372,42 @@ def compare_abm_to_chad_help(df_abm, df_obs, act_code, fidx, do_save, fpath):
 #
 #     return result
 
+def ecdf(data, x):
+
+    """
+    This function calculates the empirical cumulative distribution function (CDF) of the data at the \
+    x values.
+
+    :param numpy.ndarray data: the data
+    :param numpy.ndarray x: the x values
+
+    :return: the fraction of the data that are less than or equal to each x value
+    :rtype: numpy.ndarray
+    """
+
+    return np.searchsorted( np.sort(data), x, side='right' ) / len(data)
+
+def ecdf_inverse(data, p):
+
+    """
+    This function calculates the inverse of the empirical cumulative distribution function of the data. \
+    The inverse at probability p is the smallest data value whose empirical CDF is at least p.
+
+    :param numpy.ndarray data: the data
+    :param numpy.ndarray p: the probabilities [0, 1]
+
+    :return: the data values at the probabilities
+    :rtype: numpy.ndarray
+    """
+
+    # the sorted data
+    y = np.sort(data)
+
+    # the index of the smallest data value whose empirical CDF is at least p
+    i = np.ceil( np.asarray(p) * len(y) ).astype(int) - 1
+
+    return y[ np.clip(i, 0, len(y) - 1) ]
+
 def get_solo_data(z, fname):
 
     """
@@ -504,7 +608,7 @@ def plot_residual(x, res, xlabel='', ylabel='', title='', color='r', label='Resi
 
     return
 
-def residual(pred, obs, x):
+def residual(pred, obs, x, method=METHOD_KDE):
 
     """
     This function analyzes the residual between predicted values and observed values. Given the predicted and \
@@ -519,10 +623,18 @@ def residual(pred, obs, x):
 
     #. Invert the residual so that the CDFs and residuals are in units [minutes vs quantile]
 
+    The CDFs are estimated by one of the following methods:
+
+    * :const:`METHOD_KDE`: integrate a Gaussian kernel density estimate (:class:`scipy.stats.gaussian_kde`). \
+    The cost is proportional to the number of values times the number of x values
+    * :const:`METHOD_BINNED`: integrate the same kernel density estimate computed by linear binning and a \
+    fast Fourier transform (see :func:`binned_kde`). The x values must be evenly spaced
+    * :const:`METHOD_ECDF`: the exact empirical CDFs (see :func:`ecdf` and :func:`ecdf_inverse`)
+
     :param numpy.ndarray pred: the predicted (ABMHAP) values used to make the empirical CDF
     :param numpy.ndarray obs: the observed (CHAD) values used to make the empirical CDF
     :param numpy.ndarray x: the x-values
-    :param bool do_scaling: this scales the inverted cdf residual by the standard deviation of the observed values
+    :param str method: the method of estimating the CDFs
 
     :return: the data for the cumulative distribution data (predicted, observed, residual, and scaled residual), \
     the data for the inverted cumulative distribution data (predicted, observed, residual, and scaled residual)
@@ -533,17 +645,41 @@ def residual(pred, obs, x):
     # CDF
     #
 
-    # smooth probability density functions
-    f_obs   = kde.gaussian_kde(obs)
-    f_pred  = kde.gaussian_kde(pred)
+    if method == METHOD_ECDF:
+
+        # the empirical cumulative distribution functions
+        cdf_obs     = ecdf(obs, x)
+        cdf_pred    = ecdf(pred, x)
+
+        # functions that represent the inverted cdf
+        f_inv_obs   = lambda p: ecdf_inverse(obs, p)
+        f_inv_pred  = lambda p: ecdf_inverse(pred, p)
+
+    else:
+
+        if method == METHOD_BINNED:
 
-    # the density vectors
-    d_obs   = f_obs(x)
-    d_pred  = f_pred(x)
+            # the density vectors from the binned kernel density estimates
+            d_obs   = binned_kde(obs, x)
+            d_pred  = binned_kde(pred, x)
 
-    # the cumalative distribution functions
-    cdf_obs     = integrate.cumtrapz(y=d_obs, x=x, initial=0)
-    cdf_pred    = integrate.cumtrapz(y=d_pred, x=x, initial=0)
+        else:
+
+            # smooth probability density functions
+            f_obs   = kde.gaussian_kde(obs)
+            f_pred  = kde.gaussian_kde(pred)
+
+            # the density vectors
+            d_obs   = f_obs(x)
+            d_pred  = f_pred(x)
+
+        # the cumalative distribution functions
+        cdf_obs     = cumtrapz(y=d_obs, x=x, initial=0)
+        cdf_pred    = cumtrapz(y=d_pred, x=x, initial=0)
+
+        # create functions that represent the inverted cdf
+        f_inv_obs   = interpolate.interp1d(x=cdf_obs, y=x)
+        f_inv_pred  = interpolate.interp1d(x=cdf_pred, y=x)
 
     # the residual in the CDFs
     res         = cdf_obs - cdf_pred
@@ -553,10 +689,6 @@ def residual(pred, obs, x):
     # the inverted CDF
     #
 
-    # create functions that represent the inverted cdf
-    f_inv_obs   = interpolate.interp1d(x=cdf_obs, y=x)
-    f_inv_pred  = interpolate.interp1d(x=cdf_pred, y=x)
-
     # the probability
     p_max   = min( cdf_obs.max(), cdf_pred.max() )
     p       = np.linspace( 0, p_max, num=len(x) )
@@ -584,7 +716,7 @@ def residual(pred, obs, x):
 
     return cdf, inv_cdf
 
-def residual_analysis(pred, obs, N=int(1e3+1), do_periodic=False):
+def residual_analysis(pred, obs, N=int(1e3+1), do_periodic=False, method=METHOD_KDE):
 
     """
     This function takes the predicted and observed values and computes the respective cumulative distribution \
@@ -594,6 +726,7 @@ def residual_analysis(pred, obs, N=int(1e3+1), do_periodic=False):
     :param numpy.ndarray obs: the observed values
     :param int N: the number of points of the CDF vector
     :param bool do_periodic: a flag to see if the time data should be in a [-12, 12) hour format
+    :param str method: the method of estimating the CDFs (see :func:`residual`)
 
     :return: the x values, CDF of residual, inverted CDF of residual
     :rtype: numpy.ndarray, pandas.core.frame.DataFrame, pandas.core.frame.DataFrame
@@ -621,7 +754,7 @@ def residual_analysis(pred, obs, N=int(1e3+1), do_periodic=False):
     x = np.linspace(x_min, x_max, num=N)
 
     # compute the residual
-    cdf, inv_cdf = residual(pred=pred, obs=obs, x=x)
+    cdf, inv_cdf = residual(pred=pred, obs=obs, x=x, method=method)
 
     return x, cdf, inv_cdf
 
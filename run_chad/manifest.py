@@ -0,0 +1,301 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module keeps a record (a manifest) of a simulation that is run in batches (see \
+:func:`driver.run_batch`) so that an interrupted simulation can be resumed.
+
+The manifest is a JSON file saved next to the output of the simulation. It records the following:
+
+#. the parameters of the simulation, including the root seed of the random number generators
+#. the file names of the input (trials) and output (data) of the simulation
+#. for each batch, the status (pending, running, or done), the households in the batch, the file \
+names of the input and output of the batch, and their checksums
+
+When the simulation is resumed, the batches that are done (and whose files still have the recorded \
+checksums) are skipped. The other batches are run again with the same seeds, so the results are the \
+same as if the simulation had not been interrupted.
+
+After the batches are merged into one file (see :func:`driver.save`), the batch files are deleted and \
+the manifest is only a record of the simulation.
+
+The manifest is saved after every change of the status of a batch. It is written to a temporary file \
+first and then renamed, so an interruption never leaves a partially written manifest.
+
+This module contains class :class:`manifest.Manifest`.
+"""
+
+# ===========================================
+# import
+# ===========================================
+
+import hashlib, json, os, time
+
+# mathematical capabilities
+import numpy as np
+
+# ===========================================
+# constants
+# ===========================================
+
+# the status of a batch
+PENDING = 'pending'
+RUNNING = 'running'
+DONE    = 'done'
+
+# the ending of the file name of the manifest
+F_MANIFEST = '_manifest.json'
+
+# the number of bytes read at a time when calculating a checksum
+CHUNK_SIZE = 1 << 20
+
+# ===========================================
+# class Manifest
+# ===========================================
+
+class Manifest(object):
+
+    """
+    This class records the parameters of a simulation run in batches and the status of each batch.
+
+    :param str fname: the file name of the manifest
+    :param dict config: the parameters of the simulation. The entries must be saveable as JSON
+    :param dict fnames: the file names of the input and output of the simulation
+    :param batches: the number of households in each batch and the index of the first household \
+    in each batch
+    :type batches: list of tuple of int, int
+
+    :var str fname: the file name of the manifest
+    :var dict config: the parameters of the simulation
+    :var dict fnames: the file names of the input and output of the simulation
+    :var list batches: the record of each batch
+    """
+
+    def __init__(self, fname, config, fnames, batches):
+
+        # the file name of the manifest
+        self.fname      = fname
+
+        # the parameters of the simulation
+        self.config     = config
+
+        # the file names of the simulation
+        self.fnames     = fnames
+
+        # the record of each batch
+        self.batches    = [ {'index': i, 'status': PENDING, 'batch_size': int(n), 'hhld_offset': int(offset), \
+                             'fname_trials': None, 'fname_data': None, 'checksum_trials': None, \
+                             'checksum_data': None, 'time_end': None} \
+                            for i, (n, offset) in enumerate(batches) ]
+
+        return
+
+    def check_config(self, config):
+
+        """
+        This function checks that the given parameters of the simulation are the same as the parameters \
+        recorded in the manifest. Resuming a simulation with different parameters would mix results \
+        from different simulations.
+
+        :param dict config: the parameters of the simulation
+
+        :return: None
+        :raises ValueError: if the parameters are different
+        """
+
+        # the parameters that are different
+        diff = [ k for k in sorted(config.keys()) if self.config.get(k) != config[k] ]
+
+        if len(diff) > 0:
+            msg = 'ERROR! The parameters of the simulation do not match the manifest %s:\n' % self.fname
+            for k in diff:
+                msg = msg + '\t%s: %s (manifest) != %s\n' % (k, self.config.get(k), config[k])
+            raise ValueError(msg)
+
+        return
+
+    def get_seed(self):
+
+        """
+        This function returns the root seed of the random number generators of the simulation.
+
+        :return: the root seed
+        :rtype: numpy.random.SeedSequence
+        """
+
+        x = self.config['seed']
+
+        return np.random.SeedSequence(x['entropy'], spawn_key=tuple(x['spawn_key']))
+
+    def is_done(self, i):
+
+        """
+        This function checks whether or not a batch is done. A batch is done if its status is done and \
+        the files of the batch exist and have the recorded checksums.
+
+        :param int i: the batch index
+
+        :return: a flag indicating whether the batch is done (if True) or not (if False)
+        :rtype: bool
+        """
+
+        x = self.batches[i]
+
+        if x['status'] != DONE:
+            return False
+
+        for key in ['trials', 'data']:
+
+            fname, checksum = x['fname_' + key], x['checksum_' + key]
+
+            if (fname is not None) and ( (not os.path.isfile(fname)) or (get_checksum(fname) != checksum) ):
+                return False
+
+        return True
+
+    def save(self):
+
+        """
+        This function saves the manifest as a JSON file. The manifest is written to a temporary file \
+        that replaces the old manifest.
+
+        :return: None
+        """
+
+        x = {'config': self.config, 'fnames': self.fnames, 'batches': self.batches}
+
+        # create the directory for the manifest if it does not exist
+        fpath = os.path.dirname(self.fname)
+        if fpath:
+            os.makedirs(fpath, exist_ok=True)
+
+        # the temporary file
+        fname_tmp = self.fname + '.tmp'
+
+        with open(fname_tmp, 'w') as f:
+            json.dump(x, f, indent=2)
+
+        os.replace(fname_tmp, self.fname)
+
+        return
+
+    def set_done(self, i, fname_trials=None, fname_data=None):
+
+        """
+        This function records that a batch is done and saves the manifest.
+
+        :param int i: the batch index
+        :param str fname_trials: the file name of the input (trials) of the batch
+        :param str fname_data: the file name of the output (data) of the batch
+
+        :return: None
+        """
+
+        f = lambda fname: get_checksum(fname) if fname is not None else None
+
+        x = self.batches[i]
+
+        x['fname_trials'], x['checksum_trials'] = fname_trials, f(fname_trials)
+        x['fname_data'], x['checksum_data']     = fname_data, f(fname_data)
+        x['time_end']                           = time.strftime('%Y-%m-%dT%H:%M:%S')
+        x['status']                             = DONE
+
+        self.save()
+
+        return
+
+    def set_running(self, i):
+
+        """
+        This function records that a batch is running and saves the manifest.
+
+        :param int i: the batch index
+
+        :return: None
+        """
+
+        self.batches[i]['status'] = RUNNING
+
+        self.save()
+
+        return
+
+# ===========================================
+# functions
+# ===========================================
+
+def get_checksum(fname):
+
+    """
+    This function calculates the checksum (SHA-256) of a file.
+
+    :param str fname: the file name
+
+    :return: the checksum
+    :rtype: str
+    """
+
+    h = hashlib.sha256()
+
+    with open(fname, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            h.update(chunk)
+
+    return h.hexdigest()
+
+def get_fname(fname_data_base):
+
+    """
+    This function returns the file name of the manifest of a simulation.
+
+    :param str fname_data_base: the base (no ".pkl" extension) of the file name of the output data
+
+    :return: the file name of the manifest
+    :rtype: str
+    """
+
+    return fname_data_base + F_MANIFEST
+
+def get_seed_config(seed):
+
+    """
+    This function returns the root seed in a form that may be saved as JSON.
+
+    :param numpy.random.SeedSequence seed: the root seed
+
+    :return: the entropy and the spawn key of the root seed
+    :rtype: dict
+    """
+
+    # the entropy may be an int or a sequence of ints
+    entropy = int(seed.entropy) if np.isscalar(seed.entropy) else [int(e) for e in seed.entropy]
+
+    x = {'entropy': entropy, 'spawn_key': [int(k) for k in seed.spawn_key]}
+
+    return x
+
+def load(fname):
+
+    """
+    This function loads a manifest from a JSON file.
+
+    :param str fname: the file name of the manifest
+
+    :return: the manifest
+    :rtype: manifest.Manifest
+    """
+
+    with open(fname, 'r') as f:
+        x = json.load(f)
+
+    m = Manifest(fname, x['config'], x['fnames'], [])
+
+    m.batches = x['batches']
+
+    return m
@@ -0,0 +1,268 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module splits a simulation into shards that run independently (e.g., on different machines) and \
+merges the output of the shards into one result set.
+
+The households of the simulation are numbered 0, 1, ..., num_hhld - 1. Shard k (of n shards) simulates \
+the contiguous block of households
+
+.. math::
+    \\left\\lfloor \\frac{k \\cdot num\\_hhld}{n} \\right\\rfloor, \\ldots, \
+    \\left\\lfloor \\frac{(k + 1) \\cdot num\\_hhld}{n} \\right\\rfloor - 1
+
+The trial of each household gets its random number generator from the root seed and the index of the \
+household (see :func:`my_globals.get_seed_sequences`). Therefore, each shard uses its own substreams of \
+random numbers, and the merged output is the same as the output of the simulation run on one machine. \
+This requires every shard to use the same (given) seed.
+
+Each shard saves its output in its own directory along with a manifest (see :mod:`manifest`). The \
+merge step (:func:`shard.merge`) reads the manifests of all of the shards, checks that the shards are \
+from the same simulation and that every shard is done, and combines the output in the order of the \
+households.
+"""
+
+# ===========================================
+# import
+# ===========================================
+
+import sys
+sys.path.append('..\\source')
+
+import glob, os, re, shutil
+
+# ABMHAP modules
+import my_globals as mg
+import diary_store, driver_result, manifest
+
+# ===========================================
+# constants
+# ===========================================
+
+# the name of the directory of a shard
+F_SHARD = 'shard_%04d_of_%04d'
+
+# the parameters that may differ between the shards of a simulation
+SHARD_KEYS = ['num_hhld', 'max_batch_size', 'hhld_offset', 'shard_index']
+
+# ===========================================
+# functions
+# ===========================================
+
+def check_shards(manifests):
+
+    """
+    This function checks that the shards are from the same simulation, that every shard is present, and \
+    that every batch of every shard is done.
+
+    :param manifests: the manifests of the shards
+    :type manifests: list of :class:`manifest.Manifest`
+
+    :return: None
+    :raises ValueError: if the shards can not be merged
+    """
+
+    if len(manifests) == 0:
+        raise ValueError('ERROR! There are no shards to merge!')
+
+    # the parameters that must be the same for every shard
+    f = lambda m: { k: v for k, v in m.config.items() if k not in SHARD_KEYS }
+
+    config = f(manifests[0])
+
+    for m in manifests:
+        if 'shard_count' not in m.config:
+            raise ValueError('ERROR! The simulation is not a shard: %s' % m.fname)
+        if f(m) != config:
+            raise ValueError('ERROR! The shards are from different simulations: %s, %s' \
+                             % (manifests[0].fname, m.fname) )
+
+    # every shard must be present exactly once
+    idx     = sorted( [m.config['shard_index'] for m in manifests] )
+    count   = config['shard_count']
+
+    if idx != list( range(count) ):
+        raise ValueError('ERROR! Expected shards 0, ..., %d, found shards %s' % (count - 1, idx) )
+
+    # every batch must be done
+    for m in manifests:
+        if any( [x['status'] != manifest.DONE for x in m.batches] ):
+            raise ValueError('ERROR! The shard is not done: %s' % m.fname)
+
+    return
+
+def get_file(fname_manifest, fname):
+
+    """
+    This function finds a file of a shard. Since the output of the shards may have been copied from \
+    other machines, the file is first searched for in the directory of the manifest. If it is not \
+    there, the file name recorded in the manifest is used.
+
+    :param str fname_manifest: the file name of the manifest of the shard
+    :param str fname: the file name recorded in the manifest
+
+    :return: the file name
+    :rtype: str
+    """
+
+    # the file name without the directory (the recorded name may use either separator)
+    name = re.split(r'[\\/]', fname)[-1]
+
+    x = os.path.join(os.path.dirname(fname_manifest), name)
+
+    return x if os.path.exists(x) else fname
+
+def get_path(fpath, shard_index, shard_count):
+
+    """
+    This function returns the directory in which a shard saves its output.
+
+    :param str fpath: the directory of the output of the simulation
+    :param int shard_index: the index of the shard
+    :param int shard_count: the number of shards
+
+    :return: the directory of the shard
+    :rtype: str
+    """
+
+    return fpath + '\\' + F_SHARD % (shard_index, shard_count)
+
+def get_range(num_hhld, shard_index, shard_count):
+
+    """
+    This function returns the households simulated by a shard.
+
+    :param int num_hhld: the total number of households in the simulation
+    :param int shard_index: the index of the shard
+    :param int shard_count: the number of shards
+
+    :return: the index of the first household in the shard, the number of households in the shard
+    :rtype: int, int
+    :raises ValueError: if the shard index is not valid
+    """
+
+    if not (0 <= shard_index < shard_count):
+        raise ValueError('ERROR! The shard index %d must be in [0, %d)' % (shard_index, shard_count) )
+
+    if num_hhld < shard_count:
+        raise ValueError('ERROR! There are fewer households (%d) than shards (%d)' % (num_hhld, shard_count) )
+
+    start   = (shard_index * num_hhld) // shard_count
+    end     = ( (shard_index + 1) * num_hhld ) // shard_count
+
+    return start, end - start
+
+def merge(fnames_manifest, fname_trials, fname_data, do_print=False):
+
+    """
+    This function merges the output of the shards of a simulation into one result set. The trials \
+    (input) are saved in one file. The output is saved in the format used by the shards:
+
+    * if the output is columnar (see :mod:`diary_store`), the files of each batch of each shard are \
+    copied into one dataset in the directory given by the file name of the output (no ".pkl")
+    * otherwise, the results of the batches of the shards are saved in one .pkl file (a pickle stream, \
+    see :func:`my_globals.save_stream`) and one .csv file
+
+    The batches are merged one at a time, so only one batch is in memory at a time.
+
+    :param fnames_manifest: the file names of the manifests of the shards
+    :type fnames_manifest: list of str
+    :param str fname_trials: the file name of the merged trials data (.pkl)
+    :param str fname_data: the file name of the merged output data (.pkl)
+    :param bool do_print: a flag indicating whether to print (if True) or not (if False)
+
+    :return: None
+    """
+
+    # load the manifests and sort the shards in the order of the households
+    manifests = [ manifest.load(f) for f in fnames_manifest ]
+
+    check_shards(manifests)
+
+    manifests = sorted(manifests, key=lambda m: m.config['shard_index'])
+
+    if do_print:
+        print('merging %d shards...' % len(manifests))
+
+    #
+    # merge the trials (input)
+    #
+    mg.save_stream(fname_trials, mg.STREAM_LIST)
+
+    for m in manifests:
+        for x in mg.load_stream( get_file(m.fname, m.fnames['fname_trials']) ):
+            mg.append(x, fname_trials)
+
+    if do_print:
+        print('saved the trials:\t%s' % fname_trials)
+
+    #
+    # merge the output
+    #
+    config = manifests[0].config
+
+    if diary_store.is_columnar(config['save_format']):
+
+        merge_columnar(manifests, fname_data[:-4], config['demographic'], config['save_format'])
+
+    else:
+
+        # the results of each shard
+        fnames = [ get_file(m.fname, m.fnames['fname_data']) for m in manifests ]
+
+        mg.save_stream(fname_data, mg.STREAM_OBJECTS)
+
+        for f in fnames:
+            for x in mg.load_stream(f):
+                mg.append(x, fname_data)
+
+        # save the data as a .csv
+        driver_result.save_to_csv(fnames, fname_data[:-4] + '.csv')
+
+    if do_print:
+        print('saved the data:\t%s' % fname_data)
+
+    return
+
+def merge_columnar(manifests, fpath, demographic, fmt):
+
+    """
+    This function merges the columnar output of the shards into one dataset. The file of each batch of \
+    each shard is copied into the dataset and is numbered in the order of the households. The household \
+    identifiers in the files are already the identifiers in the whole simulation.
+
+    :param manifests: the manifests of the shards (in the order of the households)
+    :type manifests: list of :class:`manifest.Manifest`
+    :param str fpath: the directory of the merged dataset
+    :param int demographic: the demography identifier
+    :param str fmt: the columnar file format
+
+    :return: None
+    """
+
+    # the index of the batch in the merged dataset
+    k = 0
+
+    for m in manifests:
+
+        # the directory of the partition of the shard's dataset
+        fpath_shard = get_file(m.fname, m.fnames['fname_data_base'])
+        fpath_part  = os.path.dirname( diary_store.get_fname_batch(fpath_shard, demographic, 0, fmt) )
+
+        for fname in sorted( glob.glob( os.path.join(fpath_part, '*' + diary_store.FORMAT_2_EXTENSION[fmt]) ) ):
+
+            fname_out = diary_store.get_fname_batch(fpath, demographic, k, fmt)
+
+            os.makedirs(os.path.dirname(fname_out), exist_ok=True)
+            shutil.copyfile(fname, fname_out)
+
+            k = k + 1
+
+    return
@@ -44,6 +44,9 @@ class Sleep_Trial(trial.Trial):
     :param int demographic: the demographic identifier
     """
 
+    # the home holds only a bed, so the universe can not be reused (see universe_pool)
+    can_pool = False
+
     def __init__(self, parameters, sampling_params, demographic):
 
         # constructor
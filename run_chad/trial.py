@@ -31,15 +31,9 @@ sys.path.append('..\\processing')
 # mathematical capability
 import numpy as np
 
-# dataframe capability
-import pandas as pd
-
-# zipfile capability
-import zipfile
-
 # ABMHAP modules
 import my_globals as mg
-import activity, chad, diary, location, singleton, state, universe
+import activity, chad, chad_cache, diary, location, profiler, singleton, state, universe, universe_pool
 
 # ===========================================
 # constants
@@ -121,8 +115,23 @@ class Trial(object):
     :var int num_samples: the number of ABMHAP samples (or trials) to be run
     :var int demographic: the demographic identifier used to parametrize the agent
     :var str fname: the name of the zipfile for the CHAD data
+    :var numpy.random.SeedSequence seed: the seed of the random number generators for the trial. If None, \
+    the *numpy.random* random number generator is used
+    :var numpy.random.Generator rng: the random number generator used to sample the parameters from CHAD
+    :var numpy.random.SeedSequence seed_run: the seed of the random number generator used in the simulation. \
+    A new generator is made from this seed in each call to :func:`run` so that running the trial again \
+    gives the same results
+    :var bool do_profile: a flag indicating whether to measure the simulation (if True) or not (if False)
+    :var profiler.Profiler profile: the measurements of the last simulation, if the simulation was measured
+    :var bool do_pool: a flag indicating whether to reuse a universe from the pool of the process (if True) \
+    or to create a new universe (if False) (see :mod:`universe_pool`)
+    :var bool can_pool: a flag indicating whether the trial may reuse a universe from the pool. Trials \
+    that change the assets of the home or the meals of the agents can not
     """
 
+    # the universe of the trial may be reused by the next trial
+    can_pool = True
+
     def __init__(self, parameters, sampling_params, demographic):
 
 
@@ -144,6 +153,18 @@ class Trial(object):
         # the demographic identifier
         self.demographic = demographic
 
+        # the random number generators (see set_seed())
+        self.seed       = None
+        self.rng        = None
+        self.seed_run   = None
+
+        # the (optional) measurements of the simulation
+        self.do_profile = False
+        self.profile    = None
+
+        # reuse the universe of the previous trial
+        self.do_pool    = False
+
         return
 
     def add_person_to_universe(self, u, idx):
@@ -189,12 +210,12 @@ class Trial(object):
 
         return
 
-    def assign_chad_params(self, z, f_stats, s_params):
+    def assign_chad_params(self, fname_zip, f_stats, s_params):
 
         """
         Assign the CHAD statistical parameters for a given activity to the agent.
 
-        :param zipfile.ZipFile z: the file name (.zip) for the demographic data
+        :param str fname_zip: the file name (.zip) for the demographic data
         :param f_stats: the file names of the statistical data relevant to the start time, \
         end time, duration, and CHAD records for a given activity
         :type f_stats: a dictionary of int - str
@@ -209,7 +230,7 @@ class Trial(object):
         numpy.ndarray, numpy.ndarray, numpy.ndarray
         """
 
-        x = self.get_stats_data(z, f_stats, s_params)
+        x = self.get_stats_data(fname_zip, f_stats, s_params)
 
         return x
 
@@ -254,28 +275,44 @@ class Trial(object):
     def create_universe(self):
 
         """
-        This function creates a universe object that simulations will run in.
+        This function creates a universe object that simulations will run in. If the trial uses the \
+        pool (see :attr:`do_pool`), the universe of a previous trial is reused.
 
         :return u: the universe for the simulation to run in
         :rtype: universe.Universe
         """
 
         # set up universe
-        u = universe.Universe(self.params.num_steps, self.params.dt, self.params.t_start, self.params.num_people)
+        if self.is_pooled():
+            u = universe_pool.get(self.params.num_steps, self.params.dt, self.params.t_start, \
+                                  self.params.num_people)
+        else:
+            u = universe.Universe(self.params.num_steps, self.params.dt, self.params.t_start, \
+                                  self.params.num_people)
 
         # set the clock to the desired start time
         u.clock.t_univ = self.params.t_start
         u.clock.set_time()
 
+        # the random number generator for the simulation
+        u.rng = None
+        if self.seed_run is not None:
+            u.rng = np.random.default_rng(self.seed_run)
+
+        # measure the simulation
+        u.profiler = None
+        if self.do_profile:
+            u.profiler = profiler.Profiler(self.params.num_people)
+
         return u
 
-    def get_chad_stats_data_dt(self, z, fname, s_params):
+    def get_chad_stats_data_dt(self, fname_zip, fname, s_params):
 
         """
         This function obtains the CHAD data for activity duration data that are \
         suitable for ABMHAP simulation.
 
-        :param zifpile.Zipfile z: the zipfile of the activity data
+        :param str fname_zip: the file name (.zip) of the activity data
         :param str fname: the file name for the data file for activity duration
         :param chad_params.CHAD_params s_params: the parameters that limit the sampling of \
         respective statistical data for a given activity
@@ -285,20 +322,20 @@ class Trial(object):
         """
 
         # get the data from CHAD to limit duration
-        data    = pd.read_csv ( z.open(fname) )
+        data    = chad_cache.read_csv(fname_zip, fname)
 
         # get the duration data
         dt      = s_params.get_dt(data).sort_values( ['PID'])
 
         return dt
 
-    def get_chad_stats_data_end(self, z, fname, s_params):
+    def get_chad_stats_data_end(self, fname_zip, fname, s_params):
 
         """
         This function obtains the CHAD data for activity end time data that are \
         suitable for ABMHAP simulation.
 
-        :param zifpile.Zipfile z: the zipfile of the activity data
+        :param str fname_zip: the file name (.zip) of the activity data
         :param str fname: the file name for the data file for activity duration
         :param chad_params.CHAD_params s_params: the parameters that limit the sampling of \
         respective statistical data for a given activity
@@ -308,7 +345,7 @@ class Trial(object):
         """
 
         # get the data from CHAD to limit end time
-        data    = pd.read_csv ( z.open(fname) )
+        data    = chad_cache.read_csv(fname_zip, fname)
 
         # get end time
         end     = s_params.get_end(data).sort_values( ['PID'] )
@@ -349,13 +386,13 @@ class Trial(object):
     #
     #     return x
 
-    def get_chad_stats_data_start(self, z, fname, s_params):
+    def get_chad_stats_data_start(self, fname_zip, fname, s_params):
 
         """
         This function obtains the CHAD data for activity start time data that are \
         suitable for ABMHAP simulation.
 
-        :param zifpile.Zipfile z: the zipfile of the activity data
+        :param str fname_zip: the file name (.zip) of the activity data
         :param str fname: the file name for the data file for activity duration
         :param chad_params.CHAD_params s_params: the parameters that limit the sampling of \
         respective statistical data for a given activity
@@ -365,7 +402,7 @@ class Trial(object):
         """
 
         # get the data from CHAD to limit start time
-        data    = pd.read_csv ( z.open(fname) )
+        data    = chad_cache.read_csv(fname_zip, fname)
 
         # get the start time
         start   = s_params.get_start(data).sort_values( ['PID'] )
@@ -391,53 +428,11 @@ class Trial(object):
         # the household diaries for each agent in the simulation
         for p in u.people:
 
-            # get the information about the diary
-            t, act, loc = self.get_diary_help(u.clock.hist_time, p.hist_activity, p.hist_local)
-
-            # add the diary to the list
-            diary_hhld.append( diary.Diary(t, act, loc) )
+            # create the diary directly from the event data and add the diary to the list
+            diary_hhld.append( diary.Diary(u.clock.hist_time, p.hist_activity, p.hist_local, is_sparse=True) )
 
         return diary_hhld
 
-    def get_diary_help(self, t, hist_act, hist_loc):
-
-        """
-        This function takes data on the activity start times, activity codes, and location codes \
-        from an activity diary and fills out the activity, minute-by-minute in between two adjacent \
-        activities.
-
-        :param numpy.ndarray t: the start time from an activity diary
-        :param numpy.ndarray hist_act: the activity codes from an activity diary
-        :param numpy.ndarray hist_loc: the location codes from an activity diary
-
-        :return: the minute by minute information from an ABMHAP simulation for the \
-        following: time information, activity codes, and location codes
-        :rtype: numpy.ndarray, numpy.ndarray, numpy.ndarray
-        """
-
-        # get indices that indicate the simulation data
-        idx = t != -1
-
-        # start times of the simulation only
-        t_data      = t[idx]
-
-        # activity codes of the simulation only
-        act_data    = hist_act[idx]
-
-        # location codes of the simulation only
-        loc_data    = hist_loc[idx]
-
-        # the minute by minute time information for the simulation
-        t_all       = mg.fill_out_time(t_data)
-
-        # the minute by minute activity code information for the simulation
-        act_all     = mg.fill_out_data(t_data, act_data)
-
-        # the minute by minute location code information for the simulation
-        loc_all     = mg.fill_out_data(t_data, loc_data)
-
-        return t_all, act_all, loc_all
-
     # def get_moments(self, fname_dt, fname_start):
     #
     #     # get the moments of CHAD data for activity duration and activity start time, respectively
@@ -448,12 +443,12 @@ class Trial(object):
     #
     #     return chad_df_dt, chad_df_start, abm_dt_mean, abm_dt_std, abm_start_mean, abm_start_std
 
-    def get_stats_data(self, z, f_stats, s_params):
+    def get_stats_data(self, fname_zip, f_stats, s_params):
 
         """
         Assign the CHAD statistical parameters for a given activity to the agent.
 
-        :param zipfile.ZipFile z: the file name (.zip) for the demographic data
+        :param str fname_zip: the file name (.zip) for the demographic data
         :param f_stats: the file names of the statistical data relevant to the start time, \
         end time, duration, and CHAD records for a given activity
         :type f_stats: a dictionary of int - str
@@ -492,7 +487,7 @@ class Trial(object):
         if s_params.do_dt:
 
             # sample duration data from CHAD
-            df_dt           = self.get_chad_stats_data_dt(z, fname_dt, s_params)
+            df_dt           = self.get_chad_stats_data_dt(fname_zip, fname_dt, s_params)
 
             # sample mean and standard deviation duration data based on the empirical
             # data distributions for the agent
@@ -504,10 +499,10 @@ class Trial(object):
         if s_params.do_start and s_params.do_end:
 
             # sample start time data from CHAD
-            df_start    = self.get_chad_stats_data_start(z, fname_start, s_params)
+            df_start    = self.get_chad_stats_data_start(fname_zip, fname_start, s_params)
 
             # sample end time data from CHAD
-            df_end      = self.get_chad_stats_data_end(z, fname_end, s_params)
+            df_end      = self.get_chad_stats_data_end(fname_zip, fname_end, s_params)
 
             # sample mean and standard deviation start time and end time data based
             # on the empirical data distributions for the agent
@@ -521,7 +516,7 @@ class Trial(object):
             if s_params.do_start:
 
                 # sample start time data from CHAD
-                df_start                = self.get_chad_stats_data_start(z, fname_start, s_params)
+                df_start                = self.get_chad_stats_data_start(fname_zip, fname_start, s_params)
 
                 # sample mean and standard deviation start time data based on the empirical data
                 # distributions for the agent
@@ -533,7 +528,7 @@ class Trial(object):
             if s_params.do_end:
 
                 # sample end time data from CHAD
-                df_end              = self.get_chad_stats_data_end(z, fname_end, s_params)
+                df_end              = self.get_chad_stats_data_end(fname_zip, fname_end, s_params)
 
                 # sample mean and standard deviation end time data based on the empirical data
                 # distributions for the agent
@@ -569,7 +564,7 @@ class Trial(object):
         y = np.array(x_mean)
 
         # randomly assign N values for the mean of duration
-        x_mean = np.random.choice(x_mean, num_people)
+        x_mean = mg.get_rng(self.rng).choice(x_mean, num_people)
 
         # assign a coefficient of duration and then use it in assigning a standard deviation for
         # the duration
@@ -586,7 +581,7 @@ class Trial(object):
             x_cv    = x_cv[(x_cv >= CV_MIN) & (x_cv <= CV_MAX)]
 
             # randomly assign N values for the coefficient of variation for duration
-            x_cv    = np.random.choice(x_cv, num_people)
+            x_cv    = mg.get_rng(self.rng).choice(x_cv, num_people)
 
             # assign the N values of standard deviation for duration
             x_std   = x_cv * x_mean
@@ -617,14 +612,14 @@ class Trial(object):
         x_mean, x_std, x_cv = self.sample(df)
 
         # choose the means for each person
-        x_mean = np.random.choice(x_mean, num_people)
+        x_mean = mg.get_rng(self.rng).choice(x_mean, num_people)
 
         if n_data == 1:
             # this will be over written for start time and end time
             x_std       = np.mean(x_mean) * np.ones( (num_people,) )
         else:
             # use the longitudinal data
-            x_std       = np.random.choice(x_std, num_people)
+            x_std       = mg.get_rng(self.rng).choice(x_std, num_people)
 
         return x_mean, x_std
 
@@ -715,8 +710,8 @@ class Trial(object):
         :rtype: a dictionary of int to numpy.ndarray, numpy.ndarray, numpy.ndarray, numpy.
         """
 
-        # the demographic data
-        z   = zipfile.ZipFile(demo.fname_zip, mode='r')
+        # parse the demographic data (this does nothing if the data is already in the cache)
+        chad_cache.load_demography(demo)
 
         # dictionary of the file names for the statistical data
         fname_stats = demo.fname_stats
@@ -741,14 +736,11 @@ class Trial(object):
             s_params = sampling_params[k]
 
             # recall: the times are in hours
-            x = self.assign_chad_params(z, f_stats, s_params)
+            x = self.assign_chad_params(demo.fname_zip, f_stats, s_params)
 
             # store the moments data for each activity in the dictionary
             y[k] = x
 
-        # close the zipfile
-        z.close()
-
         return y
 
     def initialize_person(self, u, idx):
@@ -759,7 +751,7 @@ class Trial(object):
 
         More specifically, the function does
 
-        #. creates the agent
+        #. creates the agent (or reuses an agent of a previous trial, see :mod:`universe_pool`)
         #. initializes the agent's parameters to the respective values in :attr:`params`
 
         :param universe.Universe u: the universe the agent will reside in
@@ -769,8 +761,15 @@ class Trial(object):
         :rtype: singleton.Singleton
         """
 
+        # reuse an agent (that has been reset) from the universe of a previous trial
+        p = universe_pool.get_person(u) if self.is_pooled() else None
+
         # create the person
-        p = singleton.Singleton(u.home, u.clock, u.schedule)
+        if p is None:
+            p = singleton.Singleton(u.home, u.clock, u.schedule)
+
+        # the person samples from the universe's random number generator
+        p.set_rng(u.rng)
 
         # set person to have relevant parameters
         p.set(self.params, idx)
@@ -787,6 +786,18 @@ class Trial(object):
 
         return p
 
+    def is_pooled(self):
+
+        """
+        This function indicates whether or not the trial reuses a universe from the pool of the process \
+        (see :mod:`universe_pool`).
+
+        :return: a flag indicating whether the universe is reused (if True) or not (if False)
+        :rtype: bool
+        """
+
+        return self.do_pool and self.can_pool
+
     def pseudo_intraindividual_variation(self, start_mean, end_mean):
 
         """
@@ -891,9 +902,16 @@ class Trial(object):
         # run the ABMHAP simulation
         u.run()
 
+        # store the measurements of the simulation
+        self.profile = u.profiler
+
         #
         diary_hhld_list = self.get_diary(u)
 
+        # return the universe to the pool for the next trial
+        if self.is_pooled():
+            universe_pool.put(u)
+
         return diary_hhld_list
 
     # def run_uni(self):
@@ -944,18 +962,44 @@ class Trial(object):
         N = 3 * len(df)
 
         # sample for mean values
-        data_mean   = mg.sample( df['mu'].values, N )
+        data_mean   = mg.sample( df['mu'].values, N, self.rng )
 
         # sample standard deviation values
-        data_std    = mg.sample( df['std'].values, N )
+        data_std    = mg.sample( df['std'].values, N, self.rng )
 
         # sample for coefficient of variation
         # use only finite values of coefficient of variation
         x           = df['cv'].values
-        data_cv     = mg.sample( x[np.isfinite(x)], N )
+        data_cv     = mg.sample( x[np.isfinite(x)], N, self.rng )
 
         return data_mean, data_std, data_cv
 
+    def set_seed(self, seed):
+
+        """
+        This function sets the random number generators of the trial from a seed. The seed is split into \
+        2 independent streams:
+
+        #. a stream for sampling the parameters from CHAD (:attr:`rng`)
+        #. a stream for the simulation (:attr:`seed_run`)
+
+        Since the random numbers of a trial only depend on its seed, the results do not depend on which \
+        process (or machine) runs the trial.
+
+        :param numpy.random.SeedSequence seed: the seed
+
+        :return: None
+        """
+
+        self.seed = seed
+
+        # the seeds for sampling the parameters and for running the simulation
+        seed_params, self.seed_run = seed.spawn(2)
+
+        self.rng = np.random.default_rng(seed_params)
+
+        return
+
     # def sample_N(self, df, N, do_solo=False):
     #
     #     """
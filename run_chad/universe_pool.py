@@ -0,0 +1,139 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module holds a process-wide pool of universes (:class:`universe.Universe`) that are reused from one \
+trial to the next.
+
+Creating a universe and its agents (the clock, the home and its assets, the scheduler, and each agent \
+with its needs, probability distributions, and history) takes about as long as simulating a household \
+for a week. When the simulation runs many households, each worker process reuses the universe (and its \
+agents) of the previous household instead of creating a new one. A universe is reused only by a household \
+with the same number of time steps, time step, start time, and number of people.
+
+A universe is taken from the pool with :func:`get`. The universe is reset (see \
+:func:`universe.Universe.reset`) and has no people. The agents of the previous household are reset and are \
+handed out, one at a time, by :func:`get_person`. The trial re-parameterizes each agent from its \
+parameters (see :func:`trial.Trial.initialize_person`) so that the simulation is the same as a \
+simulation with a new universe. When the simulation is done, the universe is returned with :func:`put`.
+"""
+
+# ===========================================
+# import
+# ===========================================
+
+import sys
+sys.path.append('..\\source')
+
+# ABMHAP modules
+import universe
+
+# ===========================================
+# constants
+# ===========================================
+
+# the pool. The key is (number of steps, time step, start time, number of people) and the value is the \
+# universe that is not in use
+POOL = dict()
+
+# the universes in use. The key is the identifier of the universe and the value is a tuple of (the key of \
+# the universe in the pool, the reset agents that may be reused)
+IN_USE = dict()
+
+# ===========================================
+# functions
+# ===========================================
+
+def clear():
+
+    """
+    This function empties the pool.
+
+    :return: None
+    """
+
+    POOL.clear()
+    IN_USE.clear()
+
+    return
+
+def get(num_steps, dt, t_start, num_people):
+
+    """
+    This function returns a universe from the pool. If there is no universe in the pool for the given \
+    arguments, a new universe is created.
+
+    The universe is reset to the start time and has no people. The reset agents of the previous \
+    simulation are available from :func:`get_person`.
+
+    :param int num_steps: the number of time steps in the simulation
+    :param int dt: the time step [minutes]
+    :param int t_start: the start time of the simulation [minutes, universal time]
+    :param int num_people: the number of people in the household
+
+    :return: the universe
+    :rtype: universe.Universe
+    """
+
+    key = (num_steps, dt, t_start, num_people)
+
+    u = POOL.pop(key, None)
+
+    if u is None:
+
+        u = universe.Universe(num_steps, dt, t_start, num_people)
+        people = list()
+
+    else:
+
+        # reset the universe and its people without initializing them
+        u.reset(t_start, do_initialize=False)
+
+        # the people are added back one at a time as they are re-parameterized
+        people, u.people = u.people, list()
+
+    IN_USE[id(u)] = (key, people)
+
+    return u
+
+def get_person(u):
+
+    """
+    This function returns an agent (that has been reset) from the previous simulation in the universe.
+
+    :param universe.Universe u: the universe taken from the pool (see :func:`get`)
+
+    :return: the agent. If there are no agents to reuse, None is returned
+    :rtype: person.Person
+    """
+
+    x = IN_USE.get( id(u) )
+
+    if (x is None) or (len(x[1]) == 0):
+        return None
+
+    return x[1].pop(0)
+
+def put(u):
+
+    """
+    This function returns a universe to the pool after the simulation is done. The universe (and its \
+    agents) may be used by the next simulation with the same arguments.
+
+    :param universe.Universe u: the universe taken from the pool (see :func:`get`)
+
+    :return: None
+    """
+
+    x = IN_USE.pop( id(u), None )
+
+    if x is not None:
+        POOL[x[0]] = u
+
+    return
@@ -0,0 +1,190 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module checks that the results of :class:`population.Population` agree statistically with the results \
+of the object model (:func:`trial.Trial.run`).
+
+The same trials are run with both engines. For each activity, the following are compared:
+
+* the number of times the activity is done per household
+* the mean and standard deviation of the start time
+* the mean and standard deviation of the duration
+
+The random numbers are drawn in a different order in each engine, so the results only agree within \
+sampling error. A mean agrees if the difference is at most :const:`Z_MAX` standard errors. A count or a \
+standard deviation agrees if the relative difference is at most :const:`TOL_COUNT` or :const:`TOL_STD`, \
+respectively.
+
+The demographic is set in :literal:`driver_params.py`. To run the check, type the following in the \
+command line
+
+.. code-block:: bash
+
+    python validate_population.py [num_hhld] [num_days]
+
+where **num_hhld** is the number of households and **num_days** is the number of days. The script exits \
+with a nonzero status if any of the comparisons do not agree.
+"""
+
+# ===========================================
+# import
+# ===========================================
+
+import sys
+sys.path.append('..\\source')
+sys.path.append('..\\run')
+sys.path.append('..\\processing')
+
+# mathematical capabilities
+import numpy as np
+
+# dataframe capabilities
+import pandas as pd
+
+# ABMHAP modules
+import driver_params as dp
+import driver, trial
+
+# ===========================================
+# constants
+# ===========================================
+
+# the default number of households
+NUM_HHLD    = 100
+
+# the default number of days
+NUM_DAYS    = 14
+
+# the seed of the random number generators of the trials
+SEED        = 0
+
+# the maximum number of standard errors between the means of the engines
+Z_MAX       = 4.0
+
+# the maximum relative difference between the number of times an activity is done in each engine
+TOL_COUNT   = 0.05
+
+# the maximum relative difference between the standard deviations of the engines
+TOL_STD     = 0.10
+
+# ===========================================
+# functions
+# ===========================================
+
+def compare(x_obj, x_pop):
+
+    """
+    This function compares the summary statistics of the object model and the Population.
+
+    :param pandas.core.frame.DataFrame x_obj: the summary statistics of the object model \
+    (see :func:`get_summary`)
+    :param pandas.core.frame.DataFrame x_pop: the summary statistics of the Population
+
+    :return: the summary statistics of each engine and whether each statistic agrees, for each activity. \
+    The activities done by only one of the engines do not agree
+    :rtype: pandas.core.frame.DataFrame
+    """
+
+    x_obj, x_pop = x_obj.align(x_pop, join='outer')
+
+    # the relative difference
+    rel_diff = lambda a, b: np.abs(a - b) / np.maximum( np.abs(a), np.abs(b) )
+
+    # the number of standard errors between the means
+    z_score = lambda key: np.abs( x_obj[key + '_mean'] - x_pop[key + '_mean'] ) \
+                          / np.sqrt( x_obj[key + '_std']**2 / x_obj['n'] + x_pop[key + '_std']**2 / x_pop['n'] )
+
+    ok = pd.DataFrame(index=x_obj.index)
+
+    ok['count']         = rel_diff(x_obj['count'], x_pop['count']) <= TOL_COUNT
+    ok['start_mean']    = z_score('start') <= Z_MAX
+    ok['start_std']     = rel_diff(x_obj['start_std'], x_pop['start_std']) <= TOL_STD
+    ok['dt_mean']       = z_score('dt') <= Z_MAX
+    ok['dt_std']        = rel_diff(x_obj['dt_std'], x_pop['dt_std']) <= TOL_STD
+
+    df = pd.concat( {'object': x_obj, 'population': x_pop, 'ok': ok}, axis=1 )
+
+    return df
+
+def get_summary(diaries, num_hhld):
+
+    """
+    This function calculates the summary statistics of the activity diaries for each activity.
+
+    :param diaries: the activity diaries of each household
+    :type diaries: list of list of :class:`diary.Diary`
+    :param int num_hhld: the number of households
+
+    :return: the number of events, the number of events per household, and the mean and standard \
+    deviation of the start time and duration [hours] of each activity
+    :rtype: pandas.core.frame.DataFrame
+    """
+
+    # the activity diary of every person
+    df = pd.concat( [x.df for d in diaries for x in d] )
+
+    g = df.groupby('act')
+
+    x = pd.DataFrame( {'n': g.size(), 'start_mean': g['start'].mean(), 'start_std': g['start'].std(), \
+                       'dt_mean': g['dt'].mean(), 'dt_std': g['dt'].std()} )
+
+    x['count'] = x['n'] / num_hhld
+
+    return x
+
+def run(num_hhld, num_days, demographic, seed=SEED):
+
+    """
+    This function runs the same trials with the object model and with the Population and compares \
+    the results.
+
+    :param int num_hhld: the number of households
+    :param int num_days: the number of days
+    :param int demographic: the demographic identifier
+    :param int seed: the seed of the random number generators of the trials
+
+    :return: the comparison of the engines (see :func:`compare`)
+    :rtype: pandas.core.frame.DataFrame
+    """
+
+    # the CHAD demographic
+    chad_demo = driver.get_chad_demo(demographic)
+
+    trials = driver.create_trials(num_hhld, num_days, 0, 0, trial.OMNI, chad_demo.int_2_param, demographic, \
+                                  1, False, seed=seed)
+
+    # run the trials with each engine
+    diaries_obj = driver.run_serial(trials)
+    diaries_pop = driver.run_population(trials)
+
+    df = compare( get_summary(diaries_obj, num_hhld), get_summary(diaries_pop, num_hhld) )
+
+    return df
+
+# ===========================================
+# run
+# ===========================================
+
+if __name__ == '__main__':
+
+    # the number of households and days from the command line
+    num_hhld = int(sys.argv[1]) if len(sys.argv) > 1 else NUM_HHLD
+    num_days = int(sys.argv[2]) if len(sys.argv) > 2 else NUM_DAYS
+
+    df = run(num_hhld, num_days, dp.demographic)
+
+    with pd.option_context('display.width', 200, 'display.max_columns', None):
+        print( df.round(3) )
+
+    is_ok = df['ok'].values.all()
+
+    print('\nthe Population agrees with the object model:\t%s' % is_ok)
+
+    sys.exit(0 if is_ok else 1)
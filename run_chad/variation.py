@@ -150,13 +150,17 @@ def integrate_residual(result, df_obs, act_code, do_periodic, do_weekday, do_dur
 
     df_abm = evaluation.sample_activity_abm(df_list, act_code)
 
+    # the kernel density estimates are binned so that the residual analysis is fast in the optimization
+    method = evaluation.METHOD_BINNED
+
     # get the duration data
-    x_dt, cdf_dt, inv_cdf_dt = evaluation.residual_analysis(pred=df_abm.dt.values, obs=df_obs.dt.values, N=N)
+    x_dt, cdf_dt, inv_cdf_dt = evaluation.residual_analysis(pred=df_abm.dt.values, obs=df_obs.dt.values, N=N, \
+                                                            method=method)
 
     # get the start time data
     x_start, cdf_start, inv_cdf_start = evaluation.residual_analysis(pred=df_abm.start.values, \
                                                                      obs=df_obs.start.values, N=N, \
-                                                                     do_periodic=do_periodic)
+                                                                     do_periodic=do_periodic, method=method)
     q = np.linspace(0, 1, N)
 
     if do_duration:
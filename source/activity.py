@@ -149,7 +149,7 @@ class Activity(object):
         score = 0.0
 
         # create a clock for the Need perception due the activity when it's finished
-        future_clock = temporal.Temporal(the_need.clock.t_univ + dt)
+        future_clock = temporal.Time_Point(the_need.clock.t_univ + dt)
 
         # the current need association level
         n_now = the_need.magnitude
@@ -0,0 +1,240 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module contains code that keeps track of the advertisements made to each person while the \
+universe assigns activities in a time step.
+
+When the universe assigns activities (:func:`universe.Universe.address_needs`), only 1 person starts \
+an activity at a time. Afterwards, the advertisements for the remaining people are needed again. The \
+score of an advertisement depends only on the person being advertised to and on which assets are \
+available. Therefore, only the advertisements to the following people need to be recalculated:
+
+#. the person who was assigned an activity
+#. the people in the same location as an asset whose status changed
+
+The advertisements for everyone else are reused.
+
+Each advertisement is stored as a small record (:class:`ad_board.Advertisement`) with a fixed set of \
+attributes.
+
+This module contains class :class:`ad_board.Ad_Board` and class :class:`ad_board.Advertisement`, and the \
+function :func:`ad_board.select`, which chooses the advertisement with the highest score.
+"""
+
+# ===============================================
+# import
+# ===============================================
+
+# general math capability
+import numpy as np
+
+# timing capability
+import time
+
+# agent-based model modules
+import my_globals as mg
+
+# ===============================================
+# class Ad_Board
+# ===============================================
+
+class Ad_Board(object):
+
+    """
+    This class stores the advertisements made to each person in a household.
+
+    :param home.Home the_home: the home whose assets make the advertisements
+    :param list people: the people living in the home
+    :param profiler.Profiler the_profiler: the (optional) measurements of the simulation
+
+    :var home.Home home: the home whose assets make the advertisements
+    :var list people: the people living in the home
+    :var list ads: the stored advertisements for each person. The entry is None if the advertisements \
+    need to be calculated.
+    :var list asset_status: the status of each asset when the advertisements were stored
+    :var profiler.Profiler profiler: counts and times the advertisements that are calculated. If None, \
+    nothing is measured
+    """
+
+    def __init__(self, the_home, people, the_profiler=None):
+
+        # the home
+        self.home           = the_home
+
+        # the people
+        self.people         = people
+
+        # the stored advertisements for each person
+        self.ads            = [None] * len(people)
+
+        # the status of each asset
+        self.asset_status   = self.get_asset_status()
+
+        # the (optional) measurements
+        self.profiler       = the_profiler
+
+        return
+
+    def advertise(self, i, do_interruption=False):
+
+        """
+        This function returns the advertisements to a person. The advertisements are calculated \
+        only if they are not stored.
+
+        :param int i: the index of the person
+        :param bool do_interruption: a flag that indicates whether or not we should advertise for interruptions
+
+        :return: the advertisements (see :func:`home.Home.advertise`)
+        :rtype: list
+        """
+
+        if self.ads[i] is None:
+
+            if self.profiler is None:
+                self.ads[i] = self.home.advertise(self.people[i], do_interruption=do_interruption)
+
+            else:
+                # count and time the advertisements
+                tic         = time.perf_counter()
+                self.ads[i] = self.home.advertise(self.people[i], do_interruption=do_interruption)
+                self.profiler.add_ads(i, len(self.ads[i]), time.perf_counter() - tic)
+
+        return self.ads[i]
+
+    def get_asset_status(self):
+
+        """
+        This function returns the status of each asset in the home.
+
+        :return: the status of each asset
+        :rtype: list of int
+        """
+
+        return [a.status for a in self.home.assets.values()]
+
+    def update(self, p):
+
+        """
+        This function is called after a person is assigned an activity. It removes the stored \
+        advertisements that may have changed:
+
+        #. the advertisements to the given person
+        #. the advertisements to the people in the same location as an asset whose status changed
+
+        :param person.Person p: the person who was assigned an activity
+
+        :return: None
+        """
+
+        # the advertisements to the person who was assigned an activity have changed
+        for i, x in enumerate(self.people):
+            if x is p:
+                self.ads[i] = None
+
+        # the current status of the assets
+        asset_status = self.get_asset_status()
+
+        # the locations of the assets whose status changed
+        locales = set( [ a.location.local for a, s_old, s_new
+                         in zip(self.home.assets.values(), self.asset_status, asset_status) if s_old != s_new ] )
+
+        # remove the advertisements to the people in those locations
+        if len(locales) > 0:
+            for i, x in enumerate(self.people):
+                if x.location.local in locales:
+                    self.ads[i] = None
+
+        self.asset_status = asset_status
+
+        return
+
+# ===============================================
+# class Advertisement
+# ===============================================
+
+class Advertisement(object):
+
+    """
+    This class represents an advertisement of an activity in an asset to a person.
+
+    :param float score: the score of the advertisement
+    :param asset.Asset the_asset: the asset that is advertising
+    :param activity.Activity the_activity: the activity being advertised
+    :param person.Person p: the person being advertised to
+
+    :var float score: the score of the advertisement
+    :var asset.Asset asset: the asset that is advertising
+    :var activity.Activity activity: the activity being advertised
+    :var person.Person person: the person being advertised to
+    """
+
+    __slots__ = ('score', 'asset', 'activity', 'person')
+
+    def __init__(self, score, the_asset, the_activity, p):
+
+        self.score      = score
+        self.asset      = the_asset
+        self.activity   = the_activity
+        self.person     = p
+
+        return
+
+    def get_score(self):
+
+        """
+        This function returns the score of the advertisement.
+
+        :return: the score
+        :rtype: float
+        """
+
+        return self.score
+
+# ===============================================
+# functions
+# ===============================================
+
+def select(ads, rng=None):
+
+    """
+    Given the advertisements to each person, this function selects the advertisement with the \
+    highest score. For each person, the first advertisement with the highest score is the best \
+    advertisement. If 2 or more people have best advertisements with the same highest score, \
+    the winner is chosen randomly (uniform).
+
+    :param ads: the advertisements to each person
+    :type ads: list of list of :class:`ad_board.Advertisement`
+    :param numpy.random.Generator rng: the random number generator used to break ties. If None, the \
+    *numpy.random* random number generator is used
+
+    :return: the selected advertisement
+    :rtype: ad_board.Advertisement
+    """
+
+    # the best advertisement for each person with (non-empty) advertisements
+    best = [ max(a, key=Advertisement.get_score) for a in ads if a ]
+
+    # the highest score for each person
+    score = np.array( [x.score for x in best], dtype=float )
+
+    # an array of indices of Person(s) with the max score
+    p_idx = np.flatnonzero( score == score.max() )
+
+    # if NO Person(s) have a max-score conflict, the Person with the highest score wins
+    if len(p_idx) == 1:
+        chosen = best[p_idx[0]]
+
+    else:
+        # 2 or more people have a max-score conflict, choose 1 randomly (uniform)
+        # by randomly assigning numbers, the winner has the highest value
+        rando   = mg.get_rng(rng).random( len(p_idx) )
+        chosen  = best[ p_idx[np.argmax(rando)] ]
+
+    return chosen
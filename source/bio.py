@@ -102,6 +102,9 @@ class Bio(object):
     
     :ivar func f_sleep_start: the distribution data for start time for sleep
     :ivar func f_sleep_end: the distribution data for end time for sleep
+    :ivar int num_samples: the number of samples drawn at once from each distribution
+    :ivar numpy.random.Generator rng: the random number generator for the distributions. If None, the \
+    *numpy.random* random number generator is used
     
     """
     #
@@ -134,12 +137,18 @@ class Bio(object):
         self.start_trunc        = SLEEP_START_TRUNC
         self.end_trunc          = SLEEP_END_TRUNC
 
+        # the number of samples drawn at once from the sleep distributions
+        self.num_samples        = mg.NUM_SAMPLES
+
+        # the random number generator for the sleep distributions
+        self.rng                = None
+
         # these are the probability distributions for sampling start and end times
         self.f_sleep_start  = mg.set_distribution(-self.start_trunc, self.start_trunc, self.sleep_start_mean, \
-                                                    self.sleep_start_std)
+                                                    self.sleep_start_std, self.num_samples, self.rng)
 
         self.f_sleep_end    = mg.set_distribution(-self.end_trunc, self.end_trunc, self.sleep_end_mean, \
-                                                    self.sleep_end_std)
+                                                    self.sleep_end_std, self.num_samples, self.rng)
 
         return
 
@@ -175,7 +184,7 @@ class Bio(object):
         # If not, write the error message
         return INT_2_STR_GENDER.get(self.gender, msg)
 
-    def set_sleep_params(self, start_mean, start_std, end_mean, end_std):
+    def set_sleep_params(self, start_mean, start_std, end_mean, end_std, num_samples=None):
 
         """
         This function sets the biological sleep parameters themselves and the sleep parameter distribution functions.
@@ -185,11 +194,17 @@ class Bio(object):
 
         :param int end_mean: the mean sleep end time [minutes]
         :param int end_std: the standard deviation of end time [minutes]
+        :param int num_samples: the number of samples to draw at once from each distribution. If None, \
+        the current value is kept
         :return: None
         """
 
         DAY_2_MIN = temporal.DAY_2_MIN
 
+        # set the number of samples drawn at once
+        if num_samples is not None:
+            self.num_samples = num_samples
+
         # set the standard deviation of the sleep duration
         self.sleep_start_mean, self.sleep_start_std     = start_mean, start_std
         self.sleep_end_mean, self.sleep_end_std         = end_mean, end_std
@@ -199,10 +214,27 @@ class Bio(object):
         self.sleep_dt       = (self.sleep_end - self.sleep_start) % DAY_2_MIN
 
         self.f_sleep_start  = mg.set_distribution(-self.start_trunc, self.start_trunc, self.sleep_start_mean, \
-                                                   self.sleep_start_std)
+                                                   self.sleep_start_std, self.num_samples, self.rng)
 
         self.f_sleep_end    = mg.set_distribution(-self.end_trunc, self.end_trunc, self.sleep_end_mean, \
-                                                    self.sleep_end_std)
+                                                    self.sleep_end_std, self.num_samples, self.rng)
+
+        return
+
+    def set_rng(self, rng):
+
+        """
+        This function sets the random number generator used to sample the sleep start time and end time.
+
+        :param numpy.random.Generator rng: the random number generator. If None, the *numpy.random* \
+        random number generator is used
+        :return: None
+        """
+
+        self.rng = rng
+
+        self.f_sleep_start.set_rng(rng)
+        self.f_sleep_end.set_rng(rng)
 
         return
 
@@ -33,8 +33,8 @@ import numpy as np
 # dataframe capability
 import pandas as pd
 
-# add date/time and zipfile capabilities
-import datetime, zipfile
+# add zipfile capabilities
+import zipfile
 
 # ABMHAP modules
 import my_globals as mg
@@ -214,6 +214,13 @@ QUEST_COLNAMES      = ['CHADID', 'PID', 'rawid', 'daynum', 'totaldays', 'month',
 ACT_X = -1
 ACT_U = -2
 
+# This dictionary takes the non-numeric activity codes in the raw CHAD data and returns the
+# INTEGER representation
+ACT_STR_2_INT = {'X': ACT_X, 'U': ACT_U}
+
+# the format of the dates in the raw CHAD data
+DATE_FORMAT = '%Y-%m-%d'
+
 # ===============================================
 # constants based on the CHAD data
 # ===============================================
@@ -594,14 +601,15 @@ class CHAD_RAW(CHAD):
         # the unique PIDs of people above a certain age
         pid = self.quest.PID[ idx ].unique()
 
-        # group the events by PID
-        gb = self.events.groupby('PID')
+        # the events of the people in the age range
+        events  = self.events[ self.events.PID.isin(pid) ]
 
-        # collect the data frames for the events
-        y = [gb.get_group(x) for x in pid]
+        # order the events by the order of the PIDs (keeping the order of the events of each person)
+        rank    = pd.Series( np.arange( len(pid) ), index=pid )
+        order   = np.argsort( rank[events.PID].values, kind='stable' )
 
         # set the events and questionnaire data
-        self.events = pd.concat(y)
+        self.events = events.iloc[order]
         self.quest  = self.quest[idx]
 
         return
@@ -631,10 +639,10 @@ class CHAD_RAW(CHAD):
         df = pd.read_csv(self.z.open(FNAME_EVENTS), encoding='ISO-8859-1')
 
         # recall that the activity codes contain numeric and non-numeric data
-        df.act = df.act.apply(self.convert_activity_code).values
+        df['act'] = to_activity_code(df.act)
 
         # get the PID
-        df.PID = df.CHADID.apply(self.get_PID)
+        df['PID'] = to_PID(df.CHADID)
 
         return df
 
@@ -689,7 +697,7 @@ class CHAD_RAW(CHAD):
         df = self.get_data(FNAME_QUEST)
 
         # get the PID
-        df.PID = df.CHADID.apply(self.get_PID)
+        df['PID'] = to_PID(df.CHADID)
 
         return df
 
@@ -701,10 +709,10 @@ class CHAD_RAW(CHAD):
 
         :return: None
         """
-        f = lambda x: datetime.datetime.strptime(x, '%Y-%m-%d').date()
+        f = lambda x: pd.to_datetime(x, format=DATE_FORMAT).dt.date
 
-        self.quest.date     = self.quest.date.apply(f)
-        self.events.date    = self.events.date.apply(f)
+        self.quest.date     = f(self.quest.date)
+        self.events.date    = f(self.events.date)
 
         return
 
@@ -758,3 +766,43 @@ def sample_stats(sample):
         
     return (s_mean, s_std)
 
+def to_activity_code(x):
+
+    """
+    This function converts the activity codes in the raw CHAD data into integers. The numeric codes \
+    are parsed and the non-numeric codes ('X' and 'U') are converted with :const:`ACT_STR_2_INT` \
+    (see :func:`CHAD_RAW.convert_activity_code`).
+
+    :param pandas.core.series.Series x: the activity codes
+
+    :return: the integer activity codes
+    :rtype: pandas.core.series.Series
+    """
+
+    # the codes as strings (the column may hold numeric and non-numeric data)
+    x = x.astype(str).str.strip()
+
+    # the non-numeric codes
+    code = x.map(ACT_STR_2_INT)
+
+    # the numeric codes
+    y = pd.to_numeric( x.where( code.isna() ) )
+
+    return code.fillna(y).astype(int)
+
+def to_PID(x):
+
+    """
+    This function converts the CHADIDs into PIDs. The PID is the CHADID stripped of the last character, \
+    which is a code for the day record. For the CHADIDs that start with 'EPA', the PID is the first \
+    6 characters (see :func:`CHAD_RAW.get_PID`).
+
+    :param pandas.core.series.Series x: the CHADIDs
+
+    :return: the PIDs
+    :rtype: pandas.core.series.Series
+    """
+
+    y = x.str[:-1].where( ~x.str.startswith('EPA'), x.str[:6] )
+
+    return y
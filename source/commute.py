@@ -234,7 +234,7 @@ class Commute_From_Work(Commute):
             t_univ_later    = t_day + p.socio.job.t_end + dt_commute
 
             # create a clock for the Need perception due the Activity when it's finished
-            future_clock = temporal.Temporal(t_univ_later)
+            future_clock = temporal.Time_Point(t_univ_later)
 
             # the current need level and the resulting need level if an Activity is done
             n_now = p.travel.magnitude
@@ -412,7 +412,7 @@ class Commute_To_Work(Commute):
             t_univ_later    = p.clock.t_univ + (p.socio.job.t_end - p.clock.time_of_day) % DAY_2_MIN
 
             # create a clock for the Need perception due the Activity when it's finished
-            future_clock    = temporal.Temporal(t_univ_later)
+            future_clock    = temporal.Time_Point(t_univ_later)
 
             # the current need level and the resulting need level if an Activity is done
             n_now = p.travel.magnitude
@@ -31,9 +31,6 @@ import numpy as np
 # dataframe capability
 import pandas as pd
 
-from itertools import groupby
-from operator import itemgetter
-
 # agent-based model modules
 import activity, location, temporal
 
@@ -53,115 +50,173 @@ class Diary(object):
 
     """
     This class represents the activity-diaries for a person.
-    
+
+    The diary is created from either
+
+    #. the minute-by-minute data (the default). There is one entry in t, act, and local for each \
+    minute of the simulation.
+    #. the event data (if is_sparse is True). These are the histories from the simulation \
+    (:attr:`temporal.Temporal.hist_time`, :attr:`person.Person.hist_activity`, and \
+    :attr:`person.Person.hist_local`), in which there is one entry for each time step in the simulation \
+    and the unused entries of the time have the value -1. The activity at a time step lasts until the \
+    next time step. The last time step marks the end of the simulation.
+
     :param numpy.ndarray t: the start times for each activity [universal time, minutes]
     :param numpy.ndarray act: the activity code done at each time step [integer] (flattened array)
     :param numpy.ndarray local: the history of location codes done by a person
-     
-    
+    :param bool is_sparse: a flag indicating whether the data are event data (if True) or minute-by-minute \
+    data (if False)
+
     :ivar list colnames: the column names for the activity diary in order
     :ivar pandas.core.frame.DataFrame df: the activity-diary
+    :ivar numpy.ndarray day_of_week: the day of the week that each activity in the activity-diary ends
     """
 
-    def __init__(self, t, act, local):
+    def __init__(self, t, act, local, is_sparse=False):
 
         # the column names explaining the diary information
         self.colnames = COLNAMES
 
+        # the columns of the activity-diary
+        if is_sparse:
+            x = self.create_activity_diary_from_events(t, act, local)
+        else:
+            x = self.create_activity_diary(t, act, local)
+
         # the activity-diary data frame
-        self.df = pd.DataFrame( self.create_activity_diary(t, act, local), columns=self.colnames )
+        self.df = pd.DataFrame( dict( zip(self.colnames, x) ), columns=self.colnames )
+
+        # the day of the week that each activity ends, used to split the diary into weekdays and weekends
+        self.day_of_week = self.get_day_of_week(self.df)
 
         return
 
     def create_activity_diary(self, t, act, local):
 
         """
-        This function creates the activity diary for a given agent in the simulation.
+        This function creates the activity diary for a given agent in the simulation from the \
+        minute-by-minute data.
 
         The activity diary contains:
 
         #. the start-time and end-time for each activity
         #. the activity code
 
+        Consecutive time steps with the same activity code are grouped into one activity event.
 
         :param numpy.ndarray t: the simulation times [universal time, minutes]
         :param numpy.ndarray act: the activity code done at each time step [integer] (flattened array)
+        :param numpy.ndarray local: the location code at each time step [integer]
 
-        :return: a tuple containing the following: the array indices for each activity grouping, the activity diaries \
-        in a numerical format, the activity diary in a string format, and the column names for each data type
+        :return: the columns of the activity diary (see :func:`create_activity_diary_help`)
+        :rtype: tuple of numpy.ndarray
+        """
+
+        # flatten the data
+        t       = np.asarray(t).flatten()
+        act     = np.asarray(act).flatten()
+        local   = np.asarray(local).flatten()
+
+        # the index of the first and last time step of each activity event
+        i_start = self.get_run_starts(act)
+        i_end   = np.append(i_start[1:], len(act)) - 1
+
+        # the columns of the diary
+        y = self.create_activity_diary_help(t[i_start], t[i_end], act[i_start], local[i_start])
+
+        return y
+
+    def create_activity_diary_from_events(self, t, act, local):
 
-        Each diary is a tuple that contains the following:
-        
-        #. the day number of the start of the activity
-        #. the (start-time, end-time) for the activity event
-        #. the activity code for the activity event
-        #. the location of the event
         """
+        This function creates the activity diary for a given agent in the simulation from the event data \
+        without filling out the data minute by minute.
 
-        # constants
-        DAY_2_MIN   = temporal.DAY_2_MIN
-        HOUR_2_MIN  = temporal.HOUR_2_MIN
+        Consecutive events with the same activity code are grouped into one activity event. An event that \
+        happens at the same time as the next event has no duration and is ignored.
 
-        # get an array of day number corresponding to each time
-        day = t // DAY_2_MIN
+        :param numpy.ndarray t: the time of each time step [universal time, minutes]. Unused entries are -1.
+        :param numpy.ndarray act: the activity code at each time step [integer]
+        :param numpy.ndarray local: the location code at each time step [integer]
 
-        # the steps in the simulation
-        steps = list(range(len(act)))
+        :return: the columns of the activity diary (see :func:`create_activity_diary_help`)
+        :rtype: tuple of numpy.ndarray
+        """
 
-        # time_step-activity_code pairings
-        groups = self.group_activity(steps, act)
+        # get indices that indicate the simulation data
+        idx     = np.asarray(t).flatten() != -1
 
-        # the time steps in groups
-        idx = self.group_activity_indices(groups)
+        # the simulation data only
+        t       = np.asarray(t).flatten()[idx]
+        act     = np.asarray(act).flatten()[idx]
+        local   = np.asarray(local).flatten()[idx]
 
-        #
-        # store the start-time and end-time for each activity event
-        #
+        # the events that last until the next event. This excludes the last time step (the end of the
+        # simulation) and the events with no duration
+        keep    = np.diff(t) > 0
 
-        # the start and end time of each activity in universal time
-        ranges = [(t[i].min(), t[i].max()) for i in idx]
+        # the start time of each event and the time of the next event
+        t_start = t[:-1][keep]
+        t_next  = t[1:][keep]
 
-        # the start and end time of each activity in time of day
-        ranges = [(np.array(r) % DAY_2_MIN).tolist() for r in ranges]
+        # the activity code and location code of each event. The codes are stored as floats, which is how
+        # the filled out minute-by-minute data stored them
+        act     = act[:-1][keep].astype(float)
+        local   = local[:-1][keep].astype(float)
 
-        # calculate the duration (add + 1 because
-        dt = [(i[1] - i[0] + 1) % DAY_2_MIN for i in ranges]
+        # the index of the first and last event of each activity event
+        i_start = self.get_run_starts(act)
+        i_end   = np.append(i_start[1:], len(act)) - 1
 
-        # convert the time of day and duration to hours
-        ranges  = np.array(ranges) / HOUR_2_MIN
-        dt      = np.array(dt) / HOUR_2_MIN
+        # the columns of the diary. An activity event ends 1 minute before the next activity event starts
+        y = self.create_activity_diary_help(t_start[i_start], t_next[i_end] - 1, act[i_start], local[i_start])
 
-        # start and end time for each activity in military time
-        start_time, end_time = ranges[:, 0], ranges[:, 1]
+        return y
 
-        #
-        # get the activity codes for each activity event
-        #
+    def create_activity_diary_help(self, t_start, t_end, act, local):
 
-        # the activity code for each activity
-        # ech group entry g: list [ (index, activity code) ]
-        act_code = [g[0][1] for g in groups]
+        """
+        This function creates the columns of the activity diary from the start time, end time, \
+        activity code, and location code of each activity event.
 
-        #
-        # get the location information
-        #
-        # first index for each event
-        x = [i[0] for i in idx]
+        Each diary contains the following:
 
-        # the day the first activity starts
-        act_day = np.array([day[i] for i in x]).flatten()
+        #. the day number of the start of the activity
+        #. the (start-time, end-time) for the activity event
+        #. the duration of the activity event
+        #. the activity code for the activity event
+        #. the location of the event
 
-        # numeric local location code
-        loc_code = local[x].flatten().tolist()
+        :param numpy.ndarray t_start: the time of the first minute of each activity [universal time, minutes]
+        :param numpy.ndarray t_end: the time of the last minute of each activity [universal time, minutes]
+        :param numpy.ndarray act: the activity code of each activity
+        :param numpy.ndarray local: the location code of each activity
 
-        #
-        # create the diary
-        #
+        :return: the day, start time [hours], end time [hours], duration [hours], activity code, and \
+        location code of each activity
+        :rtype: tuple of numpy.ndarray
+        """
 
-        # numerical diary
-        y = list(zip(act_day, start_time, end_time, dt, act_code, loc_code))
+        # constants
+        DAY_2_MIN   = temporal.DAY_2_MIN
+        HOUR_2_MIN  = temporal.HOUR_2_MIN
 
-        return y
+        # the day the activity starts
+        act_day = t_start // DAY_2_MIN
+
+        # the start and end time of each activity in time of day
+        start   = t_start % DAY_2_MIN
+        end     = t_end % DAY_2_MIN
+
+        # calculate the duration (add + 1 because the end time is the start of the last minute)
+        dt      = (end - start + 1) % DAY_2_MIN
+
+        # convert the time of day and duration to hours
+        start_time  = start / HOUR_2_MIN
+        end_time    = end / HOUR_2_MIN
+        dt          = dt / HOUR_2_MIN
+
+        return act_day, start_time, end_time, dt, act, local
 
     def get_day_end(self, day_start, start, dt):
 
@@ -192,6 +247,46 @@ class Diary(object):
 
         return day_end
 
+    def get_day_of_week(self, df=None):
+
+        """
+        This function gets the day of the week that each activity ends.
+
+        :param pandas.core.frame.DataFrame df: the activity-diary of interest. If df is None, then use the dataframe \
+        associated with the diary object
+
+        :return: the day of the week that each activity ends
+        :rtype: numpy.ndarray
+        """
+
+        # if no dataframe is passed, do the results on all the data
+        if df is None:
+            df = self.df
+
+        # the day that each activity ends
+        day_end = self.get_day_end(df.day.values, df.start.values, df.dt.values)
+
+        # the day of the week
+        day_of_week = (day_end % 7).astype(np.int8)
+
+        return day_of_week
+
+    def get_run_starts(self, x):
+
+        """
+        This function finds the start of each run of consecutive equal values (run-length encoding).
+
+        :param numpy.ndarray x: the data
+
+        :return: the index of the first entry of each run
+        :rtype: numpy.ndarray
+        """
+
+        # the entries that are different from the previous entry
+        is_start = np.ones(len(x), dtype=bool)
+        is_start[1:] = x[1:] != x[:-1]
+
+        return np.flatnonzero(is_start)
 
     def get_weekday_data(self, df=None):
 
@@ -279,89 +374,18 @@ class Diary(object):
         if df is None:
             df = self.df
 
-        # this indexes events that start and end on the same day
-        idx = df.apply( lambda row: self.same_day( row['start'], row['dt']), axis=1)
+        # the day of the week that each activity ends. Use the stored values for this object's dataframe
+        # (diaries saved before the values were stored do not have them)
+        day_of_week = getattr(self, 'day_of_week', None)
 
-        # these are the days that an event ends
-        day_end = df.day + (idx == False)
+        if (df is not self.df) or (day_of_week is None) or (len(day_of_week) != len(df)):
+            day_of_week = self.get_day_of_week(df)
 
         # the boolean indices of whether an activity ended on a weekend
-        idx_weekend = day_end.apply(self.is_weekend)
+        idx_weekend = pd.Series( self.is_weekend(day_of_week), index=df.index )
 
         return idx_weekend
 
-    def group_activity(self, t, y):
-
-        """
-        This function groups activities in chronological order.
-        
-        :param numpy.ndarray t: the start time for activities
-        :param numpy.ndarray y: the activity code that corresponds with the respective time  
-        
-        :return: a list of each unique group-lists. Each group-list contains a tuple \
-        for (time step, activity code)
-
-        """
-
-        # make a time_step-activity_code pairing
-        z = zip(t, y)
-
-        # a list for each group
-        groups = []
-
-        # group entries by consecutive time AND activity code
-        for k, g in groupby(enumerate(z), self.group_activity_key):
-
-            # the group will contain tuples of (time step, activity code)
-            group = list(map(itemgetter(1), g))
-            groups.append(group)
-
-        return groups
-
-    def group_activity_indices(self, groups):
-
-        """
-        This function returns the indices for each continuous activity in chronological order.
-        
-        .. note::
-            The output is the time step number **not** the value of time
-            
-        :param list groups: a list of tuples of (time step, activity code)  
-        :return:
-        """
-
-        idx = []
-
-        # loop through each entry and return the time step
-        for g in groups:
-            idx.append([x[0] for x in g])
-
-        return idx
-
-    def group_activity_key(self, x):
-
-        """
-        This is the key function used in groupby in order to group consecutive time-step-activity pairs. This is \
-        necessary for creating an activity diary.
-
-        :param tuple x: the data in the form of ( index, (time step, activity code) )
-        :return: the key for sorting ( , activity code)
-        :rtype: tuple
-        """
-
-        # the index from enumerating each time step
-        idx = x[0]
-
-        # the time step number and activity code
-        t, act = x[1]
-
-        # the key used in groupby
-        # the first entry is for grouping by consecutive times
-        # the second entry is for grouping by activity code
-        k = (idx - t, act)
-
-        return k
-
     def is_weekend(self, day):
 
         """
@@ -376,10 +400,10 @@ class Diary(object):
         weekend = (temporal.SATURDAY, temporal.SUNDAY)
 
         # the day of the week
-        day_of_week = day % 7
+        day_of_week = np.asarray(day) % 7
 
         # check to see if it is the weekend
-        result = day_of_week in weekend
+        result = np.isin(day_of_week, weekend)
 
         return result
 
@@ -26,7 +26,7 @@ This module contains the following class: :class:`home.Home`
 
 # agent-based model modules
 import location as loc
-import bed, food, state, transport, workplace
+import ad_board, bed, food, state, transport, workplace
 
 # ===============================================
 # constants
@@ -167,7 +167,7 @@ class Home(object):
                         each advertisement: ("score", "asset", "activity", "person") coupling of \
                         data type (float, :class:`asset.Asset`, :class:`activity.Activity`, \
                         :class:`person.Person`)
-        :rtype: dict        
+        :rtype: list of :class:`ad_board.Advertisement`
         """
 
         ads = [] #(score, Asset, Activity)
@@ -192,8 +192,7 @@ class Home(object):
 
                     if (score is not None):
                         # add the score for each activity
-                        x = {'score': score, 'asset': a, 'activity': act, 'person': p}
-                        ads.append(x)
+                        ads.append( ad_board.Advertisement(score, a, act, p) )
 
         return ads
 
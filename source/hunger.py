@@ -277,7 +277,8 @@ class Hunger(need.Need):
         """
         This gives the result if eat is done now until a later time corresponding to clock.
 
-        :param temporal.Temporal future_clock: a clock at a future time
+        :param future_clock: a clock at a future time
+        :type future_clock: temporal.Temporal or temporal.Time_Point
 
         :return out: the perceived hunger need association level
         :rtype: float
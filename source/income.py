@@ -120,7 +120,8 @@ class Income(need.Need):
             * the perceived satiation is :math:`\eta_{work} \le \lambda`
             * else, the perceived satiation is :math:`1.0`
         
-        :param temporal.Temporal clock: the future time the activity the should be perceived to be done
+        :param clock: the future time the activity the should be perceived to be done
+        :type clock: temporal.Temporal or temporal.Time_Point
         :param occupation.Occupation job: the job
 
         :return: the satiation at the perceived time
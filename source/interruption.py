@@ -173,7 +173,8 @@ class Interruption(need.Need):
         """
         This gives the result if sleep is done now until a later time corresponding to clock.
 
-        :param temporal.Temporal clock: a clock at a future time
+        :param clock: a clock at a future time
+        :type clock: temporal.Temporal or temporal.Time_Point
 
         :return out: the perceived interruption magnitude
         """
@@ -200,8 +201,8 @@ class Interruption(need.Need):
         super(Interruption, self).reset()
 
         # reset the activity to start and stop, respectively
-        self.activity_start = None
-        self.activity_stop = None
+        self.activity_start = activity.NO_ACTIVITY
+        self.activity_stop  = activity.NO_ACTIVITY
 
         return
 
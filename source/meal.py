@@ -112,6 +112,9 @@ class Meal(object):
     :ivar f_start: the start time distribution function
     :ivar f_dt: the duration distribution function 
     :ivar int day: the day the meal should occur 
+    :ivar int num_samples: the number of samples drawn at once from each distribution
+    :ivar numpy.random.Generator rng: the random number generator for the distributions. If None, the \
+    *numpy.random* random number generator is used
     """
 
     #
@@ -134,8 +137,16 @@ class Meal(object):
         self.t_start    = self.start_mean
         self.dt         = self.dt_mean
 
-        self.f_start    = mg.set_distribution(-self.start_trunc, self.start_trunc, self.start_mean, self.start_std)
-        self.f_dt       = mg.set_distribution(-self.dt_trunc, self.dt_trunc, self.dt_mean, self.dt_std)
+        # the number of samples drawn at once from the meal distributions
+        self.num_samples    = mg.NUM_SAMPLES
+
+        # the random number generator for the meal distributions
+        self.rng            = None
+
+        self.f_start    = mg.set_distribution(-self.start_trunc, self.start_trunc, self.start_mean, self.start_std, \
+                                              self.num_samples, self.rng)
+        self.f_dt       = mg.set_distribution(-self.dt_trunc, self.dt_trunc, self.dt_mean, self.dt_std, \
+                                              self.num_samples, self.rng)
 
         self.t_start_univ   = 0
         self.day            = 0
@@ -186,7 +197,22 @@ class Meal(object):
         # If the id is valid, represent the id as a string. If not, write the error message
         return INT_2_STR.get(self.id, msg)
 
-    def set_meal(self, id, start_mean, start_std, start_trunc, dt_mean, dt_std, dt_trunc):
+    def reset(self):
+
+        """
+        This function resets the times of the meal that change during the simulation so that the meal \
+        can be used in a new simulation. The meal is updated to the new simulation time in \
+        :func:`initialize`.
+
+        :return: None
+        """
+
+        self.t_start_univ   = 0
+        self.day            = 0
+
+        return
+
+    def set_meal(self, id, start_mean, start_std, start_trunc, dt_mean, dt_std, dt_trunc, num_samples=None):
 
         """
         This function sets the values associated with the Meal object.
@@ -198,12 +224,18 @@ class Meal(object):
         :param int dt_mean: the mean duration of a meal [minutes]
         :param int dt_std: the standard deviation of meal duration [minutes]
         :param int dt_trunc: the number of standard deviations in the duration distribution
+        :param int num_samples: the number of samples to draw at once from each distribution. If None, \
+        the current value is kept
                 
         :return: None
         """
 
         self.id = id
 
+        # set the number of samples drawn at once
+        if num_samples is not None:
+            self.num_samples = num_samples
+
         self.start_mean     = start_mean
         self.start_std      = start_std
         self.start_trunc    = start_trunc
@@ -216,9 +248,26 @@ class Meal(object):
         self.dt         = self.dt_mean
 
         self.f_start            = mg.set_distribution(-self.start_trunc, self.start_trunc, self.start_mean, \
-                                                      self.start_std)
+                                                      self.start_std, self.num_samples, self.rng)
         self.f_dt, self.dt_std  = mg.set_distribution_dt(-self.dt_trunc, self.dt_trunc, self.dt_mean, self.dt_std, \
-                                                         x_min=DT_MIN)
+                                                         x_min=DT_MIN, num_samples=self.num_samples, rng=self.rng)
+
+        return
+
+    def set_rng(self, rng):
+
+        """
+        This function sets the random number generator used to sample the meal start time and duration.
+
+        :param numpy.random.Generator rng: the random number generator. If None, the *numpy.random* \
+        random number generator is used
+        :return: None
+        """
+
+        self.rng = rng
+
+        self.f_start.set_rng(rng)
+        self.f_dt.set_rng(rng)
 
         return
 
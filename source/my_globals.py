@@ -36,7 +36,10 @@ from statsmodels.distributions.empirical_distribution import ECDF
 # statistical capability
 import scipy.stats as stats
 
-import os, pickle, random, shutil
+import os, pickle, random, shutil, sys
+
+# agent-based model modules
+import sample_pool
 
 # ===============================================
 # constants
@@ -99,6 +102,9 @@ N_LONG = 2
 # file ending used for batch saves
 F_BATCH_ENDING = '_b%04d.pkl'
 
+# the default number of samples drawn at once from a probability distribution (1 week of daily samples)
+NUM_SAMPLES = 7
+
 #
 # file extensions
 #
@@ -106,9 +112,36 @@ F_BATCH_ENDING = '_b%04d.pkl'
 # acceptable file extensions for python pickle files
 EXTENSION_PKL = ('.pkl', '.pickle')
 
+#
+# pickle streams (see save_stream())
+#
+
+# the first object in a pickle stream
+STREAM_MARKER   = 'ABMHAP_STREAM'
+
+# the kinds of pickle streams: the objects are lists to be concatenated or individual objects
+STREAM_LIST     = 'list'
+STREAM_OBJECTS  = 'objects'
+
 # ===============================================
 # function
 # ===============================================
+def append(x, fname):
+
+    """
+    This function pickles a python variable at the end of a pickle stream (see :func:`save_stream`).
+
+    :param x: the data to be saved
+    :param str fname: the file name of the pickle stream. It must end with .pkl
+
+    :return: None
+    """
+
+    with open(fname, 'ab') as fout:
+        pickle.dump(x, fout)
+
+    return
+
 def check_filename_extension(fname, ext):
 
     """
@@ -128,6 +161,22 @@ def check_filename_extension(fname, ext):
 
     return ok
 
+def close_plots():
+
+    """
+    This function closes all of the open plots. The plotting library (matplotlib) is not imported \
+    by this function. If it has not been imported, there are no plots to close.
+
+    :return: None
+    """
+
+    plt = sys.modules.get('matplotlib.pyplot')
+
+    if plt is not None:
+        plt.close('all')
+
+    return
+
 def fill_out_data(t, y):
 
     """
@@ -225,6 +274,92 @@ def get_ecdf(data, N=100):
 
     return x, y
 
+def get_rng(rng=None):
+
+    """
+    This function returns the object used to draw random numbers. If a random number generator is not \
+    given, the *numpy.random* random number generator is used. Both have the functions *random()* \
+    and *choice()*.
+
+    :param numpy.random.Generator rng: the random number generator
+
+    :return: the random number generator
+    """
+
+    if rng is None:
+        rng = np.random
+
+    return rng
+
+def get_seed_sequence(seed=None):
+
+    """
+    This function creates the root seed for independent random number generators. If a seed is not \
+    given, the root seed is drawn from the *numpy.random* random number generator, so seeding with \
+    :func:`initialize_random_number_generator` keeps the results reproducible.
+
+    :param seed: the seed
+    :type seed: int or numpy.random.SeedSequence
+
+    :return: the root seed
+    :rtype: numpy.random.SeedSequence
+    """
+
+    if not isinstance(seed, np.random.SeedSequence):
+
+        # draw the seed from the numpy.random random number generator
+        if seed is None:
+            seed = np.random.randint(np.iinfo(np.int64).max, dtype=np.int64)
+
+        seed = np.random.SeedSequence(seed)
+
+    return seed
+
+def get_seed_sequences(seed, num, offset=0):
+
+    """
+    This function creates the seeds for independent random number generators (one for each trial). \
+    The seed with index i is the (offset + i)-th child of the root seed. Therefore, the seed of a trial \
+    only depends on the root seed and on the index of the trial, not on how the trials are split into \
+    batches or worker processes.
+
+    :param seed: the root seed (see :func:`get_seed_sequence`)
+    :type seed: int or numpy.random.SeedSequence
+    :param int num: the number of seeds
+    :param int offset: the index of the first seed
+
+    :return: the seeds
+    :rtype: list of numpy.random.SeedSequence
+    """
+
+    # the root seed
+    seed = get_seed_sequence(seed)
+
+    # the children of the root seed (the same as seed.spawn() for offset 0)
+    seeds = [ np.random.SeedSequence(seed.entropy, spawn_key=seed.spawn_key + (offset + i,), \
+                                     pool_size=seed.pool_size) for i in range(num) ]
+
+    return seeds
+
+def grow_array(x, num, fill_value):
+
+    """
+    This function grows an array along its first axis by appending a given number of rows, each filled \
+    with a given value. The data type of the array is preserved.
+
+    :param numpy.ndarray x: the array to grow
+    :param int num: the number of rows to append
+    :param fill_value: the value of the appended entries
+
+    :return: the grown array
+    :rtype: numpy.ndarray
+    """
+
+    # the appended rows
+    y = np.full( (num,) + x.shape[1:], fill_value, dtype=x.dtype)
+
+    return np.concatenate( (x, y) )
+
 def group_time(t):
 
     """
@@ -275,6 +410,19 @@ def initialize_random_number_generator(seed=None):
 
     return
 
+def is_stream(x):
+
+    """
+    This function checks whether or not an unpickled object is the marker at the start of a pickle stream.
+
+    :param x: the unpickled object
+
+    :return: a flag indicating whether the object is the marker of a pickle stream (if True) or not (if False)
+    :rtype: bool
+    """
+
+    return isinstance(x, tuple) and (len(x) == 2) and (x[0] == STREAM_MARKER)
+
 def load(fname):
 
     """
@@ -302,9 +450,52 @@ def load(fname):
     # close the file
     fin.close()
 
+    # load every object of a pickle stream
+    if is_stream(x):
+
+        y = list( load_stream(fname) )
+
+        # concatenate the lists
+        if x[1] == STREAM_LIST:
+            y = [item for sublist in y for item in sublist]
+
+        x = y
+
     return x
 
-def sample(data, N):
+def load_stream(fname):
+
+    """
+    This function loads the objects of a pickle stream (see :func:`save_stream`) one at a time, so \
+    that only one object is in memory at a time. If the file is not a pickle stream, the one object \
+    in the file is loaded.
+
+    :param str fname: the file name to be loaded from
+
+    :return: the objects in the file
+    :rtype: generator
+    """
+
+    with open(fname, 'rb') as fin:
+
+        x = pickle.load(fin)
+
+        if not is_stream(x):
+            yield x
+
+        else:
+            # load until the end of the file
+            while True:
+                try:
+                    x = pickle.load(fin)
+                except EOFError:
+                    break
+
+                yield x
+
+    return
+
+def sample(data, N, rng=None):
 
     """
     This function creates N samples of the empirical distribution of the values in the \
@@ -312,11 +503,13 @@ def sample(data, N):
 
     :param numpy.ndarray data: the data to sample
     :param int N: the number of data points to sample
+    :param numpy.random.Generator rng: the random number generator. If None, the *numpy.random* random \
+    number generator is used
     :return:
     """
 
     # randomly sample percentile numbers [0, 100]
-    p = 100 * np.random.rand(N)
+    p = 100 * get_rng(rng).random(N)
 
     # sample the data array according to pth percentile
     x = np.percentile(a=data, q=p)
@@ -385,7 +578,7 @@ def save(x, fname):
 
     return
 
-def save_diary_to_csv(df, fname):
+def save_diary_to_csv(df, fname, do_append=False):
 
     """
     This function saves an activity diary as a .csv file. The output is changed from the
@@ -394,6 +587,8 @@ def save_diary_to_csv(df, fname):
 
     :param pandas.core.frame.DataFrame df: the activity-diary output of the simulation
     :param str fname: the file name of the saved file. It must end with a .csv extension
+    :param bool do_append: a flag indicating whether to add the rows to the end of an existing file without \
+    the header (if True) or to write a new file (if False)
 
     :return:
     """
@@ -427,7 +622,29 @@ def save_diary_to_csv(df, fname):
     os.makedirs(os.path.dirname(fname), exist_ok=True)
 
     # save the data
-    data.to_csv(fname, index=False)
+    if do_append:
+        data.to_csv(fname, index=False, mode='a', header=False)
+    else:
+        data.to_csv(fname, index=False)
+
+    return
+
+def save_stream(fname, kind=STREAM_OBJECTS):
+
+    """
+    This function starts a pickle stream. A pickle stream is a pickle file that holds many objects that \
+    are added one at a time (see :func:`append`) and loaded one at a time (see :func:`load_stream`), so \
+    that a large amount of data can be saved and loaded without having all of it in memory. The first \
+    object in the file is a marker that tells :func:`load` to load every object in the file.
+
+    :param str fname: the file name of the pickle stream. It must end with .pkl
+    :param str kind: the kind of stream. If :const:`STREAM_LIST`, each object is a list and :func:`load` \
+    concatenates the lists. If :const:`STREAM_OBJECTS`, :func:`load` returns the list of objects
+
+    :return: None
+    """
+
+    save( (STREAM_MARKER, kind), fname )
 
     return
 
@@ -449,24 +666,29 @@ def save_zip(out_file, source_dir):
 
     return x
 
-def set_distribution(lower, upper, mu, std):
+def set_distribution(lower, upper, mu, std, num_samples=NUM_SAMPLES, rng=None):
 
     """
-    This function sets the truncated normal probability distribution.
+    This function sets the truncated normal probability distribution. The distribution is sampled in \
+    blocks of num_samples values (see :class:`sample_pool.Sample_Pool`).
 
     :param int lower: the lower bound in number of standard deviation from the mean
     :param int upper: the upper bound in number of standard deviation from the mean
     :param int mu: the mean
     :param int std: the standard deviation
+    :param int num_samples: the number of samples to draw at once
+    :param numpy.random.Generator rng: the random number generator. If None, the *numpy.random* random \
+    number generator is used
     
     :return: the function for the truncated normal distribution
+    :rtype: sample_pool.Sample_Pool
     """
 
-    f = stats.truncnorm(lower, upper, loc=mu, scale=std).rvs
+    f = sample_pool.Sample_Pool( stats.truncnorm(lower, upper, loc=mu, scale=std), num_samples, rng)
 
     return f
 
-def set_distribution_dt(lower, upper, mu, std, x_min):
+def set_distribution_dt(lower, upper, mu, std, x_min, num_samples=NUM_SAMPLES, rng=None):
 
     """
     This function set the truncated normal probability distribution subject to the fact that there \
@@ -481,6 +703,9 @@ def set_distribution_dt(lower, upper, mu, std, x_min):
     :param int mu: the mean
     :param int std: the standard deviation
     :param int x_min: the lowest allowed value
+    :param int num_samples: the number of samples to draw at once
+    :param numpy.random.Generator rng: the random number generator. If None, the *numpy.random* random \
+    number generator is used
     
     :return: the function for the truncated normal distribution, the standard deviation of the distribution 
     :rtype: tuple
@@ -500,7 +725,7 @@ def set_distribution_dt(lower, upper, mu, std, x_min):
         the_std = std
 
     # set the truncated normal distribution
-    f = set_distribution(lower, upper, mu, the_std)
+    f = set_distribution(lower, upper, mu, the_std, num_samples, rng)
 
     return f, the_std
 
@@ -26,6 +26,9 @@ This module contains the class :class:`need.Need`.
 # general math package
 import numpy as np
 
+# agent-based model modules
+import my_globals as mg
+
 # ===============================================
 # constants
 # ===============================================
@@ -142,6 +145,24 @@ class Need(object):
 
         return
 
+    def grow_history(self, num_sample_points):
+
+        """
+        This function grows the satiation history so that it holds the given number of sample points. \
+        The new entries are set to zero.
+
+        :param int num_sample_points: the number of time nodes the history should hold
+        :return: None
+        """
+
+        # the number of entries to add
+        num = num_sample_points - len(self.history)
+
+        if num > 0:
+            self.history = mg.grow_array(self.history, num, 0)
+
+        return
+
     def initialize(self):
 
         """
@@ -170,6 +170,9 @@ class Occupation(object):
     :var f_commute_from_work_dt: the commute from work duration distribution
     :var f_work_start: the work start time distribution
     :var f_work_end: the work end time distribution
+    :var int num_samples: the number of samples drawn at once from each distribution
+    :var numpy.random.Generator rng: the random number generator for the distributions. If None, the \
+    *numpy.random* random number generator is used
     """
 
     #
@@ -180,6 +183,12 @@ class Occupation(object):
         # the occupation ID
         self.id = NO_JOB
 
+        # the number of samples drawn at once from the work and commute distributions
+        self.num_samples = mg.NUM_SAMPLES
+
+        # the random number generator for the work and commute distributions
+        self.rng = None
+
         # the category of Job type
         self.category = NO_TIME
 
@@ -292,6 +301,21 @@ class Occupation(object):
         # if the id is valid, express it as a string. If not, write the error message
         return INT_2_STR_ID.get(self.id, msg)
 
+    def reset(self):
+
+        """
+        This function resets the times of the job that change during the simulation so that the job \
+        can be used in a new simulation.
+
+        :return: None
+        """
+
+        self.t_start_univ   = 0
+        self.t_end_univ     = 0
+        self.day_start      = 0
+
+        return
+
     def set_commute_distribution(self):
 
         """
@@ -306,12 +330,12 @@ class Occupation(object):
         # create the commute to work distribution
         f_to_work, self.commute_to_work_dt_std = mg.set_distribution_dt(-self.commute_to_work_dt_trunc, \
                 self.commute_to_work_dt_trunc, self.commute_to_work_dt_mean, self.commute_to_work_dt_std, \
-                x_min=DT_COMMUTE_MIN)
+                x_min=DT_COMMUTE_MIN, num_samples=self.num_samples, rng=self.rng)
 
         # create the commute from work distribution
         f_from_work, self.commute_from_work_dt_std = mg.set_distribution_dt(-self.commute_from_work_dt_trunc, \
                 self.commute_from_work_dt_trunc, self.commute_from_work_dt_mean, self.commute_from_work_dt_std, \
-                x_min=DT_COMMUTE_MIN)
+                x_min=DT_COMMUTE_MIN, num_samples=self.num_samples, rng=self.rng)
 
         # set the distributions
         self.f_commute_to_work_dt   = f_to_work
@@ -365,7 +389,7 @@ class Occupation(object):
         return
 
     def set_job_params(self, id_job, start_mean, start_std, end_mean, end_std, commute_to_work_dt_mean,\
-                       commute_to_work_dt_std, commute_from_work_dt_mean, commute_from_work_dt_std):
+                       commute_to_work_dt_std, commute_from_work_dt_mean, commute_from_work_dt_std, num_samples=None):
 
         """
         This function sets the Occupation parameters.
@@ -379,6 +403,8 @@ class Occupation(object):
         :param int commute_to_work_dt_std: the standard deviation of the commute to work duration
         :param int commute_from_work_dt_mean: the mean commute from work duration
         :param int commute_from_work_dt_std: the standard deviation to commute from work duration
+        :param int num_samples: the number of samples to draw at once from each distribution. If None, \
+        the current value is kept
         
         :return: None
         """
@@ -386,6 +412,10 @@ class Occupation(object):
         # how many minutes in one day
         DAY_2_MIN   = temporal.DAY_2_MIN
 
+        # set the number of samples drawn at once
+        if num_samples is not None:
+            self.num_samples = num_samples
+
         # set the id number
         self.id     = id_job
 
@@ -517,6 +547,28 @@ class Occupation(object):
 
         return
 
+    def set_rng(self, rng):
+
+        """
+        This function sets the random number generator used to sample the work start time, the work end \
+        time, and the commute durations.
+
+        :param numpy.random.Generator rng: the random number generator. If None, the *numpy.random* \
+        random number generator is used
+        :return: None
+        """
+
+        self.rng = rng
+
+        # the distributions that are set
+        f_list = [self.f_work_start, self.f_work_end, self.f_commute_to_work_dt, self.f_commute_from_work_dt]
+
+        for f in f_list:
+            if f is not None:
+                f.set_rng(rng)
+
+        return
+
     def set_standard_job(self):
 
         """
@@ -686,11 +738,11 @@ class Occupation(object):
 
         # the start time distribution
         self.f_work_start   = mg.set_distribution(-self.work_start_trunc, self.work_start_trunc, \
-                                                  self.t_start_mean, self.t_start_std)
+                                                  self.t_start_mean, self.t_start_std, self.num_samples, self.rng)
 
         # the end time distribution
         self.f_work_end     = mg.set_distribution(-self.work_end_trunc, self.work_end_trunc, \
-                                                  self.t_end_mean, self.t_end_std)
+                                                  self.t_end_mean, self.t_end_std, self.num_samples, self.rng)
         return
 
     def toString(self):
@@ -867,7 +919,8 @@ def is_work_time(clock, job, is_commute_to_work=False):
 
     If :math:`\\Delta{t} > 0`, it indicates when it's time to commute to work.
 
-    :param temporal.Temporal clock: the time
+    :param clock: the time
+    :type clock: temporal.Temporal or temporal.Time_Point
     :param occupation.Occupation job: the job to inquiry
     :param bool is_commute_to_work: a flag indicating whether we are interested in calculating if it is \
                             time to commute to work
@@ -905,7 +958,8 @@ def is_work_time_help(clock, job):
     Given a clock and a job, this function says whether the clock's time corresponds to
     a time at work.
 
-    :param temporal.Temporal clock: the time
+    :param clock: the time
+    :type clock: temporal.Temporal or temporal.Time_Point
     :param occupation.Occupation job: the job to inquiry
 
     :return: is_work_time: a flag indicating if the time (clock) corresponds to a work time
@@ -130,10 +130,11 @@ class Person (object):
         # the state of a person
         self.state = state.State(state.IDLE)
 
-        # history of the Person's state, activities, and location
-        self.hist_state     = state.IDLE * np.ones( (num_sample_points,1) )
-        self.hist_activity  = activity.NO_ACTIVITY * np.ones( self.hist_state.shape)
-        self.hist_local     = loc.HOME * np.ones( self.hist_state.shape )
+        # history of the Person's state, activities, and location. The codes are small integers, so a \
+        # compact data type is used
+        self.hist_state     = np.full( (num_sample_points,1), state.IDLE, dtype=np.int8)
+        self.hist_activity  = np.full( self.hist_state.shape, activity.NO_ACTIVITY, dtype=np.int8)
+        self.hist_local     = np.full( self.hist_state.shape, loc.HOME, dtype=np.int8)
 
         # history of magnitude of each need. There must to be one per person
         self.H              = -1 * np.ones((num_sample_points, need.N))
@@ -151,32 +152,40 @@ class Person (object):
         :rtype: diary.Diary
         """
 
-        # the indices of simulation data
-        idx = self.clock.hist_time != -1
-        idx = idx.flatten()
+        # create the activity diary directly from the event data
+        d = diary.Diary(t=self.clock.hist_time, act=self.hist_activity, local=self.hist_local, is_sparse=True)
 
-        # the time
-        t = self.clock.hist_time[idx].flatten()
+        return d
+
+    def grow_history(self, num_sample_points):
+
+        """
+        This function grows the history buffers so that they hold the given number of sample points. \
+        The following are grown:
 
-        # the array of the activities
-        hist_act = self.hist_activity[idx]
+        #. history of the state
+        #. history of the activity
+        #. history of the location
+        #. history of the needs (satiation)
 
-        # the array of the locations
-        hist_loc = self.hist_local[idx]
+        :param int num_sample_points: the number of time nodes the history should hold
+        :return: None
+        """
 
-        # make the time continuous
-        t_all = mg.fill_out_time(t)
+        # the number of entries to add
+        num = num_sample_points - len(self.hist_state)
 
-        # fill out the time in between events to get data that corresponds to contiguous time
-        act_all = mg.fill_out_data(t, hist_act)
+        if num > 0:
 
-        # fill out the location data in between events that corresponds to contiguous time
-        loc_all = mg.fill_out_data(t, hist_loc)
+            self.hist_state     = mg.grow_array(self.hist_state, num, state.IDLE)
+            self.hist_activity  = mg.grow_array(self.hist_activity, num, activity.NO_ACTIVITY)
+            self.hist_local     = mg.grow_array(self.hist_local, num, loc.HOME)
+            self.H              = mg.grow_array(self.H, num, -1)
 
-        # create the activity diary
-        d = diary.Diary(t=t_all, act=act_all, local=loc_all)
+            for k in self.needs.keys():
+                self.needs[k].grow_history(num_sample_points)
 
-        return d
+        return
 
     def print_basic_info(self):
 
@@ -218,6 +227,7 @@ class Person (object):
         #. reset the state
         #. reset the location
         #. reset the needs
+        #. reset the job and the meals
         
         .. note::
             the clock needs to be set to the beginning of simulation
@@ -237,6 +247,9 @@ class Person (object):
         # reset the needs
         self.reset_needs()
 
+        # reset the job and the meals
+        self.socio.reset()
+
         return
 
     def reset_history(self):
@@ -247,6 +260,7 @@ class Person (object):
         #. history of the state
         #. history of the activity
         #. history of the location
+        #. history of the needs (satiation)
         
         :return: None 
         """
@@ -255,6 +269,9 @@ class Person (object):
         self.hist_activity[:]  = activity.NO_ACTIVITY
         self.hist_local[:]     = loc.HOME
 
+        self.H[:]              = -1
+        self.need_vector[:]    = -1
+
         return
 
     def reset_needs(self):
@@ -270,6 +287,22 @@ class Person (object):
 
         return
 
+    def set_rng(self, rng):
+
+        """
+        This function sets the random number generator used to sample the person's biology, job, and meals.
+
+        :param numpy.random.Generator rng: the random number generator. If None, the *numpy.random* \
+        random number generator is used
+
+        :return: None
+        """
+
+        self.bio.set_rng(rng)
+        self.socio.set_rng(rng)
+
+        return
+
     def toString(self):
 
         """
@@ -315,6 +348,10 @@ class Person (object):
 
         i = self.clock.step
 
+        # make sure the history buffers are as large as the time history
+        if i >= len(self.hist_state):
+            self.grow_history( len(self.clock.hist_time) )
+
         # store the history of the state
         self.hist_state[i] = self.state.status
 
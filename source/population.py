@@ -0,0 +1,1827 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module contains code that runs the simulation for many single-occupancy households at once. This \
+file contains :class:`population.Population`.
+
+The :class:`universe.Universe` simulates 1 household with Python objects (a :class:`person.Person`, its \
+needs, its activities, and the assets in the home) and handles 1 event at a time. Instead, the \
+Population stores the state of every household in NumPy arrays (a "struct of arrays"). Each array has \
+1 entry per household, for example
+
+* the satiation of each need (Rest, Income, Hunger, Travel, and Interruption)
+* the state (status, activity, location, start time, and end time of the current activity)
+* the scheduled times (the schedule matrix of :class:`scheduler.Scheduler`)
+* the sleep, meal, and job parameters
+
+The households are independent of each other. Therefore, the households step in lockstep by event: in each \
+step of the simulation, **every** household that has not finished handles its next event (at its own \
+time). Ending activities, decaying the needs, checking the thresholds, and selecting activities are done \
+for all of these households at once.
+
+The rules are the same as the rules in the object model for a household of 1 person:
+
+#. end expired activities (:func:`Population.end_activity`)
+#. start the activity with the highest advertised score, if the score is positive \
+(:func:`Population.address_needs`)
+#. check for an interruption (eating lunch at work) and start the interrupting activity \
+(:func:`Population.address_interruptions`)
+#. store the history
+#. jump to the next scheduled time and decay the needs (:func:`Population.decay_needs`)
+
+The random numbers are drawn in a different order than in the object model, so the results can \
+only be compared statistically (e.g., the distribution of the start time and duration of each activity). \
+Each household draws its random numbers from its own generator (see :attr:`trial.Trial.seed_run`), so the \
+results of a household do not depend on which households are simulated with it.
+
+The activity diaries are given as :class:`diary.Diary` objects in the same layout as the output \
+of :func:`trial.Trial.run`.
+
+.. note::
+    Only households with 1 person are supported.
+"""
+
+# ===============================================
+# import
+# ===============================================
+
+# general mathematical capabilities
+import numpy as np
+
+# statistical capabilities
+from scipy import stats
+
+# agent-based model modules
+import my_globals as mg
+import activity, bio, diary, location, meal, need, occupation, state, temporal
+
+# ===============================================
+# constants
+# ===============================================
+
+# the activities in the order that the assets in the home advertise them (see home.Home): the workplace,
+# the bed, the transport, and the food (at home or at work)
+ACTIVITIES = (activity.WORK, activity.SLEEP, activity.COMMUTE_TO_WORK, activity.COMMUTE_FROM_WORK, \
+              activity.EAT_BREAKFAST, activity.EAT_LUNCH, activity.EAT_DINNER)
+
+# the meals in order of the meal identifier
+MEALS = (meal.BREAKFAST, meal.LUNCH, meal.DINNER)
+
+# this takes the meal identifier and returns the activity of eating the meal
+MEAL_2_ACTIVITY = { meal.BREAKFAST: activity.EAT_BREAKFAST,
+                    meal.LUNCH: activity.EAT_LUNCH,
+                    meal.DINNER: activity.EAT_DINNER,
+                    }
+
+# this takes the activity of eating a meal and returns the meal identifier
+ACTIVITY_2_MEAL = { v: k for k, v in MEAL_2_ACTIVITY.items() }
+
+# indicates that there is no meal
+NO_MEAL = -1
+
+# the maximum number of days used to initialize the meals (see meal.Meal.initialize)
+N_MAX_MEAL_DAYS = 500
+
+# ===============================================
+# class Population
+# ===============================================
+
+class Population(object):
+
+    """
+    This class runs the simulation for many single-occupancy households at once. The state of each \
+    household is stored in arrays with 1 entry per household.
+
+    :param list param_list: the parameters for each household (:class:`params.Params`). Each household \
+    must have 1 person. The time parameters (start time, number of time steps, and step size) are taken \
+    from the first household.
+    :param list seeds: the seed (numpy.random.SeedSequence) of the random number generator of each \
+    household. If None (or if an entry is None), the *numpy.random* random number generator is used
+
+    :var int num_hhld: the number of households
+    :var int t_start: the start time of the simulation [minutes, universal time]
+    :var int t_end: the end time of the simulation [minutes, universal time]
+    :var bool initial_step: a flag indicating whether the simulation is in the first step
+    :var numpy.ndarray t: the current time of each household [minutes, universal time]
+    :var numpy.ndarray step: the current step of each household
+    :var numpy.ndarray rng: the random number generator (numpy.random.Generator) of each household. \
+    Entries that are None use the *numpy.random* random number generator
+    :var numpy.ndarray status: the state of each person (see :mod:`state`)
+    :var numpy.ndarray act: the current activity of each person (see :mod:`activity`)
+    :var numpy.ndarray local: the location of each person (see :mod:`location`)
+    :var numpy.ndarray transport_local: the location of the transport of each household
+    :var numpy.ndarray t_act_start: the start time of the current activity [minutes, universal time]
+    :var numpy.ndarray t_act_end: the end time of the current activity [minutes, universal time]
+    :var numpy.ndarray mag: the satiation of each need. The dimension is (number of households x number \
+    of needs)
+    :var numpy.ndarray A: the scheduled time of each need. The dimension is (number of households x \
+    number of needs)
+    :var numpy.ndarray hist_time: the time of each step. The dimension is (number of steps x number of \
+    households). Unused entries are -1.
+    :var numpy.ndarray hist_activity: the activity at each step
+    :var numpy.ndarray hist_local: the location at each step
+    """
+
+    def __init__(self, param_list, seeds=None):
+
+        # the time parameters are shared by all of the households
+        p0 = param_list[0]
+
+        for p in param_list:
+            if (p.num_people != 1):
+                raise ValueError('Population only supports households with 1 person!')
+
+            if (p.t_start, p.num_steps, p.dt) != (p0.t_start, p0.num_steps, p0.dt):
+                raise ValueError('The households in a Population must have the same time parameters!')
+
+        # the number of households
+        self.num_hhld   = len(param_list)
+        N               = self.num_hhld
+
+        # the start and end time of the simulation
+        self.t_start    = p0.t_start
+        self.t_end      = p0.t_start + p0.num_steps * p0.dt
+
+        # the first step of the simulation
+        self.initial_step = True
+
+        # the current time and step of each household
+        self.t      = np.full(N, self.t_start, dtype=np.int64)
+        self.step   = np.zeros(N, dtype=int)
+
+        # the random number generator of each household
+        if seeds is None:
+            seeds = [None] * N
+
+        self.rng = np.empty(N, dtype=object)
+        self.rng[:] = [ np.random.default_rng(x) if (x is not None) else None for x in seeds ]
+
+        #
+        # the state of each person
+        #
+        self.status             = np.full(N, state.IDLE, dtype=int)
+        self.act                = np.full(N, activity.NO_ACTIVITY, dtype=int)
+        self.local              = np.full(N, location.HOME, dtype=int)
+        self.transport_local    = np.full(N, location.HOME, dtype=int)
+        self.t_act_start        = self.t.copy()
+        self.t_act_end          = self.t.copy()
+
+        #
+        # the needs
+        #
+        self.threshold          = need.THRESHOLD
+        self.mag                = np.ones( (N, need.N) )
+
+        self.rest_decay         = np.zeros(N)
+        self.rest_recharge      = np.zeros(N)
+        self.rest_suggested     = np.zeros(N)
+
+        self.hunger_decay       = np.zeros(N)
+        self.hunger_recharge    = np.zeros(N)
+
+        # the interrupting activity and whether an interruption occurred
+        self.interrupt_start    = np.full(N, activity.NO_ACTIVITY, dtype=int)
+        self.do_interruption    = np.zeros(N, dtype=bool)
+
+        # the schedule
+        self.A = np.full( (N, need.N), np.inf )
+
+        #
+        # the sleep parameters
+        #
+        get = lambda key: np.array( [ getattr(p, key)[0] for p in param_list ] )
+
+        self.sleep_start_mean   = get('sleep_start_mean')
+        self.sleep_start_std    = get('sleep_start_std')
+        self.sleep_end_mean     = get('sleep_end_mean')
+        self.sleep_end_std      = get('sleep_end_std')
+
+        self.sleep_start        = self.sleep_start_mean.astype(int)
+        self.sleep_end          = self.sleep_end_mean.astype(int)
+        self.sleep_dt           = (self.sleep_end - self.sleep_start) % temporal.DAY_2_MIN
+
+        #
+        # the meal parameters. The dimension is (number of households x number of meals)
+        #
+        meals = [ (p.breakfasts[0], p.lunches[0], p.dinners[0]) for p in param_list ]
+
+        get_meal = lambda key: np.array( [ [ getattr(m, key) for m in x ] for x in meals ] )
+
+        self.meal_start_mean    = get_meal('start_mean')
+        self.meal_start_std     = get_meal('start_std')
+        self.meal_start_trunc   = get_meal('start_trunc')
+        self.meal_dt_mean       = get_meal('dt_mean')
+        self.meal_dt_trunc      = get_meal('dt_trunc')
+        self.meal_dt_std        = get_std_dt(-self.meal_dt_trunc, self.meal_dt_mean, get_meal('dt_std'), meal.DT_MIN)
+
+        self.meal_start         = self.meal_start_mean.astype(int)
+        self.meal_dt            = self.meal_dt_mean.astype(int)
+        self.meal_start_univ    = np.zeros( (N, len(MEALS)), dtype=np.int64 )
+        self.meal_day           = np.zeros( (N, len(MEALS)), dtype=int )
+
+        # the meal that is being eaten or the upcoming meal
+        self.current_meal       = np.full(N, NO_MEAL, dtype=int)
+
+        #
+        # the job parameters
+        #
+        self.job_id             = get('job_id')
+
+        # the preset values for each job
+        presets = dict()
+        for k in np.unique(self.job_id):
+            job     = occupation.Occupation()
+            job.id  = k
+            job.set_job_preset()
+            presets[k] = job
+
+        self.is_employed    = np.array( [ bool(presets[k].is_employed) for k in self.job_id ] )
+        self.is_same_day    = np.array( [ bool(presets[k].is_same_day) for k in self.job_id ] )
+        self.job_local      = np.array( [ presets[k].location.local for k in self.job_id ] )
+        self.work_days      = np.array( [ [ (d in presets[k].work_days) for d in range(temporal.WEEK_2_DAY) ] \
+                                          for k in self.job_id ], dtype=bool ).reshape( (N, temporal.WEEK_2_DAY) )
+
+        self.work_start_mean    = get('work_start_mean')
+        self.work_start_std     = get('work_start_std')
+        self.work_end_mean      = get('work_end_mean')
+        self.work_end_std       = get('work_end_std')
+
+        self.commute_to_work_dt_mean    = get('commute_to_work_dt_mean')
+        self.commute_to_work_dt_std     = get_std_dt(-occupation.COMMUTE_TO_WORK_DT_TRUNC, \
+                                                     self.commute_to_work_dt_mean, get('commute_to_work_dt_std'), \
+                                                     occupation.DT_COMMUTE_MIN)
+
+        self.commute_from_work_dt_mean  = get('commute_from_work_dt_mean')
+        self.commute_from_work_dt_std   = get_std_dt(-occupation.COMMUTE_FROM_WORK_DT_TRUNC, \
+                                                     self.commute_from_work_dt_mean, \
+                                                     get('commute_from_work_dt_std'), occupation.DT_COMMUTE_MIN)
+
+        self.work_start         = self.work_start_mean.astype(int)
+        self.work_end           = self.work_end_mean.astype(int)
+        self.commute_to_work_dt     = self.commute_to_work_dt_mean.astype(int)
+        self.commute_from_work_dt   = self.commute_from_work_dt_mean.astype(int)
+        self.commute_to_work_start  = (self.work_start - self.commute_to_work_dt) % temporal.DAY_2_MIN
+
+        # the day the work activity starts
+        self.day_start          = np.zeros(N, dtype=int)
+
+        #
+        # the history of each household
+        #
+        num_sample_points   = temporal.get_num_sample_points(p0.num_steps, 1, p0.dt, False)
+
+        self.hist_time      = np.full( (num_sample_points, N), -1, dtype=np.int64)
+        self.hist_activity  = np.full( (num_sample_points, N), activity.NO_ACTIVITY, dtype=int)
+        self.hist_local     = np.full( (num_sample_points, N), location.HOME, dtype=int)
+
+        # initialize the needs
+        self.initialize()
+
+        return
+
+    def address_interruptions(self, idx):
+
+        """
+        This function starts the interrupting activities (see :func:`universe.Universe.address_needs` with \
+        do_interruption=True). The only interruption is stopping the work activity in order to eat lunch.
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        # the households whose Interruption satiation is under the threshold
+        idx     = idx[ self.is_under_threshold(self.mag[idx, need.INTERRUPTION]) ]
+
+        # the households that should stop working in order to eat lunch
+        is_lunch    = self.interrupt_start[idx] == activity.EAT_LUNCH
+        x           = idx[is_lunch]
+
+        # the score of the interrupting activity
+        score       = self.advertise_interruption(x)
+        do_it       = score > 0.0
+
+        # interrupt the work activity and start eating lunch
+        i = x[do_it]
+        self.halt_work(i)
+        self.start_activity(i, activity.EAT_LUNCH)
+
+        # there is no useful interrupting activity
+        self.interrupt_start[ idx[~is_lunch] ]  = activity.NO_ACTIVITY
+        self.interrupt_start[ x[~do_it] ]       = activity.NO_ACTIVITY
+
+        return
+
+    def address_needs(self, idx):
+
+        """
+        This function starts the activity with the highest advertised score for each idle person \
+        (see :func:`universe.Universe.address_needs` with do_interruption=False). If the highest score \
+        is not positive, the person stays idle.
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        # the idle people
+        idx = idx[ self.status[idx] == state.IDLE ]
+
+        # the scores of each activity. The first activity with the highest score is selected
+        score   = self.advertise(idx)
+        k       = np.argmax(score, axis=1)
+        best    = score[np.arange(len(idx)), k]
+
+        # only start activities with a positive score
+        do_it   = best > 0.0
+        idx, k  = idx[do_it], k[do_it]
+
+        # starting a non-interrupting activity resets the interruption
+        self.mag[idx, need.INTERRUPTION]    = 1.0
+        self.interrupt_start[idx]           = activity.NO_ACTIVITY
+
+        # start the activities
+        for j, act_id in enumerate(ACTIVITIES):
+            self.start_activity(idx[k == j], act_id)
+
+        return
+
+    def advertise(self, idx):
+
+        """
+        This function calculates the advertised score of each activity to each person (see \
+        :func:`home.Home.advertise`). An activity only advertises if its asset is at the person's \
+        location.
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: the scores. The dimension is (number of households x number of activities). The columns \
+        are in the order of :const:`ACTIVITIES`.
+        :rtype: numpy.ndarray
+        """
+
+        DAY_2_MIN   = temporal.DAY_2_MIN
+        WORK, REST, HUNGER, TRAVEL = need.INCOME, need.REST, need.HUNGER, need.TRAVEL
+
+        score   = np.zeros( (len(idx), len(ACTIVITIES)) )
+
+        # the current time
+        t                   = self.t[idx]
+        day, time_of_day    = np.divmod(t, DAY_2_MIN)
+
+        # the location of each person
+        local       = self.local[idx]
+        at_home     = local == location.HOME
+        at_work     = local == location.OFF_SITE
+        has_ride    = self.transport_local[idx] == local
+
+        #
+        # work (the workplace is off site)
+        #
+        n_now   = self.mag[idx, WORK]
+        t_later = t + (self.work_end[idx] - time_of_day) % DAY_2_MIN
+        n_later = np.where( self.is_work_time(idx, t_later), need.MAG_WORK, 1.0 )
+
+        score[:, 0] = score_need(n_now, n_later, at_work & self.is_under_threshold(n_now))
+
+        #
+        # sleep (the bed is at home)
+        #
+        n_now   = self.mag[idx, REST]
+        dt      = (self.sleep_end[idx] - self.sleep_start[idx]) % DAY_2_MIN
+        n_later = np.minimum(n_now + self.rest_suggested[idx] * dt, 1.0)
+
+        score[:, 1] = score_need(n_now, n_later, at_home & self.is_under_threshold(n_now))
+
+        #
+        # commute to work (the transport is at home)
+        #
+        n_now   = self.mag[idx, TRAVEL]
+        ok      = has_ride & self.is_under_threshold(n_now)
+        t_later = t + (self.work_end[idx] - time_of_day) % DAY_2_MIN
+        n_later = np.where( self.is_work_time(idx, t_later, is_commute_to_work=True), need.MAG_COMMUTE, 1.0 )
+
+        score[:, 2] = score_need(n_now, n_later, at_home & ok)
+
+        #
+        # commute from work (the transport is off site)
+        #
+        t_later = day * DAY_2_MIN + self.work_end[idx] + self.commute_from_work_dt[idx]
+        n_later = np.where( self.is_work_time(idx, t_later, is_commute_to_work=True), need.MAG_COMMUTE, 1.0 )
+
+        score[:, 3] = score_need(n_now, n_later, at_work & ok)
+
+        #
+        # eating (the food is at home and the cafeteria is off site)
+        #
+        the_meal    = self.get_current_meal(idx)
+        n_now       = self.mag[idx, HUNGER]
+
+        # do not eat lunch at work before lunch time
+        is_early    = self.is_work_time(idx, t) & (time_of_day < self.meal_start[idx, meal.LUNCH])
+
+        ok = { meal.BREAKFAST: at_home,
+               meal.LUNCH: (at_home | at_work) & ~is_early,
+               meal.DINNER: at_home,
+               }
+
+        for m in MEALS:
+            j           = ACTIVITIES.index(MEAL_2_ACTIVITY[m])
+            score[:, j] = self.advertise_meal(idx, m, n_now, ok[m] & (the_meal == m))
+
+        return score
+
+    def advertise_interruption(self, idx):
+
+        """
+        This function calculates the score of eating lunch in order to interrupt the work activity \
+        (see :func:`eat.Eat.advertise_interruption`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: the score for each household
+        :rtype: numpy.ndarray
+        """
+
+        DAY_2_MIN = temporal.DAY_2_MIN
+
+        # the current time of day
+        t           = self.t[idx]
+        time_of_day = t % DAY_2_MIN
+
+        # the person must be at a location with food
+        local       = self.local[idx]
+        has_food    = (local == location.HOME) | (local == location.OFF_SITE)
+
+        # do not eat lunch at work before lunch time
+        is_early    = self.is_work_time(idx, t) & (time_of_day < self.meal_start[idx, meal.LUNCH])
+
+        ok          = has_food & ~is_early & (self.get_current_meal(idx) == meal.LUNCH)
+
+        # the hunger satiation is temporarily low
+        n_now       = np.full(len(idx), need.MAG_INTERRUPTION)
+
+        score       = self.advertise_meal(idx, meal.LUNCH, n_now, ok)
+
+        return score
+
+    def advertise_meal(self, idx, m, n_now, ok):
+
+        """
+        This function calculates the score of eating a meal (see :func:`eat.Eat.advertise_help`).
+
+        :param numpy.ndarray idx: the indices of the households
+        :param int m: the meal identifier
+        :param numpy.ndarray n_now: the current Hunger satiation
+        :param numpy.ndarray ok: a flag indicating whether or not the meal is advertised to each person
+
+        :return: the score for each household
+        :rtype: numpy.ndarray
+        """
+
+        # the duration of the meal
+        dt          = self.meal_dt[idx, m]
+
+        # the suggested recharge rate
+        with np.errstate(divide='ignore', invalid='ignore'):
+            suggested   = (1.0 - self.threshold) / dt
+
+        n_later     = np.minimum(n_now + suggested * dt, 1.0)
+
+        score       = score_need(n_now, n_later, ok & self.is_under_threshold(n_now))
+
+        return score
+
+    def decay_needs(self, idx, dt):
+
+        """
+        This function decays the needs according to the default behavior (see \
+        :func:`universe.Universe.decay_needs`).
+
+        :param numpy.ndarray idx: the indices of the households
+        :param numpy.ndarray dt: the duration of time to decay the needs [minutes]
+
+        :return: None
+        """
+
+        REST, HUNGER, INCOME = need.REST, need.HUNGER, need.INCOME
+
+        # rest does not decay while sleeping
+        awake   = self.status[idx] != state.SLEEP
+        x       = self.mag[idx, REST] + self.rest_decay[idx] * dt
+
+        self.mag[idx, REST]     = np.where( awake, np.maximum(x, need.MIN_DEFAULT), self.mag[idx, REST] )
+
+        # hunger
+        self.mag[idx, HUNGER]   = np.maximum(self.mag[idx, HUNGER] + self.hunger_decay[idx] * dt, need.MIN_DEFAULT)
+
+        # income drops during work time
+        i = idx[ self.is_work_time(idx, self.t[idx]) ]
+        self.mag[i, INCOME] = need.MAG_WORK
+
+        # travel
+        self.decay_travel(idx)
+
+        return
+
+    def decay_travel(self, idx):
+
+        """
+        This function decays the Travel satiation so that the person leaves home to go to work or \
+        leaves work to go home (see :func:`travel.Travel.decay_work_commute`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        # do not commute if working at home
+        idx     = idx[ self.job_local[idx] != location.HOME ]
+
+        t       = self.t[idx]
+        local   = self.local[idx]
+
+        # commute from home to work (leave early to take into account the commute)
+        leave_home  = (local == location.HOME) & self.is_work_time(idx, t, is_commute_to_work=True)
+
+        # commute from work to home (when it is no longer work time)
+        leave_work  = (local == self.job_local[idx]) & ~self.is_work_time(idx, t)
+
+        self.mag[ idx[leave_home | leave_work], need.TRAVEL ] = need.MAG_COMMUTE
+
+        return
+
+    def duration_to_next_commute_event(self, idx):
+
+        """
+        This function calculates the amount of time until the next commute event (see \
+        :func:`social.Social.duration_to_next_commute_event`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: the duration [minutes] until the next commute event
+        :rtype: numpy.ndarray
+        """
+
+        DAY_2_MIN = temporal.DAY_2_MIN
+
+        t           = self.t[idx]
+        time_of_day = t % DAY_2_MIN
+
+        # is it time to work, to commute to work, or to commute from work
+        work_time           = self.is_work_time(idx, t)
+        commute_to_time     = self.is_work_time(idx, t, is_commute_to_work=True)
+        commute_from_time   = self.is_work_time(idx, np.maximum(0, t - self.commute_from_work_dt[idx]))
+
+        # the default is the time until the next commute to work
+        dt = self.duration_to_work_event(idx) - self.commute_to_work_dt[idx]
+
+        dt = np.where(commute_from_time, \
+                      (self.work_end[idx] + self.commute_from_work_dt[idx] - time_of_day) % DAY_2_MIN, dt)
+        dt = np.where(commute_to_time, (self.commute_to_work_start[idx] - time_of_day) % DAY_2_MIN, dt)
+        dt = np.where(work_time, (self.work_end[idx] - time_of_day) % DAY_2_MIN, dt)
+
+        # the unemployed do not commute
+        dt = np.where(self.is_employed[idx], dt, np.inf)
+
+        return dt
+
+    def duration_to_next_meal(self, idx):
+
+        """
+        This function calculates the amount of time until the next meal (see \
+        :func:`social.Social.duration_to_next_meal`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: the duration [minutes] until the next meal and the identifier of the next meal
+        :rtype: numpy.ndarray, numpy.ndarray
+        """
+
+        # the duration until each meal
+        dt_all  = self.meal_start_univ[idx] - self.t[idx][:, np.newaxis]
+
+        # the next meal
+        m       = np.argmin(dt_all, axis=1)
+        dt      = dt_all[np.arange(len(idx)), m]
+
+        return dt, m
+
+    def duration_to_work_event(self, idx):
+
+        """
+        This function calculates the amount of time until the next work event (see \
+        :func:`social.Social.duration_to_work_event`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: the duration [minutes] until the next work event
+        :rtype: numpy.ndarray
+        """
+
+        DAY_2_MIN, WEEK_2_DAY   = temporal.DAY_2_MIN, temporal.WEEK_2_DAY
+
+        t                   = self.t[idx]
+        day, time_of_day    = np.divmod(t, DAY_2_MIN)
+        day_of_week         = day % WEEK_2_DAY
+        t_start             = self.work_start[idx]
+
+        # the number of days until the next workday (1 being tomorrow)
+        z       = np.arange(1, WEEK_2_DAY)
+        days    = (day_of_week[:, np.newaxis] + z) % WEEK_2_DAY
+        dt_day  = z[ np.argmax(self.work_days[idx[:, np.newaxis], days], axis=1) ]
+
+        dt      = dt_day * DAY_2_MIN - time_of_day + t_start
+
+        # sampling on a workday before the work event starts
+        today   = self.work_days[idx, day_of_week] & (time_of_day <= t_start)
+        dt      = np.where(today, (t_start - time_of_day) % DAY_2_MIN, dt)
+
+        # the unemployed do not work
+        dt      = np.where(self.is_employed[idx], dt, np.inf)
+
+        return dt
+
+    def end_activity(self, idx):
+
+        """
+        This function ends the current activity of each person.
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        act = self.act[idx]
+
+        self.end_sleep( idx[act == activity.SLEEP] )
+        self.end_work( idx[act == activity.WORK] )
+        self.end_commute_to_work( idx[act == activity.COMMUTE_TO_WORK] )
+        self.end_commute_from_work( idx[act == activity.COMMUTE_FROM_WORK] )
+        self.end_meal( idx[np.isin(act, list(ACTIVITY_2_MEAL.keys()))] )
+
+        # reset the state's time information to the current time
+        self.t_act_start[idx]   = self.t[idx]
+        self.t_act_end[idx]     = self.t[idx]
+        self.act[idx]           = activity.NO_ACTIVITY
+
+        return
+
+    def end_commute_from_work(self, idx):
+
+        """
+        This function ends the commute from work (see :func:`commute.Commute_From_Work.end_commute`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        self.mag[idx, need.TRAVEL]  = 1.0
+        self.status[idx]            = state.IDLE
+
+        # the person and the transport are at home
+        self.local[idx]             = location.HOME
+        self.transport_local[idx]   = location.HOME
+
+        # sample the commute from work duration
+        self.sample_commute_from_work_dt(idx)
+
+        # the time until the next commute event
+        dt = self.duration_to_work_event(idx) - self.commute_to_work_dt[idx]
+        self.update_schedule(idx, need.TRAVEL, dt)
+
+        return
+
+    def end_commute_to_work(self, idx):
+
+        """
+        This function ends the commute to work (see :func:`commute.Commute_To_Work.end_commute`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        DAY_2_MIN = temporal.DAY_2_MIN
+
+        self.mag[idx, need.TRAVEL]  = 1.0
+        self.status[idx]            = state.IDLE
+
+        # the person and the transport are at work
+        self.local[idx]             = self.job_local[idx]
+        self.transport_local[idx]   = self.job_local[idx]
+
+        # allow work to be the next activity
+        self.mag[idx, need.INCOME]  = need.MAG_WORK
+
+        # sample the commute to work duration
+        self.sample_commute_to_work_dt(idx)
+
+        # the time until the next leave work event
+        dt = (self.work_end[idx] - self.t[idx] % DAY_2_MIN) % DAY_2_MIN
+        self.update_schedule(idx, need.TRAVEL, dt)
+
+        return
+
+    def end_meal(self, idx):
+
+        """
+        This function ends the eating activity (see :func:`eat.Eat.end_meal` and the end_meal() function \
+        for each meal).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        DAY_2_MIN   = temporal.DAY_2_MIN
+        HUNGER      = need.HUNGER
+
+        t   = self.t[idx]
+        day = t // DAY_2_MIN
+
+        # the meal that ended
+        m_end = np.array( [ ACTIVITY_2_MEAL[x] for x in self.act[idx] ], dtype=int )
+
+        self.status[idx] = state.IDLE
+
+        # the gain in satiation
+        dt = self.t_act_end[idx] - self.t_act_start[idx]
+        self.mag[idx, HUNGER] = np.minimum(self.mag[idx, HUNGER] + self.hunger_recharge[idx] * (dt + 1), 1.0)
+
+        # set the current meal for the next day
+        for m in MEALS:
+            i = m_end == m
+            self.sample_meal(idx[i], m, day[i] + 1)
+
+        # set any skipped meals to start on the next day
+        for m in MEALS:
+
+            c = 1
+            i = self.meal_start_univ[idx, m] <= t
+
+            while i.any():
+                self.sample_meal(idx[i], m, day[i] + c)
+                c = c + 1
+                i = self.meal_start_univ[idx, m] <= t
+
+        # find the next meal
+        dt, m_next = self.duration_to_next_meal(idx)
+
+        # set the hunger decay rate
+        with np.errstate(divide='ignore'):
+            self.hunger_decay[idx] = np.where(dt == 0, -1.0, -1.0 * (1.0 - self.threshold) / dt)
+
+        self.update_schedule(idx, HUNGER, dt)
+
+        self.current_meal[idx] = m_next
+
+        #
+        # plan for a skipped meal
+        #
+
+        # after breakfast, skip lunch
+        i = (m_end == meal.BREAKFAST) & (m_next == meal.DINNER)
+        self.sample_meal(idx[i], meal.LUNCH, day[i] + 1)
+
+        # after lunch, skip dinner
+        i = (m_end == meal.LUNCH) & (m_next == meal.BREAKFAST)
+        self.sample_meal(idx[i], meal.DINNER, day[i] + 1)
+
+        # after dinner, skip breakfast
+        i = (m_end == meal.DINNER) & (m_next == meal.LUNCH)
+        self.sample_meal(idx[i], meal.BREAKFAST, day[i] + 2)
+
+        # if lunch was started due to an interruption, schedule the interruption for the next lunch at work
+        i = idx[ (m_end == meal.LUNCH) & self.do_interruption[idx] ]
+        self.update_schedule(i, need.INTERRUPTION, self.get_time_to_next_work_lunch(i))
+        self.do_interruption[i] = False
+
+        return
+
+    def end_sleep(self, idx):
+
+        """
+        This function ends the sleep activity (see :func:`sleep.Sleep.end_sleep`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        DAY_2_MIN   = temporal.DAY_2_MIN
+        REST        = need.REST
+
+        self.status[idx] = state.IDLE
+
+        # the amount of time spent sleeping (including rounding)
+        dt = self.t_act_end[idx] - self.t_act_start[idx] + 1
+
+        # a linear gain in rest
+        self.mag[idx, REST] = np.minimum(self.mag[idx, REST] + self.rest_recharge[idx] * dt, 1.0)
+
+        # sample the sleep parameters
+        self.sample_sleep(idx)
+
+        # the amount of time expected to be awake
+        dt_awake = (self.sleep_start[idx] - self.t[idx] % DAY_2_MIN) % DAY_2_MIN
+
+        # set the rates
+        with np.errstate(divide='ignore'):
+            self.rest_suggested[idx]    = (1.0 - self.threshold) / self.sleep_dt[idx]
+            self.rest_decay[idx]        = -1 * (1.0 - self.threshold) / dt_awake
+
+        # the amount of time until tired again
+        self.update_schedule(idx, REST, dt_awake)
+
+        return
+
+    def end_work(self, idx):
+
+        """
+        This function ends the work activity (see :func:`work.Work.end_work`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        self.status[idx]            = state.IDLE
+        self.mag[idx, need.INCOME]  = 1.0
+
+        # decay the travel need
+        self.decay_travel(idx)
+
+        # sample the work parameters
+        self.sample_work(idx)
+
+        # the time until the next work event
+        self.update_schedule(idx, need.INCOME, self.duration_to_work_event(idx))
+
+        return
+
+    def get_current_meal(self, idx):
+
+        """
+        This function gets the meal whose time window contains the current time (see \
+        :func:`social.Social.get_current_meal`). The time window of a meal starts at the midpoint \
+        between the previous meal and the meal and ends at the midpoint between the meal and \
+        the next meal.
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: the meal identifier for each household (:const:`NO_MEAL` if there is no meal)
+        :rtype: numpy.ndarray
+        """
+
+        DAY_2_MIN   = temporal.DAY_2_MIN
+        N           = len(MEALS)
+
+        t       = self.t[idx] % DAY_2_MIN
+        t_meal  = self.meal_start[idx]
+
+        # flags indicating the current meal
+        is_meal = np.zeros( (len(idx), N), dtype=bool )
+
+        for i in MEALS:
+
+            # the start time of the meal, the next meal, and the previous meal
+            ti, tj, tk = t_meal[:, i], t_meal[:, (i + 1) % N], t_meal[:, (i - 1) % N]
+
+            # the end of the window. Do the math around midnight if the next meal is on the next day
+            wrap    = tj < ti
+            ti      = np.where(wrap, mg.to_periodic(ti, do_hours=False), ti)
+            tj      = np.where(wrap, mg.to_periodic(tj, do_hours=False), tj)
+            top     = np.floor( (ti + tj) / 2 ).astype(int)
+            top     = np.where(wrap, mg.from_periodic(top, do_hours=False), top)
+
+            # the start of the window. Do the math around midnight if the previous meal is on the previous day
+            wrap    = tk > ti
+            tk      = np.where(wrap, mg.to_periodic(tk, do_hours=False), tk)
+            ti      = np.where(wrap, mg.to_periodic(ti, do_hours=False), ti)
+            bot     = np.floor( (tk + ti) / 2 ).astype(int)
+            bot     = np.where(wrap, mg.from_periodic(bot, do_hours=False), bot)
+
+            dt_max  = (top - bot) % DAY_2_MIN
+            dt0     = (t - bot) % DAY_2_MIN
+            dt1     = (top - t) % DAY_2_MIN
+
+            is_meal[:, i] = (dt0 <= dt_max) & (dt1 < dt_max) & (dt1 > 0)
+
+        # the first meal whose window contains the current time
+        m = np.where( is_meal.any(axis=1), np.argmax(is_meal, axis=1), NO_MEAL )
+
+        return m
+
+    def get_diaries(self):
+
+        """
+        This function creates the activity diary for each household from the history of the simulation.
+
+        :return: the activity diaries. There is 1 entry per household and each entry is a list with the \
+        diary of the person in the household (the same layout as the output of :func:`trial.Trial.run`).
+        :rtype: list of list of :class:`diary.Diary`
+        """
+
+        diaries = list()
+
+        for i in range(self.num_hhld):
+
+            # the number of steps in the history
+            n = self.step[i] + 1
+
+            d = diary.Diary(self.hist_time[:n, i], self.hist_activity[:n, i], self.hist_local[:n, i], \
+                            is_sparse=True)
+
+            diaries.append( [d] )
+
+        return diaries
+
+    def get_next_event_time(self, idx):
+
+        """
+        This function finds the next time that each household should handle (see \
+        :func:`scheduler.Scheduler.get_next_event_time`). The next time is the earliest scheduled time \
+        after the current time. If there is no such time, the next time is 1 minute after the current time.
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: the next time [minutes, universal time] for each household
+        :rtype: numpy.ndarray
+        """
+
+        t       = self.t[idx]
+        A       = self.A[idx]
+
+        # the earliest scheduled time after the current time
+        t_next  = np.where( A > t[:, np.newaxis], A, np.inf ).min(axis=1)
+        t_next  = np.where( np.isinf(t_next), t + 1, t_next ).astype(np.int64)
+
+        return t_next
+
+    def get_time_to_next_work_lunch(self, idx):
+
+        """
+        This function calculates the amount of time until the person should eat lunch at work (see \
+        :func:`interruption.Interruption.get_time_to_next_work_lunch`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: the duration [minutes]
+        :rtype: numpy.ndarray
+        """
+
+        DAY_2_MIN = temporal.DAY_2_MIN
+
+        dt = self.duration_to_work_event(idx) \
+             + (self.meal_start[idx, meal.LUNCH] - self.work_start[idx]) % DAY_2_MIN
+
+        return dt
+
+    def halt_work(self, idx):
+
+        """
+        This function interrupts the work activity (see :func:`work.Work.halt_work` and \
+        :func:`state.State.halt_activity`). No benefits of working are given.
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        self.status[idx]                    = state.IDLE
+        self.mag[idx, need.INTERRUPTION]    = 1.0
+        self.interrupt_start[idx]           = activity.NO_ACTIVITY
+        self.do_interruption[idx]           = False
+
+        # reset the state's time information to the current time
+        self.t_act_start[idx]   = self.t[idx]
+        self.t_act_end[idx]     = self.t[idx]
+        self.act[idx]           = activity.NO_ACTIVITY
+
+        return
+
+    def initialize(self):
+
+        """
+        This function initializes the needs of each person at the beginning of the simulation (see \
+        :func:`universe.Universe.initialize_needs`). The needs are initialized in this order
+
+        #. Rest
+        #. Hunger
+        #. Income
+        #. Travel
+        #. Interruption
+
+        :return: None
+        """
+
+        idx = np.arange(self.num_hhld)
+
+        self.initialize_rest(idx)
+        self.initialize_hunger(idx)
+        self.initialize_income(idx)
+
+        # travel
+        self.decay_travel(idx)
+        self.update_schedule(idx, need.TRAVEL, self.duration_to_next_commute_event(idx))
+
+        # interruption
+        self.update_schedule(idx, need.INTERRUPTION, self.get_time_to_next_work_lunch(idx))
+
+        return
+
+    def initialize_hunger(self, idx):
+
+        """
+        This function initializes the Hunger need (see :func:`hunger.Hunger.initialize`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        DAY_2_MIN   = temporal.DAY_2_MIN
+        HUNGER      = need.HUNGER
+
+        t                   = self.t[idx]
+        day, time_of_day    = np.divmod(t, DAY_2_MIN)
+
+        # initialize the meals so that they start after the current time
+        for m in MEALS:
+
+            c = 0
+            i = self.meal_start_univ[idx, m] < t
+
+            while i.any() and (c < N_MAX_MEAL_DAYS):
+                self.sample_meal(idx[i], m, day[i] + c)
+                c = c + 1
+                i = self.meal_start_univ[idx, m] < t
+
+        # check to see if a meal should be occurring at the current time
+        u       = (time_of_day[:, np.newaxis] - self.meal_start[idx]) % DAY_2_MIN
+        u_end   = self.meal_dt[idx] % DAY_2_MIN
+        do_meal = u < u_end
+
+        is_meal = do_meal.any(axis=1)
+
+        #
+        # it is not time to eat
+        #
+        i           = idx[~is_meal]
+        _, m_next   = self.duration_to_next_meal(i)
+
+        # set the decay rate until the next meal
+        dt = (self.meal_start[i, m_next] - time_of_day[~is_meal]) % DAY_2_MIN
+
+        with np.errstate(divide='ignore'):
+            self.hunger_decay[i] = np.where(dt == 0, -1.0, -1.0 * (1.0 - self.threshold) / dt)
+
+        # the amount of time until eating the next meal
+        dt = np.round( (self.mag[i, HUNGER] - self.threshold) / np.abs(self.hunger_decay[i]) ).astype(int)
+
+        self.current_meal[i] = m_next
+        self.update_schedule(i, HUNGER, dt)
+
+        #
+        # it is time to eat
+        #
+        i       = idx[is_meal]
+        m_now   = np.argmax(do_meal[is_meal], axis=1)
+
+        self.current_meal[i] = m_now
+
+        # the duration of the first eating event
+        t_end   = self.meal_start[i, m_now] + self.meal_dt[i, m_now]
+        dt      = (t_end - time_of_day[is_meal]) % DAY_2_MIN
+
+        self.mag[i, HUNGER]     = self.threshold
+        self.hunger_recharge[i] = (1.0 - self.threshold) / dt
+
+        self.update_schedule(i, HUNGER, dt)
+
+        # initialize the universal start time for each meal
+        for m in MEALS:
+
+            # the meal happens later today or tomorrow
+            t_day = np.where(self.meal_start[idx, m] >= time_of_day, day, day + 1) * DAY_2_MIN
+
+            self.meal_start_univ[idx, m]    = t_day + self.meal_start[idx, m]
+            self.meal_day[idx, m]           = day
+
+        return
+
+    def initialize_income(self, idx):
+
+        """
+        This function initializes the Income need (see :func:`income.Income.initialize`). If it is \
+        work time, the person starts at work.
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        INCOME = need.INCOME
+
+        # decay the need
+        is_work = self.is_work_time(idx, self.t[idx])
+        self.mag[ idx[is_work], INCOME ] = need.MAG_WORK
+
+        # if supposed to be at work, change to the appropriate location
+        at_work = self.is_under_threshold(self.mag[idx, INCOME])
+        self.local[ idx[at_work] ] = self.job_local[ idx[at_work] ]
+
+        dt = np.where(at_work, 0, self.duration_to_work_event(idx))
+        self.update_schedule(idx, INCOME, dt)
+
+        return
+
+    def initialize_rest(self, idx):
+
+        """
+        This function initializes the Rest need (see :func:`rest.Rest.initialize`). If the current time \
+        is during the sleep period, the person is set to wake up at the end of the sleep period.
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        DAY_2_MIN   = temporal.DAY_2_MIN
+        REST        = need.REST
+
+        # sample the sleep start time and end time
+        self.sample_sleep(idx)
+
+        t_start, t_end  = self.sleep_start[idx], self.sleep_end[idx]
+        dt              = (t_end - t_start) % DAY_2_MIN
+
+        # the current time of day
+        t = self.t[idx] % DAY_2_MIN
+
+        # elapsed time since the previous wake up event
+        dt_elapsed = (t - t_end) % DAY_2_MIN
+
+        # find out if the person should be asleep (do the math around midnight)
+        x           = mg.to_periodic(t, do_hours=False)
+        x_start     = mg.to_periodic(t_start, do_hours=False)
+        x_end       = mg.to_periodic(t_end, do_hours=False)
+        is_asleep   = (x >= x_start) & (x < x_end)
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+
+            self.rest_suggested[idx] = (1.0 - self.threshold) / dt
+
+            #
+            # the person is asleep
+            #
+            i = idx[is_asleep]
+
+            # the amount of time that will be spent asleep
+            dt_sleep = dt[is_asleep] - (t[is_asleep] - t_start[is_asleep]) % DAY_2_MIN
+
+            self.mag[i, REST]       = self.threshold
+            self.rest_recharge[i]   = (1.0 - self.threshold) / dt_sleep
+
+            self.update_schedule(i, REST, dt_sleep)
+
+            #
+            # the person is awake
+            #
+            i = idx[~is_asleep]
+
+            self.rest_decay[i]  = -1 * (1.0 - self.threshold) / (DAY_2_MIN - dt[~is_asleep])
+            self.mag[i, REST]   = np.maximum(1.0 + self.rest_decay[i] * dt_elapsed[~is_asleep], need.MIN_DEFAULT)
+
+            dt_schedule = np.round( (self.mag[i, REST] - self.threshold) / np.abs(self.rest_decay[i]) ).astype(int)
+
+        self.update_schedule(i, REST, dt_schedule)
+
+        return
+
+    def is_lunch_time(self, idx):
+
+        """
+        This function indicates whether it is lunch time (after lunch starts and before dinner starts) \
+        (see :func:`interruption.Interruption.is_lunch_time`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: a flag indicating whether it is lunch time for each household
+        :rtype: numpy.ndarray
+        """
+
+        time_of_day = self.t[idx] % temporal.DAY_2_MIN
+
+        is_lunch    = time_of_day >= self.meal_start[idx, meal.LUNCH]
+        is_dinner   = time_of_day >= self.meal_start[idx, meal.DINNER]
+
+        return is_lunch & ~is_dinner
+
+    def is_under_threshold(self, n):
+
+        """
+        This function compares the satiation to the threshold (see :func:`need.Need.under_threshold`).
+
+        :param numpy.ndarray n: the satiation
+
+        :return: True if the satiation is less than or equal to the threshold, False otherwise
+        :rtype: numpy.ndarray
+        """
+
+        return n <= self.threshold + need.EPS_THRESHOLD
+
+    def is_work_time(self, idx, t, is_commute_to_work=False):
+
+        """
+        This function indicates whether a time corresponds to a time to be at work **or** a time to \
+        commute to work (see :func:`occupation.is_work_time`).
+
+        :param numpy.ndarray idx: the indices of the households
+        :param numpy.ndarray t: the time for each household [minutes, universal time]
+        :param bool is_commute_to_work: a flag indicating whether we are interested in calculating if it is \
+        time to commute to work
+
+        :return: a flag indicating if it is work time (or commute time) for each household
+        :rtype: numpy.ndarray
+        """
+
+        DAY_2_MIN, WEEK_2_DAY = temporal.DAY_2_MIN, temporal.WEEK_2_DAY
+
+        day, time_of_day    = np.divmod( np.asarray(t).astype(np.int64), DAY_2_MIN )
+        day_of_week         = day % WEEK_2_DAY
+        week_of_year        = (day // WEEK_2_DAY) % temporal.YEAR_2_WEEK
+
+        # if commuting to work, the start time is the time the commute begins
+        if is_commute_to_work:
+            t_start = self.commute_to_work_start[idx]
+        else:
+            t_start = self.work_start[idx]
+
+        # students do not go to school during summer vacation
+        is_vacation = (self.job_id[idx] == occupation.STUDENT) \
+                      & (week_of_year >= occupation.SUMMER_VACATION_START) \
+                      & (week_of_year < occupation.SUMMER_VACTION_END)
+
+        # supposed to be a workday
+        is_work_day = self.is_employed[idx] & ~is_vacation & self.is_same_day[idx] \
+                      & self.work_days[idx, day_of_week] & (day >= self.day_start[idx])
+
+        return is_work_day & (time_of_day >= t_start) & (time_of_day < self.work_end[idx])
+
+    def run(self):
+
+        """
+        This function runs the simulation for all of the households (see :func:`universe.Universe.run`).
+
+        In each step, every household that has not finished does the following at its current time:
+
+        #. end the expired activities
+        #. start new activities by addressing the needs (assuming no interruption)
+        #. check for an interruption
+        #. start new activities by addressing the needs (assuming interruptions only)
+        #. update the history
+        #. find the next time according to the schedule
+        #. update the time and decay the needs
+
+        A household finishes when its next time is after the end of the simulation. Its final entry in \
+        the history is at the end time of the simulation.
+
+        :return: None
+        """
+
+        # the households that have not finished
+        idx = np.arange(self.num_hhld)
+
+        # store the initial time
+        self.hist_time[0, idx] = self.t[idx]
+
+        while len(idx) > 0:
+
+            # end the expired activities
+            i = idx[ (self.status[idx] != state.IDLE) & (self.t[idx] >= self.t_act_end[idx]) ]
+            self.end_activity(i)
+
+            # address the needs NOT due to interruptions
+            self.address_needs(idx)
+
+            # check for an interruption
+            self.stop_work_to_eat( idx[self.status[idx] != state.IDLE] )
+
+            # address the needs due to interruptions
+            self.address_interruptions(idx)
+
+            # update the history
+            self.update_history(idx)
+
+            # after the first time step, there are no initializing procedures
+            self.initial_step = False
+
+            # get the next time
+            t_next  = self.get_next_event_time(idx)
+            is_done = t_next > self.t_end
+
+            # THE FINAL STEP for the households that are finished
+            i = idx[is_done]
+            self.update_clock(i, np.full(len(i), self.t_end, dtype=np.int64))
+            self.update_history(i)
+
+            # update the clock and decay the needs for the next time
+            idx, t_next = idx[~is_done], t_next[~is_done]
+
+            dt = t_next - self.t[idx]
+            self.update_clock(idx, t_next)
+            self.decay_needs(idx, dt)
+
+        return
+
+    def sample_commute_from_work_dt(self, idx):
+
+        """
+        This function samples the commute from work duration.
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        dt = sample_truncnorm(self.commute_from_work_dt_mean[idx], self.commute_from_work_dt_std[idx], \
+                              occupation.COMMUTE_FROM_WORK_DT_TRUNC, self.rng[idx])
+
+        self.commute_from_work_dt[idx] = np.round(dt).astype(int)
+
+        return
+
+    def sample_commute_to_work_dt(self, idx):
+
+        """
+        This function samples the commute to work duration and updates the commute to work start time.
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        dt = sample_truncnorm(self.commute_to_work_dt_mean[idx], self.commute_to_work_dt_std[idx], \
+                              occupation.COMMUTE_TO_WORK_DT_TRUNC, self.rng[idx])
+
+        self.commute_to_work_dt[idx]    = np.round(dt).astype(int)
+        self.commute_to_work_start[idx] = (self.work_start[idx] - self.commute_to_work_dt[idx]) \
+                                          % temporal.DAY_2_MIN
+
+        return
+
+    def sample_meal(self, idx, m, day):
+
+        """
+        This function samples the start time and duration of a meal and sets the meal to occur on the \
+        given day (see :func:`meal.Meal.update`).
+
+        :param numpy.ndarray idx: the indices of the households
+        :param int m: the meal identifier
+        :param numpy.ndarray day: the day of the meal for each household
+
+        :return: None
+        """
+
+        DAY_2_MIN = temporal.DAY_2_MIN
+
+        t   = sample_truncnorm(self.meal_start_mean[idx, m], self.meal_start_std[idx, m], \
+                               self.meal_start_trunc[idx, m], self.rng[idx])
+        dt  = sample_truncnorm(self.meal_dt_mean[idx, m], self.meal_dt_std[idx, m], self.meal_dt_trunc[idx, m], \
+                               self.rng[idx])
+
+        self.meal_start[idx, m]         = np.round(t).astype(int) % DAY_2_MIN
+        self.meal_dt[idx, m]            = np.round(dt).astype(int)
+        self.meal_start_univ[idx, m]    = day * DAY_2_MIN + self.meal_start[idx, m]
+        self.meal_day[idx, m]           = day
+
+        return
+
+    def sample_sleep(self, idx):
+
+        """
+        This function samples the sleep start time and end time (see :func:`bio.Bio.update_sleep_start` \
+        and :func:`bio.Bio.update_sleep_end`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        DAY_2_MIN = temporal.DAY_2_MIN
+
+        t_start = sample_truncnorm(self.sleep_start_mean[idx], self.sleep_start_std[idx], bio.SLEEP_START_TRUNC, \
+                                   self.rng[idx])
+        t_end   = sample_truncnorm(self.sleep_end_mean[idx], self.sleep_end_std[idx], bio.SLEEP_END_TRUNC, \
+                                   self.rng[idx])
+
+        self.sleep_start[idx]   = np.round(t_start).astype(int) % DAY_2_MIN
+        self.sleep_end[idx]     = np.round(t_end).astype(int) % DAY_2_MIN
+        self.sleep_dt[idx]      = (self.sleep_end[idx] - self.sleep_start[idx] + 1) % DAY_2_MIN
+
+        return
+
+    def sample_work(self, idx):
+
+        """
+        This function samples the work start time and end time (see :func:`occupation.Occupation.update_work_start` \
+        and :func:`occupation.Occupation.update_work_end`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        DAY_2_MIN = temporal.DAY_2_MIN
+
+        t_start = sample_truncnorm(self.work_start_mean[idx], self.work_start_std[idx], occupation.WORK_START_TRUNC, \
+                                   self.rng[idx])
+        t_end   = sample_truncnorm(self.work_end_mean[idx], self.work_end_std[idx], occupation.WORK_END_TRUNC, \
+                                   self.rng[idx])
+
+        self.work_start[idx]    = np.round(t_start).astype(int) % DAY_2_MIN
+        self.work_end[idx]      = np.round(t_end).astype(int) % DAY_2_MIN
+
+        # update the commute to work start time and the day to start
+        self.commute_to_work_start[idx] = (self.work_start[idx] - self.commute_to_work_dt[idx]) % DAY_2_MIN
+        self.day_start[idx]             = self.day_start[idx] + 1
+
+        return
+
+    def start_activity(self, idx, act_id):
+
+        """
+        This function starts an activity.
+
+        :param numpy.ndarray idx: the indices of the households
+        :param int act_id: the activity identifier
+
+        :return: None
+        """
+
+        if act_id == activity.WORK:
+            self.start_work(idx)
+
+        elif act_id == activity.SLEEP:
+            self.start_sleep(idx)
+
+        elif act_id in (activity.COMMUTE_TO_WORK, activity.COMMUTE_FROM_WORK):
+            self.start_commute(idx, act_id)
+
+        else:
+            self.start_meal(idx, ACTIVITY_2_MEAL[act_id])
+
+        self.act[idx] = act_id
+
+        return
+
+    def start_commute(self, idx, act_id):
+
+        """
+        This function starts the commute to work or the commute from work (see \
+        :func:`commute.Commute.start_commute` and :func:`commute.Commute_To_Work.start_commute`).
+
+        :param numpy.ndarray idx: the indices of the households
+        :param int act_id: the activity identifier
+
+        :return: None
+        """
+
+        # the duration of the commute
+        if act_id == activity.COMMUTE_TO_WORK:
+            dt = self.commute_to_work_dt[idx]
+        else:
+            dt = self.commute_from_work_dt[idx]
+
+        self.status[idx]        = state.TRANSIT
+        self.local[idx]         = location.TRANSIT
+
+        # the start time and end time of the commute
+        self.t_act_start[idx]   = self.t[idx]
+        self.t_act_end[idx]     = self.t[idx] + dt
+
+        # update the schedule
+        self.update_schedule(idx, need.TRAVEL, dt)
+
+        if act_id == activity.COMMUTE_TO_WORK:
+            self.update_schedule(idx, need.INCOME, dt)
+
+        return
+
+    def start_meal(self, idx, m):
+
+        """
+        This function starts eating a meal (see :func:`eat.Eat.start_meal`).
+
+        :param numpy.ndarray idx: the indices of the households
+        :param int m: the meal identifier
+
+        :return: None
+        """
+
+        DAY_2_MIN   = temporal.DAY_2_MIN
+        HUNGER      = need.HUNGER
+
+        # set the current meal
+        self.meal_day[idx, m]   = self.t[idx] // DAY_2_MIN
+        self.current_meal[idx]  = m
+
+        self.status[idx] = state.BUSY
+
+        # hunger does not decay while eating
+        self.hunger_decay[idx] = 0.0
+
+        # the recharge rate used to calculate the end time
+        if self.initial_step:
+            rate = self.hunger_recharge[idx]
+        else:
+            rate = (1.0 - self.threshold) / self.meal_dt[idx, m]
+
+        # the amount of time it takes to eat the meal until fully satisfied
+        with np.errstate(divide='ignore', invalid='ignore'):
+            dt = np.round( (1.0 - self.mag[idx, HUNGER]) / rate ).astype(int)
+
+        self.t_act_start[idx]   = self.t[idx]
+        self.t_act_end[idx]     = self.t[idx] + dt
+
+        # set the recharge rate
+        self.hunger_recharge[idx] = (1.0 - self.mag[idx, HUNGER]) / (dt + 1)
+
+        self.update_schedule(idx, HUNGER, dt)
+
+        return
+
+    def start_sleep(self, idx):
+
+        """
+        This function starts the sleep activity (see :func:`sleep.Sleep.start_sleep`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        DAY_2_MIN   = temporal.DAY_2_MIN
+        REST        = need.REST
+
+        self.status[idx] = state.SLEEP
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+
+            # changing the suggested rate makes sure the person sleeps in
+            if self.initial_step:
+                rate = self.rest_recharge[idx]
+            else:
+                dt = (self.sleep_end[idx] - self.t[idx] % DAY_2_MIN) % DAY_2_MIN
+                self.rest_suggested[idx] = (1.0 - self.threshold) / dt
+                rate = self.rest_suggested[idx]
+
+            # the length of sleep
+            dt = np.round( (1.0 - self.mag[idx, REST]) / rate ).astype(int)
+
+        self.t_act_start[idx]   = self.t[idx]
+        self.t_act_end[idx]     = self.t[idx] + dt
+
+        # the duration of the sleep event
+        dt = dt + 1
+
+        # set the recharge rate
+        self.rest_recharge[idx] = (1.0 - self.mag[idx, REST]) / dt
+
+        # set the schedule to the wake up time
+        self.update_schedule(idx, REST, dt)
+
+        return
+
+    def start_work(self, idx):
+
+        """
+        This function starts the work activity (see :func:`work.Work.start_work`).
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        DAY_2_MIN = temporal.DAY_2_MIN
+
+        t                   = self.t[idx]
+        day, time_of_day    = np.divmod(t, DAY_2_MIN)
+
+        self.local[idx]     = location.OFF_SITE
+        self.status[idx]    = state.WORK
+
+        # the start time and end time of work
+        dt = (self.work_end[idx] - time_of_day) % DAY_2_MIN
+
+        self.t_act_start[idx]   = t
+        self.t_act_end[idx]     = t + dt
+
+        # update the schedule
+        self.update_schedule(idx, need.INCOME, dt)
+        self.update_schedule(idx, need.TRAVEL, dt)
+
+        # update the interruption schedule for lunch
+        dt = self.meal_start[idx, meal.LUNCH] - time_of_day
+        dt = np.where(dt < 0, 1, dt)
+
+        self.update_schedule(idx, need.INTERRUPTION, dt)
+
+        # set the day for the current work period
+        self.day_start[idx] = day
+
+        return
+
+    def stop_work_to_eat(self, idx):
+
+        """
+        This function checks to see if an interruption should occur to allow a person to stop \
+        working in order to eat lunch (see :func:`interruption.Interruption.stop_work_to_eat`). \
+        This requires that
+
+        #. the person is hungry
+        #. the current activity is work
+        #. it is lunch time
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        is_hungry   = self.is_under_threshold(self.mag[idx, need.HUNGER])
+        is_working  = self.act[idx] == activity.WORK
+        is_lunch    = self.is_lunch_time(idx)
+
+        do_interrupt = is_hungry & is_working & is_lunch
+
+        self.mag[idx, need.INTERRUPTION]    = np.where(do_interrupt, need.MAG_INTERRUPTION, 1.0)
+        self.do_interruption[idx]           = do_interrupt
+
+        self.interrupt_start[ idx[do_interrupt] ] = activity.EAT_LUNCH
+
+        return
+
+    def update_clock(self, idx, t):
+
+        """
+        This function sets the time of each household and stores the time in the history.
+
+        :param numpy.ndarray idx: the indices of the households
+        :param numpy.ndarray t: the new time for each household [minutes, universal time]
+
+        :return: None
+        """
+
+        self.t[idx]     = t
+        self.step[idx]  = self.step[idx] + 1
+
+        # make sure the history buffers are large enough
+        if len(idx) > 0:
+
+            num = self.step[idx].max() + 1 - len(self.hist_time)
+
+            if num > 0:
+                num = max(num, temporal.HIST_CHUNK)
+
+                self.hist_time      = mg.grow_array(self.hist_time, num, -1)
+                self.hist_activity  = mg.grow_array(self.hist_activity, num, activity.NO_ACTIVITY)
+                self.hist_local     = mg.grow_array(self.hist_local, num, location.HOME)
+
+        self.hist_time[self.step[idx], idx] = t
+
+        return
+
+    def update_history(self, idx):
+
+        """
+        This function stores the current activity and location of each person in the history.
+
+        :param numpy.ndarray idx: the indices of the households
+
+        :return: None
+        """
+
+        # the activity (no activity when idle)
+        act = np.where(self.status[idx] == state.IDLE, activity.NO_ACTIVITY, self.act[idx])
+
+        self.hist_activity[self.step[idx], idx] = act
+        self.hist_local[self.step[idx], idx]    = self.local[idx]
+
+        return
+
+    def update_schedule(self, idx, id_need, dt):
+
+        """
+        This function updates the schedule for a given need (see :func:`scheduler.Scheduler.update`).
+
+        :param numpy.ndarray idx: the indices of the households
+        :param int id_need: the need identifier
+        :param numpy.ndarray dt: the duration to the next event for each household [minutes]
+
+        :return: None
+        """
+
+        self.A[idx, id_need] = self.t[idx] + dt
+
+        return
+
+# ===============================================
+# functions
+# ===============================================
+
+def get_std_dt(lower, mu, std, x_min):
+
+    """
+    This function gets the standard deviation of a duration distribution subject to a lowest value \
+    (see :func:`my_globals.set_distribution_dt`).
+
+    :param lower: the lower bound in number of standard deviation from the mean
+    :param numpy.ndarray mu: the mean
+    :param numpy.ndarray std: the standard deviation
+    :param int x_min: the lowest allowed value
+
+    :return: the standard deviation of the distribution
+    :rtype: numpy.ndarray
+    """
+
+    # the lowest value assuming a truncated normal distribution
+    y_min = mu - lower * std
+
+    # change the standard deviation if the lowest value is smaller than the lowest allowed value
+    with np.errstate(divide='ignore', invalid='ignore'):
+        the_std = np.where( y_min < x_min, np.floor( (mu - x_min) / lower ), std )
+
+    return the_std
+
+def sample_truncnorm(mu, std, trunc, rngs=None):
+
+    """
+    This function samples a truncated normal distribution for each entry. The distribution is truncated \
+    at the given number of standard deviations from the mean. Each entry is sampled by inverting the \
+    cumulative distribution function at a uniform random number drawn from the random number generator \
+    of the entry.
+
+    :param numpy.ndarray mu: the mean
+    :param numpy.ndarray std: the standard deviation
+    :param trunc: the number of standard deviations in the distribution
+    :type trunc: float or numpy.ndarray
+    :param numpy.ndarray rngs: the random number generator (numpy.random.Generator) of each entry. If None \
+    (or if an entry is None), the *numpy.random* random number generator is used
+
+    :return: the samples
+    :rtype: numpy.ndarray
+    """
+
+    mu = np.asarray(mu, dtype=float)
+
+    if mu.size == 0:
+        x = mu.copy()
+    else:
+        # a uniform random number for each entry
+        if rngs is None:
+            u = np.random.random(mu.shape)
+        else:
+            u = np.array( [ mg.get_rng(rng).random() for rng in rngs ] )
+
+        # sample the standard truncated normal distribution
+        trunc   = np.broadcast_to(trunc, mu.shape)
+        z       = stats.truncnorm.ppf(u, -trunc, trunc)
+
+        x       = mu + std * z
+
+    return x
+
+def score_need(n_now, n_later, ok):
+
+    """
+    This function calculates the advertised score of addressing a need (see \
+    :func:`activity.Activity.advertise`).
+
+    .. math::
+        S = W( n(t) ) - W( n(t + \\Delta{t}) )
+
+    where :math:`W(n)` is the weight function of the need (see :func:`need.Need.weight`).
+
+    :param numpy.ndarray n_now: the current satiation
+    :param numpy.ndarray n_later: the satiation after the activity is done
+    :param numpy.ndarray ok: a flag indicating whether the activity is advertised. If False, the score is 0.
+
+    :return: the score
+    :rtype: numpy.ndarray
+    """
+
+    weight  = lambda n: 1.0 / (n + need.EPS)
+
+    score   = np.where( ok, weight(n_now) - weight(n_later), 0.0 )
+
+    return score
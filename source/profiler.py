@@ -0,0 +1,308 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module contains code that measures where the time goes while the universe runs the simulation \
+(:func:`universe.Universe.run`). The measurements are optional. If the universe has no profiler \
+(the default), nothing is measured.
+
+At each stop of the scheduler, the universe does the following phases:
+
+#. check for expired activities (:const:`CHECK_EXPIRED`)
+#. address the needs not due to interruptions (:const:`ADDRESS_NEEDS`)
+#. decay the interruption (:const:`DECAY_INTERRUPTION`)
+#. address the needs due to interruptions (:const:`ADDRESS_INTERRUPTIONS`)
+#. update the history (:const:`UPDATE_HISTORY`)
+#. find the next event time in the scheduler (:const:`NEXT_EVENT`)
+#. decay the needs (:const:`DECAY_NEEDS`)
+
+The profiler accumulates the wall time of each phase. For the phases that are done for each person \
+separately, the wall time is also accumulated for each person. The time spent making advertisements \
+(:const:`ADVERTISE`) is part of the time spent addressing the needs and is accumulated for each person.
+
+The profiler also counts the following:
+
+#. the number of stops of the scheduler
+#. the number of advertisements made (for each person)
+#. the number of iterations of the recursion that assigns activities (see :func:`universe.Universe.address_needs`)
+
+The last step of the simulation (after the last stop of the scheduler) is not measured. The profilers \
+from many simulations are combined with :func:`profiler.combine`.
+
+This module contains class :class:`profiler.Profiler`.
+"""
+
+# ===============================================
+# import
+# ===============================================
+
+# general math capability
+import numpy as np
+
+# ===============================================
+# constants
+# ===============================================
+
+# the phases of a stop of the scheduler
+CHECK_EXPIRED           = 0
+ADDRESS_NEEDS           = 1
+DECAY_INTERRUPTION      = 2
+ADDRESS_INTERRUPTIONS   = 3
+UPDATE_HISTORY          = 4
+NEXT_EVENT              = 5
+DECAY_NEEDS             = 6
+ADVERTISE               = 7
+
+# the number of phases
+NUM_PHASES = 8
+
+# the phases that are done for each person separately
+PERSON_PHASES = [CHECK_EXPIRED, DECAY_INTERRUPTION, UPDATE_HISTORY, DECAY_NEEDS, ADVERTISE]
+
+# This dictionary takes the INTEGER representation of a phase and
+# returns the STRING representation
+INT_2_STR = {
+    CHECK_EXPIRED: 'check_expired',
+    ADDRESS_NEEDS: 'address_needs',
+    DECAY_INTERRUPTION: 'decay_interruption',
+    ADDRESS_INTERRUPTIONS: 'address_interruptions',
+    UPDATE_HISTORY: 'update_history',
+    NEXT_EVENT: 'next_event',
+    DECAY_NEEDS: 'decay_needs',
+    ADVERTISE: 'advertise',
+}
+
+# ===============================================
+# class Profiler
+# ===============================================
+
+class Profiler(object):
+
+    """
+    This class accumulates the measurements of the simulation of a household (or the combined \
+    measurements of many households).
+
+    :param int num_people: the number of people in the household
+
+    :var int num_hhld: the number of households measured
+    :var int num_people: the number of people in the household
+    :var int num_stops: the number of stops of the scheduler
+    :var int num_ads: the number of advertisements made
+    :var int max_ads: the maximum number of advertisements made in a stop
+    :var int num_recursion: the number of iterations of the recursion that assigns activities
+    :var int max_recursion: the maximum number of iterations of the recursion in a stop
+    :var numpy.ndarray num_ads_person: the number of advertisements made to each person
+    :var numpy.ndarray time: the wall time [s] of each phase
+    :var numpy.ndarray time_person: the wall time [s] of each phase (row) for each person (column). \
+    Only the phases in :const:`PERSON_PHASES` are measured for each person
+    """
+
+    def __init__(self, num_people):
+
+        # the number of households
+        self.num_hhld       = 1
+
+        # the number of people per household
+        self.num_people     = num_people
+
+        # the number of stops of the scheduler
+        self.num_stops      = 0
+
+        # the number of advertisements
+        self.num_ads        = 0
+        self.max_ads        = 0
+
+        # the number of iterations of the recursion
+        self.num_recursion  = 0
+        self.max_recursion  = 0
+
+        # the counts for the current stop
+        self.stop_ads       = 0
+        self.stop_recursion = 0
+
+        # the number of advertisements to each person
+        self.num_ads_person = np.zeros(num_people, dtype=int)
+
+        # the wall time of each phase and of each phase per person
+        self.time           = np.zeros(NUM_PHASES)
+        self.time_person    = np.zeros( (NUM_PHASES, num_people) )
+
+        return
+
+    def add_ads(self, idx, n, dt):
+
+        """
+        This function records the advertisements made to a person.
+
+        :param int idx: the index of the person
+        :param int n: the number of advertisements
+        :param float dt: the wall time [s] to make the advertisements
+
+        :return: None
+        """
+
+        self.stop_ads               = self.stop_ads + n
+        self.num_ads_person[idx]    = self.num_ads_person[idx] + n
+
+        self.add_time(ADVERTISE, dt, idx)
+
+        return
+
+    def add_recursion(self, n):
+
+        """
+        This function records the number of iterations of the recursion that assigns activities.
+
+        :param int n: the number of iterations
+
+        :return: None
+        """
+
+        self.stop_recursion = self.stop_recursion + n
+
+        return
+
+    def add_time(self, phase, dt, idx=None):
+
+        """
+        This function accumulates the wall time of a phase.
+
+        :param int phase: the phase
+        :param float dt: the wall time [s]
+        :param int idx: the index of the person. If None, the phase is done for the household
+
+        :return: None
+        """
+
+        self.time[phase] = self.time[phase] + dt
+
+        if idx is not None:
+            self.time_person[phase, idx] = self.time_person[phase, idx] + dt
+
+        return
+
+    def end_stop(self):
+
+        """
+        This function is called at the end of a stop of the scheduler. The counts for the stop are \
+        added to the totals.
+
+        :return: None
+        """
+
+        self.num_stops      = self.num_stops + 1
+
+        self.num_ads        = self.num_ads + self.stop_ads
+        self.max_ads        = max(self.max_ads, self.stop_ads)
+
+        self.num_recursion  = self.num_recursion + self.stop_recursion
+        self.max_recursion  = max(self.max_recursion, self.stop_recursion)
+
+        self.stop_ads, self.stop_recursion = 0, 0
+
+        return
+
+    def get_report(self):
+
+        """
+        This function returns the measurements as a dictionary (of numbers, strings, and lists) \
+        that may be saved as JSON.
+
+        :return: the measurements
+        :rtype: dict
+        """
+
+        # the average over the stops
+        f = lambda x: x / self.num_stops if self.num_stops > 0 else 0.0
+
+        report = {'num_hhld': self.num_hhld,
+                  'num_people': self.num_people,
+                  'num_stops': self.num_stops,
+                  'num_ads': {'total': int(self.num_ads), 'mean': f(self.num_ads), 'max': int(self.max_ads), \
+                              'person': self.num_ads_person.tolist()},
+                  'num_recursion': {'total': int(self.num_recursion), 'mean': f(self.num_recursion), \
+                                    'max': int(self.max_recursion)},
+                  'time': { INT_2_STR[k]: float(self.time[k]) for k in range(NUM_PHASES) },
+                  'time_person': { INT_2_STR[k]: self.time_person[k].tolist() for k in PERSON_PHASES },
+                  }
+
+        return report
+
+    def toString(self):
+
+        """
+        This function represents the profiler as a string. The percentage of each phase is relative to the \
+        total wall time of the stops. Since advertising is part of addressing the needs, the percentages \
+        do not add to 100%.
+
+        :return: the string representation
+        :rtype: str
+        """
+
+        x = self.get_report()
+
+        msg = ''
+        msg = msg + 'households: %d\tpeople per household: %d\n' % (x['num_hhld'], x['num_people'])
+        msg = msg + 'scheduler stops: %d\n' % x['num_stops']
+        msg = msg + 'advertisements: %d\t(%.2f per stop, max %d)\n' \
+              % (x['num_ads']['total'], x['num_ads']['mean'], x['num_ads']['max'])
+        msg = msg + 'recursion iterations: %d\t(%.2f per stop, max %d)\n' \
+              % (x['num_recursion']['total'], x['num_recursion']['mean'], x['num_recursion']['max'])
+
+        # the total wall time of the phases of a stop. Advertising is part of addressing the needs
+        total = self.time.sum() - self.time[ADVERTISE]
+
+        for k in range(NUM_PHASES):
+
+            pct = 100 * self.time[k] / total if total > 0 else 0.0
+            msg = msg + '%-24s %10.4f [s]\t%5.1f%%\n' % (INT_2_STR[k], self.time[k], pct)
+
+        return msg
+
+# ===============================================
+# functions
+# ===============================================
+
+def combine(profilers):
+
+    """
+    This function combines the measurements of many simulations into one profiler. The measurements \
+    for each person are combined by the index of the person in the household.
+
+    :param profilers: the profilers of each simulation. Entries that are None are skipped
+    :type profilers: list of :class:`profiler.Profiler`
+
+    :return: the combined measurements. If there are no profilers, None is returned
+    :rtype: profiler.Profiler
+    """
+
+    profilers = [x for x in profilers if x is not None]
+
+    if len(profilers) == 0:
+        return None
+
+    # the largest household
+    num_people = max( [x.num_people for x in profilers] )
+
+    y = Profiler(num_people)
+
+    y.num_hhld          = sum( [x.num_hhld for x in profilers] )
+    y.num_stops         = sum( [x.num_stops for x in profilers] )
+    y.num_ads           = sum( [x.num_ads for x in profilers] )
+    y.max_ads           = max( [x.max_ads for x in profilers] )
+    y.num_recursion     = sum( [x.num_recursion for x in profilers] )
+    y.max_recursion     = max( [x.max_recursion for x in profilers] )
+
+    for x in profilers:
+
+        y.time                              = y.time + x.time
+        y.num_ads_person[:x.num_people]     = y.num_ads_person[:x.num_people] + x.num_ads_person
+        y.time_person[:, :x.num_people]     = y.time_person[:, :x.num_people] + x.time_person
+
+    return y
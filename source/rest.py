@@ -257,7 +257,8 @@ class Rest(need.Need):
             * :math:`\\Delta{t}` is the duration of time from now until the future time
                     given by future_clock
 
-        :param temporal.Temporal future_clock: a clock corresponding to a future time
+        :param future_clock: a clock corresponding to a future time
+        :type future_clock: temporal.Temporal or temporal.Time_Point
 
         :return: the perceived rest level
         :rtype: float
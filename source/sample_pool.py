@@ -0,0 +1,147 @@
+# The United States Environmental Protection Agency through its Office of
+# Research and Development has developed this software. The code is made
+# publicly available to better communicate the research. All input data
+# used fora given application should be reviewed by the researcher so
+# that the model results are based on appropriate data for any given
+# application. This model is under continued development. The model and
+# data included herein do not represent and should not be construed to
+# represent any Agency determination or policy.
+
+"""
+This module contains code that samples a probability distribution in blocks.
+
+Sampling a :mod:`scipy.stats` distribution one value at a time has a large overhead per call. The \
+sample pool draws a whole block of values at once and hands them out in order. The values are drawn \
+from the pool's random number generator (a :class:`numpy.random.Generator`), if it is set. Otherwise, the \
+values are drawn from the *numpy.random* random number generator, so seeding with \
+:func:`my_globals.initialize_random_number_generator` keeps the results reproducible.
+
+This module contains class :class:`sample_pool.Sample_Pool`.
+"""
+
+# ===============================================
+# import
+# ===============================================
+
+# general math capability
+import numpy as np
+
+# ===============================================
+# class Sample_Pool
+# ===============================================
+
+class Sample_Pool(object):
+
+    """
+    This class holds a block of samples from a probability distribution. Calling the object returns the \
+    next samples in the block. When the block runs out, a new block is drawn.
+
+    The object is called in the same way as the :func:`rvs` function of a frozen :mod:`scipy.stats` \
+    distribution (i.e., f(1)[0] returns a single sample).
+
+    :param dist: the (frozen) distribution to sample from
+    :param int num_samples: the number of samples to draw in a block
+    :param numpy.random.Generator rng: the random number generator. If None, the *numpy.random* random \
+    number generator is used
+
+    :var dist: the (frozen) distribution to sample from
+    :var int num_samples: the number of samples to draw in a block
+    :var numpy.random.Generator rng: the random number generator
+    :var numpy.ndarray samples: the current block of samples
+    :var int idx: the index of the next sample to hand out
+    """
+
+    def __init__(self, dist, num_samples=1, rng=None):
+
+        # the distribution
+        self.dist           = dist
+
+        # the random number generator
+        self.rng            = rng
+
+        # the size of each block of samples
+        self.num_samples    = max( int(num_samples), 1 )
+
+        # the block of samples is drawn on first use
+        self.samples        = np.zeros(0)
+        self.idx            = 0
+
+        return
+
+    def __call__(self, n=1):
+
+        """
+        This function returns the next samples from the pool.
+
+        :param int n: the number of samples
+        :return: the samples
+        :rtype: numpy.ndarray
+        """
+
+        return self.draw(n)
+
+    def draw(self, n=1):
+
+        """
+        This function returns the next samples from the pool. If there are not enough samples left in \
+        the block, a new block is drawn.
+
+        :param int n: the number of samples
+        :return: the samples
+        :rtype: numpy.ndarray
+        """
+
+        # draw a new block if the current block does not have enough samples
+        if (self.idx + n > len(self.samples)):
+            self.refill(n)
+
+        # the samples to hand out
+        x = self.samples[self.idx:self.idx + n]
+
+        # update the index of the next sample
+        self.idx = self.idx + n
+
+        return x
+
+    def refill(self, n=1):
+
+        """
+        This function draws a new block of samples. The unused samples in the old block are kept so \
+        that the sequence of samples does not skip any values.
+
+        :param int n: the minimum number of samples needed
+        :return: None
+        """
+
+        # the unused samples
+        x_old = self.samples[self.idx:]
+
+        # the size of the new block
+        num = max(self.num_samples, n - len(x_old))
+
+        # draw the new samples
+        x_new = np.atleast_1d( self.dist.rvs(size=num, random_state=self.rng) )
+
+        self.samples    = np.concatenate( (x_old, x_new) )
+        self.idx        = 0
+
+        return
+
+    def set_rng(self, rng):
+
+        """
+        This function sets the random number generator. The unused samples in the current block are \
+        discarded so that every following sample is drawn from the new random number generator.
+
+        :param numpy.random.Generator rng: the random number generator. If None, the *numpy.random* \
+        random number generator is used
+        :return: None
+        """
+
+        self.rng        = rng
+
+        # discard the unused samples
+        self.samples    = np.zeros(0)
+        self.idx        = 0
+
+        return
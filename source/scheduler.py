@@ -35,6 +35,9 @@ This module contains class :class:`scheduler.Scheduler`.
 # general math capability
 import numpy as np
 
+# priority queue capability
+import heapq
+
 # agent-based model module
 import need
 
@@ -49,6 +52,11 @@ class Scheduler(object):
     stopping at only potentially relevant time steps. The scheduler keeps track of the needs for every person in \
     in the household and stops at time steps where any person should have an action / need that needs to be \
     addressed.
+
+    The scheduled times are stored in the schedule matrix and in a priority queue (a binary heap) ordered by \
+    time. Updating the schedule for a person-need combination pushes a new entry onto the heap, which is \
+    :math:`O(\\log{n})`. Entries that are outdated (i.e., the person-need combination has been rescheduled \
+    since the entry was pushed) or in the past are discarded when searching for the next event.
     
     
     :param temporal.Temporal clock: the time
@@ -57,6 +65,7 @@ class Scheduler(object):
     :var temporal.Temporal clock: the time
     :var numpy.ndarray A: the schedule matrix of dimension (number of people x number of needs). This matrix \
     contains the times [minutes, universal time] that the simulation should not skip over
+    :var list heap: the priority queue of (time, person identifier, need identifier) entries
     :var int dt: the duration of time between events
     :var int t_old: the time [minutes, universal time] of the prior event
     :var bool do_minute_by_minute: this flag controls whether the schedule should either \
@@ -71,6 +80,10 @@ class Scheduler(object):
         # the times when a need should be threshold in absolute time or an activity ends
         self.A = np.inf * np.ones( (num_people, need.N) )
 
+        # the priority queue of the scheduled times
+        self.heap = list()
+        self.set_heap()
+
         # the duration of time between events
         self.dt = 0
 
@@ -85,10 +98,9 @@ class Scheduler(object):
     def get_next_event_time(self):
 
         """
-        This function searches the schedule matrix and finds the next time that that model should handle.
-        
-        .. note::
-            This function is only capable of handling **single-occupancy** households.
+        This function searches the schedule and finds the next time that that model should handle. The \
+        next time is the earliest scheduled time, over all people and needs in the household, that is \
+        after the current time. If there is no such time, the next time is one minute after the current time.
             
         :return: the next time [minutes, time of day] that the model should address
         :rtype: int
@@ -97,50 +109,32 @@ class Scheduler(object):
         # the current time
         t_now = self.clock.t_univ
 
-        # get the minimum time per person (minimum time for each row)
-        num_people = self.A.shape[0]
+        # the priority queue
+        heap = self.heap
 
-        # the data for times that are the minimum times
-        A = self.A
+        # discard the entries that are outdated or that are not after the current time
+        while heap and ( (heap[0][0] <= t_now) or (self.A[heap[0][1], heap[0][2]] != heap[0][0]) ):
+            heapq.heappop(heap)
 
-        if (num_people == 1):
+        #
+        # move minute by minute
+        #
+        if self.do_minute_by_minute:
+            t_next  = t_now + 1
 
-            # find the relevant indices
-            # i.e. get indices of times greater than the current time
-            idx = A > t_now
+        #
+        # jump forward in time
+        #
+        else:
 
-            #
-            # move minute by minute
-            #
-            if self.do_minute_by_minute:
-                t_next  = t_now + 1
+            # if there is a time greater than the current time
+            if heap:
+                # get the next event time
+                t_next = heap[0][0]
 
-            #
-            # jump forward in time
-            #
             else:
-
-                # if there is a time greater than the current time
-                if idx.any():
-                    # get the next event time
-                    t_next = np.min(A[idx])
-
-                else:
-                    # nothing scheduled should happen, increase the time by 1
-                    t_next = t_now + 1
-
-                # this makes sure that we do not stay in a time loop
-                if (t_next == t_now):
-                    t_next = t_now + 1
-
-            #
-            # update the old scheduled event times
-            #
-            A[idx == False] = t_next
-
-        else:
-            print('\nscheduler.get_next_event_time() is NOT calibrated for populations greater than 1!\n\n')
-            t_next = t_now + 1
+                # nothing scheduled should happen, increase the time by 1
+                t_next = t_now + 1
 
         # update the duration until the next activity from now
         self.dt     = t_next - t_now
@@ -150,6 +144,38 @@ class Scheduler(object):
 
         return t_next
 
+    def reset(self):
+
+        """
+        This function clears the schedule so that the scheduler can be used in a new simulation.
+
+        :return: None
+        """
+
+        self.A[:]   = np.inf
+        self.set_heap()
+
+        self.dt     = 0
+        self.t_old  = self.clock.t_univ
+
+        return
+
+    def set_heap(self):
+
+        """
+        This function builds the priority queue from the schedule matrix.
+
+        :return: None
+        """
+
+        # the number of people and the number of needs
+        num_people, num_needs = self.A.shape
+
+        self.heap = [ (self.A[i, k], i, k) for i in range(num_people) for k in range(num_needs) ]
+        heapq.heapify(self.heap)
+
+        return
+
     def toString(self):
 
         """
@@ -176,6 +202,12 @@ class Scheduler(object):
         :return: None 
         """
 
-        self.A[id_person, id_need] = self.clock.t_univ + dt
+        # the time of the next event
+        t = self.A.dtype.type(self.clock.t_univ + dt)
+
+        self.A[id_person, id_need] = t
+
+        # add the event to the priority queue
+        heapq.heappush(self.heap, (t, id_person, id_need) )
 
         return
\ No newline at end of file
@@ -143,9 +143,7 @@ class Social(object):
 
             # is it time to commute from work
             t = max(0, clock.t_univ - self.job.commute_from_work_dt )
-            temp_clock = temporal.Temporal()
-            temp_clock.t_univ = t
-            temp_clock.set_time()
+            temp_clock = temporal.Time_Point(t)
             commute_from_work_time = occupation.is_work_time(temp_clock, self.job, is_commute_to_work=False)
 
             # if the agent is currently working, set the duration to be the length of time remaining at work
@@ -394,6 +392,21 @@ class Social(object):
 
         return msg
 
+    def reset(self):
+
+        """
+        This function resets the job and the meals so that they can be used in a new simulation.
+
+        :return: None
+        """
+
+        self.job.reset()
+
+        for m in self.meals:
+            m.reset()
+
+        return
+
     def set_child_flag(self, age):
 
         """
@@ -431,6 +444,24 @@ class Social(object):
         
         return
 
+    def set_rng(self, rng):
+
+        """
+        This function sets the random number generator used to sample the job and the meals.
+
+        :param numpy.random.Generator rng: the random number generator. If None, the *numpy.random* \
+        random number generator is used
+
+        :return: None
+        """
+
+        self.job.set_rng(rng)
+
+        for m in self.meals:
+            m.set_rng(rng)
+
+        return
+
     def set_work_alarm(self, dt=0):
 
         """
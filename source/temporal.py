@@ -14,8 +14,8 @@
 """
 This file contains code that handles the time related aspects of this code.
 
-This file contains code for class :class:`temporal.Temporal`. This file also \
-includes other functions that are accessed outside of the Temporal class.
+This file contains code for class :class:`temporal.Temporal` and class :class:`temporal.Time_Point`. \
+This file also includes other functions that are accessed outside of the Temporal class.
 
 .. moduleauthor:: Dr. Namdi Brandon
 """
@@ -57,6 +57,13 @@ SEASON_2_WEEK   = YEAR_2_WEEK // 4
 SEASON_2_DAY    = SEASON_2_WEEK * WEEK_2_DAY
 SEASON_2_MIN    = SEASON_2_DAY * DAY_2_MIN
 
+# the number of entries the history buffers grow by whenever they run out of room
+HIST_CHUNK          = 1024
+
+# a generous estimate of the number of events (time nodes) per person per day. This is used to size the \
+# history buffers before the simulation runs
+HIST_EVENTS_PER_DAY = 32
+
 # the seasons
 WINTER  = 0
 SPRING  = 1
@@ -98,6 +105,8 @@ class Temporal(object):
     Day 359 at 0:00 corresponds to a universal time of 359 * 24 * 60
 
     :param int t_univ: the time in universal time [minutes]
+    :param int num_sample_points: the initial number of entries in the time history. The history grows \
+    in chunks of :const:`HIST_CHUNK` if more entries are needed
 
     :var int day: the day number in the simulation
     :var int day_of_week: a number 0, 1, 2, ... 6 corresponding to days of the week where 0 is Sunday, 1 is \
@@ -114,6 +123,8 @@ class Temporal(object):
     :var int season: the season
     :var int tic: indicates that current tick (each tick corresponds to a step of size dt)
     :var int step: indicates the current step in the simulation [0, ... num_steps-1]
+    :var numpy.ndarray hist_time: the universal time [minutes] at each step in the simulation. Unused \
+    entries are set to -1
 
     """
     #
@@ -121,7 +132,7 @@ class Temporal(object):
     #
 
     # set the start time to Day 0 at midnight
-    def __init__(self, t_univ=0):
+    def __init__(self, t_univ=0, num_sample_points=HIST_CHUNK):
 
         self.t_univ         = t_univ
         self.dt             = 1
@@ -144,10 +155,25 @@ class Temporal(object):
         self.step           = 0
 
         # the history of the universal time [minutes]
-        self.hist_time      = -1 * np.ones( YEAR_2_MIN + 1, dtype=int)
+        self.hist_time      = -1 * np.ones( num_sample_points, dtype=np.int64)
 
         return
 
+    def grow_history(self):
+
+        """
+        This function increases the size of the time history by :const:`HIST_CHUNK` entries. The new \
+        entries are set to -1 (unused).
+
+        :return: None
+        """
+
+        # the unused entries to append to the history
+        x = -1 * np.ones(HIST_CHUNK, dtype=self.hist_time.dtype)
+
+        self.hist_time = np.concatenate( (self.hist_time, x) )
+
+        return
 
     def print_day_night(self):
 
@@ -360,6 +386,24 @@ class Temporal(object):
 
         return msg
 
+    def update_history(self):
+
+        """
+        This function stores the current universal time in the time history at the current step. If the \
+        history is full, it is grown before storing the time.
+
+        :return: None
+        """
+
+        # make room for the current step
+        if self.step >= len(self.hist_time):
+            self.grow_history()
+
+        # store the temporal history
+        self.hist_time[self.step] = self.t_univ
+
+        return
+
     def update_time(self):
 
         """
@@ -379,6 +423,76 @@ class Temporal(object):
 
         return
 
+# ===============================================
+# class Time_Point
+# ===============================================
+
+class Time_Point(object):
+
+    """
+    This class represents a single point in time. It has the same calendar information as \
+    :class:`temporal.Temporal` (e.g., the day, the day of the week, and the time of day), but it does \
+    not keep a time history and can not be changed after it is created.
+
+    This class is used for asking what the time will be at a future time (e.g., when perceiving \
+    the result of doing an activity) without creating a full :class:`temporal.Temporal` object.
+
+    :param int t_univ: the time in universal time [minutes]
+
+    :var int t_univ: the universal time [minutes]
+    :var int day: the day number in the simulation
+    :var int day_of_week: a number 0, 1, 2, ... 6 corresponding to days of the week where 0 is Sunday, 1 is \
+    Monday,  ... 6 is Saturday
+    :var int week_of_year: the week of the year
+    :var bool is_weekday: a flag indicating if it's a weekday (Monday-Friday) if True. False, otherwise.
+    :var int hour_of_day: the hour of the day [0, 23]
+    :var int min_of_day: the minute within the hour [0, 60 - 1]
+    :var int time_of_day: the time of the day [minutes], [0, 1, ... 24 * 60 -1]
+    :var bool is_day: a flag indicating if the time of day is after **dawn** and before **dusk** if True. \
+    False, otherwise.
+    :var int season: the season
+    """
+
+    __slots__ = ('t_univ', 'day', 'day_of_week', 'week_of_year', 'is_weekday', 'hour_of_day', 'min_of_day', \
+                 'time_of_day', 'is_day', 'season')
+
+    def __init__(self, t_univ=0):
+
+        # the day and the time of day
+        day, time_of_day = divmod(t_univ, DAY_2_MIN)
+
+        # the day of the week
+        day_of_week = day % 7
+
+        # the week of the year
+        week_of_year = (day // 7) % YEAR_2_WEEK
+
+        # set the values. The object is immutable, so the values can not be set the usual way
+        x = object.__setattr__
+
+        x(self, 't_univ', t_univ)
+        x(self, 'day', day)
+        x(self, 'day_of_week', day_of_week)
+        x(self, 'week_of_year', week_of_year)
+        x(self, 'is_weekday', not ( (day_of_week == SATURDAY) or (day_of_week == SUNDAY) ) )
+        x(self, 'hour_of_day', time_of_day // HOUR_2_MIN)
+        x(self, 'min_of_day', time_of_day % HOUR_2_MIN)
+        x(self, 'time_of_day', time_of_day)
+        x(self, 'is_day', (time_of_day >= DAWN) and (time_of_day < DUSK) )
+        x(self, 'season', week_of_year // SEASON_2_WEEK)
+
+        return
+
+    def __setattr__(self, key, value):
+
+        """
+        This function prevents the time point from being changed.
+
+        :raises AttributeError: always
+        """
+
+        raise AttributeError('Time_Point is immutable')
+
 def convert_cyclical_to_decimal(t):
 
     """
@@ -451,6 +565,36 @@ def convert_universal_to_decimal(t_univ):
     
     return out
     
+def get_num_sample_points(num_steps, num_people, dt=1, do_minute_by_minute=False):
+
+    """
+    This function estimates the number of time nodes (entries in the history buffers) needed to \
+    run a simulation. The buffers still grow (in chunks of :const:`HIST_CHUNK`) if the estimate is \
+    too small.
+
+    :param int num_steps: the number of time steps in the simulation
+    :param int num_people: the number of people in the household
+    :param int dt: the step size in the simulation [minutes]
+    :param bool do_minute_by_minute: a flag indicating that the simulation stops at every time step if True
+
+    :return: the number of entries in the history buffers
+    :rtype: int
+    """
+
+    # the maximum possible number of time nodes (including the initial and the final step)
+    n_max = num_steps + 2
+
+    if do_minute_by_minute:
+        n = n_max
+    else:
+        # the number of (partial) days in the simulation
+        num_days = (num_steps * dt) // DAY_2_MIN + 1
+
+        # the expected number of events
+        n = min(num_days * max(num_people, 1) * HIST_EVENTS_PER_DAY + 1, n_max)
+
+    return int(n)
+
 def print_military_time(t):
 
     """
@@ -129,7 +129,8 @@ class Travel(need.Need):
 
         :Note: going to work can only happen according to work hours of the job.
 
-        :param temporal.Temporal clock: the time the need to travel is perceived
+        :param clock: the time the need to travel is perceived
+        :type clock: temporal.Temporal or temporal.Time_Point
         :param occupation.Occupation job: the job of the person
 
         :return mag: the perceived magnitude of the need
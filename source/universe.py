@@ -25,8 +25,11 @@ This module contains code that is responsible for running the simulation. This f
 # general mathematical capabilities
 import numpy as np
 
+# timing capability
+import time
+
 # agent-based module modules
-import activity, home, need, scheduler, state, temporal
+import activity, ad_board, home, need, profiler, scheduler, state, temporal
 
 # ===============================================
 # class Universe
@@ -49,6 +52,10 @@ class Universe(object):
     :var int t_start: the start time for the simulation [minutes, universal time]
     :var int t_end: the last time for the simulation [minutes, universal time]
     :var scheduler.Scheduler schedule: the schedule governing each agent's needs
+    :var numpy.random.Generator rng: the random number generator used to break ties when selecting \
+    activities. If None, the *numpy.random* random number generator is used
+    :var profiler.Profiler profiler: measures where the time goes in the simulation. If None (the default), \
+    nothing is measured
     """
 
     #
@@ -57,8 +64,11 @@ class Universe(object):
     #
     def __init__(self, num_steps, dt, t_start, num_people, do_minute_by_minute=False):
 
+        # the expected number of time nodes in the simulation (used to size the history buffers)
+        num_sample_points = temporal.get_num_sample_points(num_steps, num_people, dt, do_minute_by_minute)
+
         # create a clock.
-        self.clock          = temporal.Temporal()
+        self.clock          = temporal.Temporal(num_sample_points=num_sample_points)
         self.clock.dt       = dt
         self.clock.t_univ   = t_start
         self.clock.set_time()
@@ -79,6 +89,12 @@ class Universe(object):
         self.schedule = scheduler.Scheduler(clock=self.clock, num_people=num_people, \
                                             do_minute_by_minute=do_minute_by_minute)
 
+        # the random number generator
+        self.rng = None
+
+        # the (optional) measurements of the simulation
+        self.profiler = None
+
         return
 
 
@@ -99,6 +115,9 @@ class Universe(object):
         #. that Person starts the activity, thereby updating the state of available activities in the home
         #. the recursion starts again, where the Home advertises to all remaining Person(s)
 
+        The advertisements are stored in an :class:`ad_board.Ad_Board` so that, in each recursion, only the \
+        advertisements affected by the previous assignment are recalculated.
+
         :Note: If no activity will be done this time step to a person, a person is set to \
             the temporary status :const:`state.IDLE_TEMP`, so that the home knows not to advertise \
             to that person.
@@ -110,11 +129,14 @@ class Universe(object):
         :return: None
         """
 
+        # the stored advertisements for each Person
+        board = ad_board.Ad_Board(self.home, self.people, self.profiler)
+
         # this is the list of adds per Person AND the Person object
         # this will be Empty if NO ONE is able to do something.
         # Recall, a Person needs to be IDLE
         #
-        ads = self.advertise(do_interruption = do_interruption)
+        ads = self.advertise(do_interruption = do_interruption, board=board)
 
         # select the activity for each person by recursion
         # after each recursion, a Person does an activity; thereby,
@@ -137,7 +159,7 @@ class Universe(object):
             # person with the highest score
             ad = self.select_activity(ads)
 
-            (score, do_asset, do_activity, p) = ( ad['score'], ad['asset'], ad['activity'], ad['person'] )
+            (score, do_asset, do_activity, p) = ( ad.score, ad.asset, ad.activity, ad.person )
 
             # if the activity is useful (score > 0), do the activity
             if ( score > 0.0 ):
@@ -168,8 +190,11 @@ class Universe(object):
                 # BUT, remember to not re-look for advertisements (state.IDLE_TEMP)
                 p.state.status = state.IDLE_TEMP
 
+            # remove the advertisements that changed because of the chosen activity
+            board.update(p)
+
             # update the new choices, given the fact that a  is already chosen
-            ads = self.advertise(do_interruption = do_interruption)
+            ads = self.advertise(do_interruption = do_interruption, board=board)
 
             # update the total amount of ads
             N = total_ads(ads)
@@ -179,6 +204,10 @@ class Universe(object):
 
             counter = counter + 1
 
+        # count the iterations of the recursion
+        if self.profiler is not None:
+            self.profiler.add_recursion(counter)
+
         # OUTSIDE of recursion:
         # reset the state.IDLE_TEMP to state.IDLE
         for p in self.people:
@@ -187,7 +216,7 @@ class Universe(object):
 
         return
 
-    def advertise(self, do_interruption = False):
+    def advertise(self, do_interruption = False, board=None):
 
         """
         This function obtains a list of all of the possible activities each person could potentially start in \
@@ -196,10 +225,12 @@ class Universe(object):
 
         :param bool do_interruption: this flag indicates whether to make advertisements due to an \
         interrupting activity (if True) or not (if False).
+        :param ad_board.Ad_Board board: the stored advertisements. If None, all of the advertisements are \
+        calculated
 
-        :return ads: ads is a list of dictionaries for advertisements:
+        :return ads: ads is a list of advertisements for each person:
 
-                    Dictionary  (score, asset, activity, person) containing the various data for
+                    :class:`ad_board.Advertisement` (score, asset, activity, person) containing the various data for
                     each advertisement: (score, asset, activity, person) coupling where the data types \
                     are (float, :class:`asset.Asset`, :class:`activity.Activity`, :class:`person.Person`)
 
@@ -209,19 +240,23 @@ class Universe(object):
         # optimized way to get all of the advertisements
         # there is a list of ads for each person
 
+        # the stored advertisements
+        if board is None:
+            board = ad_board.Ad_Board(self.home, self.people)
+
         if (do_interruption):
 
             # advertise if the Interruption satiation is under the threshold value **and** the agent has not already \
             # been advertised to, indicated by p.state.status != state.IDLE_TEMP
             # state.IDLE_TEMP indicates that there was no activity for the agent to undergo at the current moment
-            ads = [ self.home.advertise(p, do_interruption = do_interruption) for p in self.people
+            ads = [ board.advertise(i, do_interruption = do_interruption) for i, p in enumerate(self.people)
                     if p.interruption.under_threshold(p.interruption.magnitude) and (p.state.status != state.IDLE_TEMP) ]
 
             # the total amount of ads advertised across all people
             N = lambda z: len( [item for sublist in z for item in sublist] )
 
             # handle the interruptions
-            x = np.array( [ item['score'] <= 0 for sublist in ads for item in sublist ] )
+            x = np.array( [ item.score <= 0 for sublist in ads for item in sublist ] )
             if x.all():
                 sam                             = self.people[0]
                 #sam.interruption.magnitude      = 1.0
@@ -242,21 +277,26 @@ class Universe(object):
 
         else:
             # advertise if the agent is idle
-            ads = [ self.home.advertise(p, do_interruption = do_interruption) for p in self.people
+            ads = [ board.advertise(i, do_interruption = do_interruption) for i, p in enumerate(self.people)
                     if (p.state.status == state.IDLE) ]
 
         return ads
 
-    def check_expired_activities(self):
+    def check_expired_activities(self, people=None):
 
         """
         This function checks for expired activities. If found, end the activities.
 
+        :param list people: the people to check. If None, every person in the universe is checked
+
         :return: None
         """
 
+        if people is None:
+            people = self.people
+
         # naturally expiring activity routine
-        for p in self.people:
+        for p in people:
 
             # check to see if an activity has ended
             # An activity ends if a Person is idle AND the current time is at least the
@@ -270,7 +310,26 @@ class Universe(object):
 
         return
 
-    def decay_needs(self, dt=None):
+    def decay_interruption(self, people=None):
+
+        """
+        This function decays the satiation for Interruption.
+
+        :param list people: the people whose Interruption decays. If None, the Interruption of every person in \
+        the universe decays
+
+        :return: None
+        """
+
+        if people is None:
+            people = self.people
+
+        for p in people:
+            p.interruption.decay(p)
+
+        return
+
+    def decay_needs(self, dt=None, people=None):
 
         """
         This function decays the needs according to the default behavior. That is, assume the needs are not \
@@ -278,6 +337,7 @@ class Universe(object):
 
         :param int dt: the number of minutes to decay the needs by. The default behavior is to use the scheduler's \
         time. If a number is specified, then it should be the number of minutes until the end of the simulation.
+        :param list people: the people whose needs decay. If None, the needs of every person in the universe decay
 
         :return: None
         """
@@ -289,7 +349,10 @@ class Universe(object):
         if dt is None:
             dt = self.schedule.dt
 
-        for p in self.people:
+        if people is None:
+            people = self.people
+
+        for p in people:
 
             # decay the major needs first
             p.rest.decay_new(p.state.status, dt)
@@ -329,7 +392,7 @@ class Universe(object):
         """
 
         # store the current time
-        self.clock.hist_time[0] = self.clock.t_univ
+        self.clock.update_history()
 
         # address needs due to interruptions
         #self.address_needs(do_interruption=True)
@@ -409,7 +472,7 @@ class Universe(object):
 
         return
 
-    def reset(self, t_univ):
+    def reset(self, t_univ, do_initialize=True):
 
         """
         This code resets the simulation by initializing the agents, home, and clock to the beginning status \
@@ -418,13 +481,19 @@ class Universe(object):
         This code does the following:
 
         #. reset the clock
+        #. reset the schedule
         #. reset the home
         #. reset each person
         #. initialize each person
         #. initialize the home
 
+        The last two steps are skipped if the agents are going to be re-parameterized before the \
+        simulation (see :mod:`universe_pool`).
+
         :param params.Params p: the parameters
         :param int t_univ: the time of the beginning of the simulation [seconds]
+        :param bool do_initialize: a flag indicating whether to initialize the agents and the home (if True) \
+        or to only reset them (if False)
         :return:
         """
 
@@ -435,6 +504,9 @@ class Universe(object):
         # reset the time
         self.clock.reset(t_univ)
 
+        # reset the schedule
+        self.schedule.reset()
+
         # parameters
 
         # reset the home and assets
@@ -448,18 +520,20 @@ class Universe(object):
         # initialize
         #
 
-        for p in self.people:
-            p.state.is_init = True
+        if do_initialize:
 
-        # initialize the needs
-        self.initialize_needs()
+            for p in self.people:
+                p.state.is_init = True
 
-        # initialize the home assets
-        self.home.initialize(self.people)
+            # initialize the needs
+            self.initialize_needs()
 
-        # set the home economics
-        self.home.set_revenue(self.people)
-        self.home.set_population(self.people)
+            # initialize the home assets
+            self.home.initialize(self.people)
+
+            # set the home economics
+            self.home.set_revenue(self.people)
+            self.home.set_population(self.people)
 
         return
 
@@ -490,6 +564,8 @@ class Universe(object):
         #. decay the needs for each agent
         #. update the history of the status of each agent
 
+        If the universe has a profiler, the steps at each stop of the scheduler are measured \
+        (see :func:`universe.Universe.step`).
 
         :return:
         """
@@ -501,11 +577,14 @@ class Universe(object):
         t_next = self.clock.t_univ
 
         # store a history of the time
-        self.clock.hist_time[self.clock.step] = self.clock.t_univ
+        self.clock.update_history()
 
         # the iterating variables: the current iteration and the maximum iterations in the loop, respectively
         i, N_MAX = 0, YEAR_2_MIN
 
+        # the (optional) measurements of the simulation
+        prof = self.profiler
+
         # while the current time is before the final time AND the iteration counter is under the maximum iteration
         # allowed
         while (t_next <= self.t_end) and (i < N_MAX):
@@ -513,43 +592,8 @@ class Universe(object):
             # if the current time is under the next scheduled time (in the scheduler) to stop the clock
             if self.clock.t_univ >= t_next:
 
-                # check for expired activities
-                # if they are found, end the activity
-                # set the Person to state: IDLE
-                self.check_expired_activities()
-
-                # address needs due to interruptions
-                #self.address_needs(do_interruption=True)
-
-                # address the needs NOT due to interruptions
-                self.address_needs(do_interruption=False)
-
-                # decay the interruption
-                for p in self.people:
-                    p.interruption.decay(p)
-
-                self.address_needs(do_interruption=True)
-
-                # update the history
-                self.update_history_new()
-
-                # get the next time
-                # need to add something about an interrupting event
-                # in the case that work and lunch start simultaneously
-                t_next = self.schedule.get_next_event_time()
-
-                # update the clock and decay the needs for the next time
-                if (t_next <= self.t_end):
-
-                    # update the clock for the next time step
-                    self.update_clock(t_next)
-
-                    # decay
-                    #dt = self.clock.t_univ - self.schedule.t_old + 1
-                    #self.decay_needs(dt)
-                    self.decay_needs()
-
-                    uu = 1
+                # handle the stop of the scheduler and get the next time
+                t_next = self.step(prof)
 
             # after the first time step, there are no initializing procedures
             self.clock.initial_step = False
@@ -571,6 +615,41 @@ class Universe(object):
 
         return
 
+    def run_phase(self, prof, key, f, per_person=False):
+
+        """
+        This function runs a phase of a stop of the scheduler (see :func:`universe.Universe.step`). If there \
+        are measurements, the wall time of the phase is measured. The phases done for each person separately \
+        are measured for each person.
+
+        :param profiler.Profiler prof: the measurements of the simulation. If None, nothing is measured
+        :param int key: the identifier of the phase (see :mod:`profiler`)
+        :param f: the phase. It is called with the people to handle (None, for every person)
+        :param bool per_person: a flag indicating whether the phase is measured for each person (if True) or \
+        for the household (if False)
+
+        :return: the result of the phase (for the household or for the last person)
+        """
+
+        if prof is None:
+            return f(None)
+
+        # the timer
+        clock = time.perf_counter
+
+        if not per_person:
+            tic = clock()
+            x   = f(None)
+            prof.add_time(key, clock() - tic)
+
+        else:
+            for i, p in enumerate(self.people):
+                tic = clock()
+                x   = f([p])
+                prof.add_time(key, clock() - tic, i)
+
+        return x
+
     #
     # this runs the simulation
     #
@@ -583,17 +662,6 @@ class Universe(object):
     # update the history of events
     # advance the clock
 
-    # Given a list of activity advertisements,
-    # this function selects the person with the largest activity score and
-    # outputs the score, asset, activity, and person.
-    #
-    # input:
-    #     ads:          a list of advertisements: (score, asset, activity, person)
-    #                   tuples for a each person
-    # output:
-    #    chosen:        dictionary. The chosen advertisement
-    #                   keys: ("score", "asset", "activity", "person")
-    #
     def select_activity(self, ads):
 
         """
@@ -603,48 +671,11 @@ class Universe(object):
         :param list ads: a list of advertisements for this time step
 
         :return chosen: the selected activity advertisement (score, asset, activity, person)
-        :rtype: dict
+        :rtype: ad_board.Advertisement
         """
 
-        do_print = False
-
-        # to check for an empty list
-        # nn = len( [item for sublist in ads for item in sublist] )
-
-        # go through the ads / person
-        # this function goes through the list and finds the score
-        g = lambda x: x['score']
-
-        # for each person, sort the add in terms of decreasing score
-        ads = [ sorted(a, key=g, reverse=True) for a in ads]
-
-        # for each person with (non-empty) advertisements, get the highest score
-        score = np.array( [ a[0]['score'] for a in ads if a] ).astype(float)
-
-        #
-        # check for activity conflicts!!
-        #
-
-        # see if the max score is unique
-        max_score = score[score == max(score)]
-
-        # a flag indicating if the maximum socre is unique
-        is_unique = ( len(max_score) == 1)
-
-        # an array of indices of Person(s) with the max score
-        p_idx = np.where( score == max(score) )[0]
-
-        # if NO Person(s) have a max-score conflict, the Person with the
-        # highest score wins
-        if (is_unique):
-            chosen = ads[p_idx[0]][0] # recall, the ads per Person are sorted
-        else:
-            # 2 or more people have a max-score conflict, choose 1 randomly (uniform)
-            # by randomly assigning numbers, the winner has the highest value
-            rando = np.random.rand( len(p_idx) )
-            winner_idx = p_idx[rando == max(rando)][0]
-
-            chosen = ads[winner_idx][0] # recall, the ads per Person are sorted
+        # the person with the highest score wins. Ties are broken randomly
+        chosen = ad_board.select(ads, self.rng)
 
         return chosen
 
@@ -669,6 +700,66 @@ class Universe(object):
 
         return
 
+    def step(self, prof=None):
+
+        """
+        This function handles a stop of the scheduler. More specifically, the function does the following:
+
+        #. check for expired activities for all agents. If activities should have expired, tell the agent to end them
+        #. start new activities by addressing the needs for all agents (assuming no interruption)
+        #. decay the satiation for Interruption for all agents
+        #. start new activities by addressing the needs for all agents (assuming interruptions only)
+        #. update the history of the status of each agent
+        #. find the next time to jump to in the simulation according to the scheduler
+        #. if the next time is not after the final time, update the clock and decay the needs for all agents
+
+        If there are measurements, the wall time of each phase is measured (see \
+        :func:`universe.Universe.run_phase`).
+
+        :param profiler.Profiler prof: the measurements of the simulation. If None, nothing is measured
+
+        :return: the next time [minutes, universal time] the scheduler stops
+        :rtype: int
+        """
+
+        # check for expired activities
+        # if they are found, end the activity
+        # set the Person to state: IDLE
+        self.run_phase(prof, profiler.CHECK_EXPIRED, self.check_expired_activities, per_person=True)
+
+        # address the needs NOT due to interruptions
+        self.run_phase(prof, profiler.ADDRESS_NEEDS, lambda people: self.address_needs(do_interruption=False))
+
+        # decay the interruption
+        self.run_phase(prof, profiler.DECAY_INTERRUPTION, self.decay_interruption, per_person=True)
+
+        # address the needs due to interruptions
+        self.run_phase(prof, profiler.ADDRESS_INTERRUPTIONS, lambda people: self.address_needs(do_interruption=True))
+
+        # update the history
+        self.run_phase(prof, profiler.UPDATE_HISTORY, self.update_history_new, per_person=True)
+
+        # get the next time
+        # need to add something about an interrupting event
+        # in the case that work and lunch start simultaneously
+        t_next = self.run_phase(prof, profiler.NEXT_EVENT, lambda people: self.schedule.get_next_event_time())
+
+        # update the clock and decay the needs for the next time
+        if (t_next <= self.t_end):
+
+            # update the clock for the next time step
+            self.update_clock(t_next)
+
+            # decay
+            self.run_phase(prof, profiler.DECAY_NEEDS, lambda people: self.decay_needs(people=people), \
+                           per_person=True)
+
+        # add the counts of this stop to the totals
+        if prof is not None:
+            prof.end_stop()
+
+        return t_next
+
     def test_func(self):
 
         """
@@ -746,7 +837,7 @@ class Universe(object):
         self.clock.step = self.clock.step + 1
 
         # store the temporal history
-        self.clock.hist_time[self.clock.step] = self.clock.t_univ
+        self.clock.update_history()
 
         return
 
@@ -768,6 +859,10 @@ class Universe(object):
         # update history of Persons
         for p in self.people:
 
+            # make sure the history buffers are as large as the time history
+            if step >= len(p.hist_state):
+                p.grow_history( len(self.clock.hist_time) )
+
             # store state
             p.hist_state[step] = p.state.status
 
@@ -786,16 +881,22 @@ class Universe(object):
 
         return
 
-    def update_history_new(self):
+    def update_history_new(self, people=None):
 
         """
         Update the histories of each person.
 
+        :param list people: the people whose histories are updated. If None, the history of every person in \
+        the universe is updated
+
         :return: None
         """
 
+        if people is None:
+            people = self.people
+
         # update history of Persons
-        for p in self.people:
+        for p in people:
             p.update_history()
 
         return
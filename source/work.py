@@ -72,7 +72,7 @@ class Work(activity.Activity):
         # create a clock for the Need perception due the Activity when it's finished
         dt = (p.socio.job.t_end - p.clock.time_of_day) % DAY_2_MIN
 
-        future_clock = temporal.Temporal(p.clock.t_univ + dt)
+        future_clock = temporal.Time_Point(p.clock.t_univ + dt)
 
         # the current need level and the resulting need level if an Activity is done
         n_now = p.income.magnitude